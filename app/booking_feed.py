@@ -0,0 +1,253 @@
+"""Live booking changes for the admin dashboard, as Server-Sent Events.
+
+Postgres announces every insert, update and delete on bookings with NOTIFY
+(see migration 0007_booking_feed). Each process keeps a single LISTEN
+connection and fans the changes out to its open streams in memory, so the
+database does the same work however many dashboards are watching.
+"""
+from app.config import (
+    BOOKING_FEED_CLIENT_BUFFER, BOOKING_FEED_CONNECTION_STRING, BOOKING_FEED_HEARTBEAT, BOOKING_FEED_HISTORY,
+)
+from app.db import Database
+from app.middleware.drain import DrainMiddleware
+from app.repositories import bookings as bookings_repo
+from collections import deque
+from datetime import datetime
+import asyncio
+import asyncpg
+import json
+
+CHANNEL = "booking_feed"
+
+# Errors after which the LISTEN connection is opened again.
+CONNECTION_ERRORS = (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError)
+
+# Sent when changes may have been missed and cannot be replayed: the client
+# should reload the bookings and keep listening.
+RESET = b"event: reset\ndata: {}\n\n"
+
+# Keeps idle connections from being closed by proxies.
+KEEP_ALIVE = b": keep-alive\n\n"
+
+
+def _message(event_id: str, data: str) -> bytes:
+    return f"id: {event_id}\nevent: booking\ndata: {data}\n\n".encode()
+
+
+def _json_default(value):
+    return value.isoformat()
+
+
+class Subscriber:
+    """One open stream: a bounded queue of encoded messages, ended by None."""
+
+    def __init__(self, size: int):
+        self.queue = asyncio.Queue(size)
+        self.closed = False
+
+    def send(self, message: bytes) -> bool:
+        """Queue ``message``; a subscriber whose queue is full is closed instead."""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.close()
+            return False
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        # Whatever is still queued is dropped; the client reconnects with the
+        # last id it received and is replayed the rest from the history.
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class BookingFeed:
+    """Listens for booking changes and relays them to every subscriber.
+
+    The last ``history`` changes are kept, so a client that reconnects with
+    Last-Event-ID misses nothing. Each subscriber may fall ``client_buffer``
+    changes behind before it is disconnected. If the LISTEN connection drops,
+    changes made meanwhile are lost: subscribers get a ``reset`` event and the
+    history starts over.
+    """
+
+    # The feed running in this process, if any.
+    current = None
+
+    def __init__(self, dsn: str = BOOKING_FEED_CONNECTION_STRING, history: int = BOOKING_FEED_HISTORY,
+                 client_buffer: int = BOOKING_FEED_CLIENT_BUFFER, heartbeat: float = BOOKING_FEED_HEARTBEAT,
+                 retry_max: float = 30):
+        self.dsn = dsn
+        self.client_buffer = client_buffer
+        self.heartbeat = heartbeat
+        self.retry_max = retry_max
+        self.history = deque(maxlen=history)
+        self.subscribers = set()
+        self.connected = False
+        self.published = 0
+        self.disconnected_subscribers = 0
+        self._inbox = asyncio.Queue()
+        self._stopping = asyncio.Event()
+        self._runner = None
+        self._pump = None
+
+    def start(self):
+        BookingFeed.current = self
+        self._runner = asyncio.create_task(self.run())
+        self._pump = asyncio.create_task(self.relay())
+
+    async def stop(self):
+        """Stop listening and end every open stream."""
+        self._stopping.set()
+        for subscriber in list(self.subscribers):
+            subscriber.close()
+        if self._runner is not None:
+            await self._runner
+        if self._pump is not None:
+            self._pump.cancel()
+        if BookingFeed.current is self:
+            BookingFeed.current = None
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "subscribers": len(self.subscribers),
+            "published": self.published,
+            "history": len(self.history),
+            "disconnected_subscribers": self.disconnected_subscribers,
+        }
+
+    async def run(self):
+        """Hold the LISTEN connection, reconnecting with backoff when it drops."""
+        delay, listened = 1, False
+        while not self._stopping.is_set():
+            try:
+                conn = await asyncpg.connect(self.dsn, timeout=self.retry_max)
+            except CONNECTION_ERRORS as e:
+                print(f"Booking feed cannot connect, retrying in {delay:g}s: {e}")
+                await self._sleep(delay)
+                delay = min(self.retry_max, delay * 2)
+                continue
+            delay = 1
+            try:
+                await conn.add_listener(CHANNEL, self._notified)
+                if listened:
+                    self._inbox.put_nowait(None)
+                listened = self.connected = True
+                await self._watch(conn)
+            except CONNECTION_ERRORS as e:
+                print(f"Booking feed connection lost: {e or type(e).__name__}")
+            finally:
+                self.connected = False
+                if not conn.is_closed():
+                    conn.terminate()
+
+    async def _sleep(self, seconds: float):
+        try:
+            await asyncio.wait_for(self._stopping.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _watch(self, conn):
+        """Return once stopping; raise when the connection is lost."""
+        closed = asyncio.Event()
+        conn.add_termination_listener(lambda _: closed.set())
+        while not self._stopping.is_set():
+            waiters = [asyncio.ensure_future(self._stopping.wait()), asyncio.ensure_future(closed.wait())]
+            _, pending = await asyncio.wait(waiters, timeout=self.heartbeat, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in pending:
+                waiter.cancel()
+            if closed.is_set():
+                raise ConnectionResetError("the server closed the connection")
+            # A connection dropped without a goodbye only shows up when it
+            # is used, so check it once per heartbeat.
+            if not self._stopping.is_set():
+                await conn.execute("SELECT 1", timeout=self.heartbeat)
+
+    def _notified(self, conn, pid, channel, payload):
+        self._inbox.put_nowait(payload)
+
+    async def relay(self):
+        """Encode each notification once and hand it to every subscriber, in order."""
+        while True:
+            payload = await self._inbox.get()
+            if payload is None:
+                # Reconnected after a gap.
+                self.history.clear()
+                self._broadcast(RESET)
+                continue
+            try:
+                change = json.loads(payload)
+                event_id = str(change["id"])
+            except (ValueError, TypeError, KeyError):
+                print(f"Ignoring malformed booking feed notification: {payload[:200]}")
+                continue
+            if change.get("partial"):
+                payload = await self._complete(change, payload)
+            message = _message(event_id, payload)
+            self.history.append((event_id, message))
+            self.published += 1
+            self._broadcast(message)
+
+    async def _complete(self, change: dict, payload: str) -> str:
+        # The row was too large for NOTIFY; read it from the primary, where
+        # it is already committed. A deleted row stays as just its id.
+        if change["type"] == "delete":
+            return payload
+        at = change["booking"].get("datetime")
+        try:
+            at = datetime.fromisoformat(at) if at else None
+            booking = await Database.run(bookings_repo.get, change["booking"]["id"], at, readonly=False)
+        except Exception as e:
+            print(f"Error fetching booking {change['booking']['id']} for the feed: {e}")
+            return payload
+        if booking is None:
+            return payload
+        change["booking"] = dict(booking)
+        del change["partial"]
+        return json.dumps(change, default=_json_default)
+
+    def _broadcast(self, message: bytes):
+        for subscriber in list(self.subscribers):
+            if not subscriber.send(message):
+                self.subscribers.discard(subscriber)
+                self.disconnected_subscribers += 1
+
+    def subscribe(self, last_event_id: str = None) -> Subscriber:
+        """Open a subscription, first replaying what came after ``last_event_id``."""
+        missed = []
+        if last_event_id is not None:
+            ids = [event_id for event_id, _ in self.history]
+            if last_event_id in ids:
+                missed = [message for _, message in list(self.history)[ids.index(last_event_id) + 1:]]
+            else:
+                missed = [RESET]
+        subscriber = Subscriber(self.client_buffer + len(missed))
+        for message in missed:
+            subscriber.send(message)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    async def stream(self, last_event_id: str = None):
+        """The body of one event stream; ends when the subscriber is closed or the app drains."""
+        subscriber = self.subscribe(last_event_id)
+        try:
+            while not DrainMiddleware.draining:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    message = KEEP_ALIVE
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(subscriber)
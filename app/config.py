@@ -7,6 +7,122 @@ load_dotenv()
 # Database configuration
 DB_CONNECTION_STRING = os.getenv("DB_CONNECTION_STRING", "")
 
-# Directory for uploaded images
+# Set to "transaction" when DB_CONNECTION_STRING points at PgBouncer in
+# transaction pooling mode, "disable" for a direct Postgres connection, or
+# "auto" to detect it from the first rejected prepared statement.
+DB_POOLER_MODE = os.getenv("DB_POOLER_MODE", "auto").lower()
+
+# Per-instance pool size. Keep these small when many instances share one
+# Postgres (or one PgBouncer) so their sum stays under max_connections.
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "10"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+
+# On shutdown, in-flight requests get up to SHUTDOWN_DRAIN_TIMEOUT seconds to
+# finish before the pool closes; keep it below the orchestrator's grace period.
+# /readyz gives its database check READINESS_TIMEOUT seconds.
+SHUTDOWN_DRAIN_TIMEOUT = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", "25"))
+READINESS_TIMEOUT = float(os.getenv("READINESS_TIMEOUT", "1.0"))
+
+# Production server (python -m app.server). WEB_CONCURRENCY worker processes,
+# by default one per CPU the container may use. Each worker has its own
+# database pool of up to DB_POOL_MAX_SIZE connections. Keep
+# SERVER_KEEPALIVE_TIMEOUT above the load balancer's idle timeout, so it is
+# never the server that closes a connection the balancer is about to reuse.
+# SERVER_BACKLOG connections can wait to be accepted, e.g. while a worker
+# restarts. Turn SERVER_ACCESS_LOG off when the load balancer logs requests.
+# SERVER_LOOP ("uvloop" or "asyncio") and SERVER_HTTP ("httptools" or "h11")
+# default to "auto": the faster one when it is installed. On reload, a new
+# worker gets SERVER_STARTUP_TIMEOUT seconds to finish its startup before it
+# is given up on and the worker it would have replaced is kept.
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))
+SERVER_KEEPALIVE_TIMEOUT = int(os.getenv("SERVER_KEEPALIVE_TIMEOUT", "75"))
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+SERVER_LOOP = os.getenv("SERVER_LOOP", "auto").lower()
+SERVER_HTTP = os.getenv("SERVER_HTTP", "auto").lower()
+SERVER_ACCESS_LOG = os.getenv("SERVER_ACCESS_LOG", "true").lower() in ("1", "true", "yes")
+SERVER_STARTUP_TIMEOUT = float(os.getenv("SERVER_STARTUP_TIMEOUT", "60"))
+
+# Optional read replicas, comma-separated. GET requests read from the least
+# busy one; a replica that fails is skipped for DB_REPLICA_RETRY_SECONDS. For
+# READ_YOUR_WRITES_SECONDS after a write, a client only reads from a replica
+# that has replayed it.
+DB_REPLICA_CONNECTION_STRINGS = [
+    dsn.strip() for dsn in os.getenv("DB_REPLICA_CONNECTION_STRINGS", "").split(",") if dsn.strip()
+]
+DB_REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+# Attributes of that cookie. SameSite=None lets the cross-site frontend send
+# it; "auto" marks it Secure on HTTPS requests only (behind a proxy, run
+# uvicorn with --proxy-headers so the scheme is the client's). Browsers drop
+# SameSite=None cookies that are not Secure, so those fall back to Lax.
+READ_YOUR_WRITES_COOKIE_SAMESITE = os.getenv("READ_YOUR_WRITES_COOKIE_SAMESITE", "none").lower()
+READ_YOUR_WRITES_COOKIE_SECURE = os.getenv("READ_YOUR_WRITES_COOKIE_SECURE", "auto").lower()
+
+# Live booking feed (GET /admin/booking-feed/). Each process LISTENs on one
+# connection to BOOKING_FEED_CONNECTION_STRING, which must reach Postgres
+# directly: LISTEN does not work through a transaction pooler. The last
+# BOOKING_FEED_HISTORY changes can be resumed with Last-Event-ID; a client
+# that falls BOOKING_FEED_CLIENT_BUFFER changes behind is disconnected and
+# resumes from there. Idle streams get a comment every BOOKING_FEED_HEARTBEAT
+# seconds.
+BOOKING_FEED_CONNECTION_STRING = os.getenv("BOOKING_FEED_CONNECTION_STRING", "") or DB_CONNECTION_STRING
+BOOKING_FEED_HISTORY = int(os.getenv("BOOKING_FEED_HISTORY", "1000"))
+BOOKING_FEED_CLIENT_BUFFER = int(os.getenv("BOOKING_FEED_CLIENT_BUFFER", "256"))
+BOOKING_FEED_HEARTBEAT = float(os.getenv("BOOKING_FEED_HEARTBEAT", "15"))
+
+# Seconds each section of the aggregated home endpoint may take before it is
+# reported as timed out and left out of the response.
+HOME_SECTION_TIMEOUT = float(os.getenv("HOME_SECTION_TIMEOUT", "2.0"))
+
+# Responses smaller than this many bytes are sent uncompressed, and up to
+# COMPRESSION_CACHE_MB of compressed GET responses are kept for reuse.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_CACHE_MB = int(os.getenv("COMPRESSION_CACHE_MB", "32"))
+
+# Background jobs. The worker runs inside the web process unless
+# JOBS_IN_PROCESS is false, in which case run "python -m app.jobs.worker".
+JOBS_IN_PROCESS = os.getenv("JOBS_IN_PROCESS", "true").lower() in ("1", "true", "yes")
+JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "4"))
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "1.0"))
+
+# Outgoing mail: "smtp", "console" (print only) or "memory". Defaults to
+# SMTP when SMTP_HOST is set.
+SMTP_HOST = os.getenv("SMTP_HOST", "")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME") or None
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD") or None
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "true").lower() in ("1", "true", "yes")
+MAIL_FROM = os.getenv("MAIL_FROM", "no-reply@localhost")
+MAILER = os.getenv("MAILER", "smtp" if SMTP_HOST else "console").lower()
+
+# Unreferenced uploads (see UPLOAD_PREFIX) are deleted by the image_gc job,
+# which runs IMAGE_GC_DELAY seconds after a delete or image replacement. Files
+# younger than IMAGE_GC_GRACE_SECONDS are kept: their row may not be committed
+# yet.
+IMAGE_GC_DELAY = float(os.getenv("IMAGE_GC_DELAY", "60"))
+IMAGE_GC_GRACE_SECONDS = float(os.getenv("IMAGE_GC_GRACE_SECONDS", "600"))
+IMAGE_GC_BATCH_SIZE = int(os.getenv("IMAGE_GC_BATCH_SIZE", "200"))
+
+# bookings is partitioned by month. A daily job keeps BOOKINGS_PARTITIONS_AHEAD
+# months of partitions ready. With BOOKINGS_RETENTION_MONTHS set, months older
+# than that are moved into gzipped CSV files in BOOKINGS_ARCHIVE_DIR, which
+# must then be an absolute path on durable storage; nothing is detached or
+# dropped otherwise. The default 0 keeps everything in the database.
+# Analytics keep covering archived months.
+BOOKINGS_PARTITIONS_AHEAD = int(os.getenv("BOOKINGS_PARTITIONS_AHEAD", "12"))
+BOOKINGS_RETENTION_MONTHS = int(os.getenv("BOOKINGS_RETENTION_MONTHS", "0"))
+BOOKINGS_ARCHIVE_DIR = Path(os.getenv("BOOKINGS_ARCHIVE_DIR")) if os.getenv("BOOKINGS_ARCHIVE_DIR") else None
+BOOKINGS_MAINTENANCE_INTERVAL = float(os.getenv("BOOKINGS_MAINTENANCE_INTERVAL", "86400"))
+
+# Largest number of operations accepted by the admin batch endpoint in one
+# request; all of them run in a single transaction.
+BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", "5000"))
+
+# Directory for uploaded images. Uploads are stored as UPLOAD_PREFIX, a uuid
+# and the client's file extension; the image_gc job only deletes files named
+# that way, never the assets committed alongside them.
 UPLOAD_DIR = Path("uploaded_images")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+UPLOAD_PREFIX = "upload-"
\ No newline at end of file
@@ -1,14 +1,444 @@
+import asyncio
 import asyncpg
+import time
+import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+# Pooler modes understood by Database.connect:
+#   "disable"     - talking to Postgres directly, asyncpg defaults.
+#   "transaction" - behind PgBouncer (or similar) in transaction pooling mode.
+#   "auto"        - start with the defaults and switch to "transaction" the
+#                   first time the server rejects a prepared statement.
+POOLER_MODES = ("disable", "transaction", "auto")
+
+# Errors raised when server-side prepared statements do not survive because
+# consecutive statements landed on different server connections.
+POOLER_STATEMENT_ERRORS = (
+    asyncpg.exceptions.InvalidSQLStatementNameError,
+    asyncpg.exceptions.DuplicatePreparedStatementError,
+)
+
+# Errors that mean a read replica cannot be reached; it is skipped for a while.
+REPLICA_DOWN_ERRORS = (
+    OSError,
+    asyncpg.exceptions.PostgresConnectionError,
+    asyncpg.exceptions.CannotConnectNowError,
+)
+
+# Errors after which a read is retried on the primary: the above, queries
+# cancelled by a conflict with replay, and reads that turn out to write.
+REPLICA_RETRY_ERRORS = REPLICA_DOWN_ERRORS + (
+    asyncpg.exceptions.SerializationError,
+    asyncpg.exceptions.ReadOnlySQLTransactionError,
+)
+
+REPLAYED_PAST = "SELECT coalesce(pg_last_wal_replay_lsn() >= $1::text::pg_lsn, true)"
+
+CURRENT_LSN = "SELECT pg_current_wal_lsn()::text"
+
+# Set per request by ReadRoutingMiddleware: whether Database.run may use a
+# replica by default, and the WAL position a replica must have replayed for
+# the client to see its own writes.
+read_only_request = ContextVar("read_only_request", default=False)
+min_lsn = ContextVar("min_lsn", default=None)
+# Also set by ReadRoutingMiddleware, to a one-item list that Database.run
+# sets to True once the request has run a write (see its ``writes``); only
+# then does the response carry the primary's WAL position.
+primary_writes = ContextVar("primary_writes", default=None)
+
+
+class Connection(asyncpg.Connection):
+    """asyncpg connection that keeps count of statement cache hits.
+
+    asyncpg prepares every parameterised query once per connection and keeps
+    it in a per-connection LRU cache (``statement_cache_size``, 100 entries by
+    default) keyed by the SQL text. A call counts as a hit only if its
+    statement is in that cache when the call starts, so statements evicted
+    from it, or never cached behind a transaction pooler, count as misses.
+    """
+    __slots__ = ()
+
+    def _cached(self, query) -> bool:
+        # The key asyncpg's _get_statement looks up for a plain call.
+        return self._stmt_cache.has((query, self._protocol.get_record_class(), False))
+
+    def _track(self, query):
+        if self._cached(query):
+            Database.statement_hits += 1
+        else:
+            Database.statement_misses += 1
+
+    def _get_unique_id(self, prefix):
+        # Namespace server-side statement names per process (see
+        # Database.statement_namespace).
+        return f"{Database.statement_namespace}{super()._get_unique_id(prefix)}"
+
+    async def prime(self, query):
+        """Prepare ``query`` into the statement cache without running it."""
+        if not Database.uses_transaction_pooler() and not self._cached(query):
+            await self._get_statement(query, None)
+
+    async def execute(self, query, *args, **kwargs):
+        # Without arguments asyncpg uses the simple query protocol, which
+        # never touches the statement cache.
+        if args:
+            self._track(query)
+        return await super().execute(query, *args, **kwargs)
+
+    async def executemany(self, command, args, **kwargs):
+        self._track(command)
+        return await super().executemany(command, args, **kwargs)
+
+    async def fetch(self, query, *args, **kwargs):
+        self._track(query)
+        return await super().fetch(query, *args, **kwargs)
+
+    async def fetchrow(self, query, *args, **kwargs):
+        self._track(query)
+        return await super().fetchrow(query, *args, **kwargs)
+
+    async def fetchval(self, query, *args, **kwargs):
+        self._track(query)
+        return await super().fetchval(query, *args, **kwargs)
+
+
+async def _skip_reset(conn):
+    # Under transaction pooling the pooler resets server connections itself;
+    # a RESET ALL here would just be an extra round trip to a random backend.
+    return None
+
+
+class Replica:
+    """One read replica: its pool, whether it is usable, and how it has been used."""
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self.pool = None
+        self.down_until = 0.0
+        self.opening = None
+        self.reads = 0
+        self.fallbacks = 0
+
+    def available(self) -> bool:
+        return self.pool is not None and time.monotonic() >= self.down_until
+
+    def busy(self) -> int:
+        return self.pool.get_size() - self.pool.get_idle_size()
+
+    def mark_down(self, seconds: float):
+        self.down_until = time.monotonic() + seconds
+
 
 class Database:
     pool = None
+    dsn = None
+    pooler_mode = "disable"
+    pool_min_size = 10
+    pool_max_size = 10
+    connection_init = None
+    statement_hits = 0
+    statement_misses = 0
+    # Statements prepared on every connection once warm_up() has run, including
+    # connections the pool opens later; warmed reports that it has.
+    warm_statements = ()
+    warmed = False
+    # Read replicas; see run() for how reads are routed to them.
+    replicas = []
+    replica_retry_seconds = 30
+    replica_connect_timeout = 5
+    _replica_turn = 0
+    # Serialises switch_to_transaction_pooler; created by connect().
+    _switch_lock = None
+    # Per-process prefix for explicitly named prepared statements so two
+    # clients sharing a server connection can never collide on a name.
+    statement_namespace = f"rw{uuid.uuid4().hex[:8]}"
 
     @classmethod
-    async def connect(cls, dsn: str):
-        cls.pool = await asyncpg.create_pool(dsn=dsn)
+    async def connect(cls, dsn: str, pooler_mode: str = "disable", min_size: int = 10, max_size: int = 10, init=None,
+                      replicas=(), replica_retry_seconds: float = 30):
+        if pooler_mode not in POOLER_MODES:
+            print(f"Unknown DB_POOLER_MODE '{pooler_mode}', falling back to 'auto'.")
+            pooler_mode = "auto"
+        cls.dsn = dsn
+        cls.pooler_mode = pooler_mode
+        cls.pool_min_size = min(min_size, max_size)
+        cls.pool_max_size = max_size
+        cls.connection_init = init
+        cls._switch_lock = asyncio.Lock()
+        cls.pool = await cls._create_pool()
+        cls.replica_retry_seconds = replica_retry_seconds
+        cls.replicas = [Replica(replica_dsn) for replica_dsn in replicas]
+        # An unreachable replica does not stop startup; it is retried later.
+        await asyncio.gather(*(cls._open_replica(replica) for replica in cls.replicas))
 
     @classmethod
     async def disconnect(cls):
+        cls.warmed = False
+        for replica in cls.replicas:
+            if replica.pool:
+                await replica.pool.close()
+        cls.replicas = []
         if cls.pool:
             await cls.pool.close()
-            cls.pool = None
\ No newline at end of file
+            cls.pool = None
+
+    @classmethod
+    async def warm_up(cls, statements):
+        """Open ``min_size`` connections and prepare ``statements`` on each of them.
+
+        Run after migrations, so every statement's tables exist. A statement
+        that fails to prepare is reported and skipped; it is prepared on first
+        use as usual.
+
+        Args:
+            statements: SQL texts exactly as the repositories send them.
+        """
+        cls.warm_statements = tuple(statements)
+        pools = [cls.pool] + [replica.pool for replica in cls.replicas if replica.available()]
+        # Holding each connection until all are acquired makes them distinct.
+        connections = []
+        try:
+            for pool in pools:
+                for _ in range(cls.pool_min_size):
+                    connections.append((pool, await pool.acquire()))
+            await asyncio.gather(*(cls._prime(conn) for _, conn in connections))
+        finally:
+            for pool, conn in connections:
+                await pool.release(conn)
+        cls.warmed = True
+
+    @classmethod
+    async def _prime(cls, conn):
+        for query in cls.warm_statements:
+            try:
+                await conn.prime(query)
+            except Exception as e:
+                print(f"Error preparing statement during warm-up: {e}")
+
+    @classmethod
+    async def _init_connection(cls, conn):
+        if cls.connection_init:
+            await cls.connection_init(conn)
+        await cls._prime(conn)
+
+    @classmethod
+    def uses_transaction_pooler(cls) -> bool:
+        return cls.pooler_mode == "transaction"
+
+    @classmethod
+    async def _init_pooled_connection(cls, conn):
+        # Nothing to prime: prepared statements do not outlive a transaction.
+        if cls.connection_init:
+            await cls.connection_init(conn)
+
+    @classmethod
+    def _pool_options(cls, pooler_mode: str = None) -> dict:
+        options = {
+            "min_size": cls.pool_min_size,
+            "max_size": cls.pool_max_size,
+            "connection_class": Connection,
+            # Keep prepared statements for the life of the connection instead
+            # of re-preparing them every five minutes.
+            "max_cached_statement_lifetime": 0,
+            # Likewise keep idle connections open, so a quiet spell does not
+            # leave the next requests on cold connections.
+            "max_inactive_connection_lifetime": 0,
+            "init": cls._init_connection,
+        }
+        if (pooler_mode or cls.pooler_mode) == "transaction":
+            # asyncpg falls back to unnamed statements when the cache is off,
+            # which is what PgBouncer's transaction mode can route safely.
+            options.update(statement_cache_size=0, reset=_skip_reset, init=cls._init_pooled_connection)
+        return options
+
+    @classmethod
+    async def _create_pool(cls, pooler_mode: str = None):
+        return await asyncpg.create_pool(dsn=cls.dsn, **cls._pool_options(pooler_mode))
+
+    @classmethod
+    async def switch_to_transaction_pooler(cls):
+        """Rebuild the pools with server-side statement caching disabled.
+
+        Callers that hit a rejected statement meanwhile wait for the first
+        switch to finish and then retry on the new pool.
+        """
+        async with cls._switch_lock:
+            if cls.uses_transaction_pooler():
+                return
+            print("Prepared statement rejected by the server; switching to transaction pooler mode.")
+            pool = await cls._create_pool("transaction")
+            old_pools = [cls.pool] + [replica.pool for replica in cls.replicas]
+            # The replicas are reopened in place; a replica that fails to
+            # reopen is retried later as usual.
+            await asyncio.gather(*(cls._open_replica(replica, "transaction") for replica in cls.replicas))
+            # Swap the pool and the mode together, with no await in between.
+            cls.pool = pool
+            cls.pooler_mode = "transaction"
+            for old_pool in old_pools:
+                if old_pool:
+                    await old_pool.close()
+
+    @classmethod
+    async def _open_replica(cls, replica: Replica, pooler_mode: str = None):
+        try:
+            replica.pool = await asyncpg.create_pool(
+                dsn=replica.dsn, timeout=cls.replica_connect_timeout, **cls._pool_options(pooler_mode)
+            )
+        except (REPLICA_DOWN_ERRORS + (asyncpg.exceptions.PostgresError,)) as e:
+            replica.pool = None
+            replica.mark_down(cls.replica_retry_seconds)
+            print(f"Read replica unavailable, retrying in {cls.replica_retry_seconds:g}s: {e}")
+        finally:
+            replica.opening = None
+
+    @classmethod
+    def _pick_replica(cls):
+        """The least busy usable replica, rotating between equally busy ones."""
+        cls._replica_turn += 1
+        best = None
+        for i in range(len(cls.replicas)):
+            replica = cls.replicas[(cls._replica_turn + i) % len(cls.replicas)]
+            if replica.pool is None:
+                # Reconnect in the background; no request waits for it.
+                if replica.opening is None and time.monotonic() >= replica.down_until:
+                    replica.opening = asyncio.create_task(cls._open_replica(replica))
+                continue
+            if replica.available() and (best is None or replica.busy() < best.busy()):
+                best = replica
+        return best
+
+    @classmethod
+    async def _acquire_replica(cls, replica: Replica):
+        """A connection to ``replica`` that has replayed the client's writes, or None."""
+        try:
+            conn = await replica.pool.acquire()
+        except REPLICA_DOWN_ERRORS as e:
+            cls._replica_failed(replica, e)
+            return None
+        lsn = min_lsn.get()
+        if lsn is not None:
+            try:
+                caught_up = await conn.fetchval(REPLAYED_PAST, lsn)
+            except REPLICA_RETRY_ERRORS as e:
+                caught_up = False
+                cls._replica_failed(replica, e)
+            if not caught_up:
+                replica.fallbacks += 1
+                await replica.pool.release(conn)
+                return None
+        replica.reads += 1
+        return conn
+
+    @classmethod
+    def _replica_failed(cls, replica: Replica, error: Exception):
+        replica.fallbacks += 1
+        if isinstance(error, REPLICA_DOWN_ERRORS):
+            replica.mark_down(cls.replica_retry_seconds)
+            print(f"Read replica failed, using the primary for {cls.replica_retry_seconds:g}s: {error}")
+        else:
+            print(f"Read retried on the primary: {error}")
+
+    @classmethod
+    async def current_lsn(cls) -> str:
+        """The primary's current WAL position, for read-your-writes checks."""
+        async with cls.pool.acquire() as conn:
+            return await conn.fetchval(CURRENT_LSN)
+
+    @classmethod
+    def replica_stats(cls) -> list:
+        return [
+            {
+                "available": replica.available(),
+                "busy": replica.busy() if replica.pool else None,
+                "reads": replica.reads,
+                "fallbacks": replica.fallbacks,
+            }
+            for replica in cls.replicas
+        ]
+
+    @classmethod
+    def statement_stats(cls) -> dict:
+        total = cls.statement_hits + cls.statement_misses
+        return {
+            "hits": cls.statement_hits,
+            "misses": cls.statement_misses,
+            "hit_rate": round(cls.statement_hits / total, 4) if total else None,
+        }
+
+    @classmethod
+    @asynccontextmanager
+    async def acquire(cls, readonly: bool = False):
+        """A pooled connection; with ``readonly``, from a replica when one is usable."""
+        replica = cls._pick_replica() if readonly and cls.replicas else None
+        conn = await cls._acquire_replica(replica) if replica else None
+        if conn is not None:
+            try:
+                yield conn
+            finally:
+                await replica.pool.release(conn)
+            return
+        async with cls.pool.acquire() as conn:
+            yield conn
+
+    @classmethod
+    @asynccontextmanager
+    async def transaction(cls):
+        """Run a short unit of work on a single connection inside one transaction.
+
+        Behind a transaction pooler this is the only way to guarantee that
+        several statements reach the same server connection.
+        """
+        async with cls.pool.acquire() as conn:
+            async with conn.transaction():
+                yield conn
+
+    @classmethod
+    async def run(cls, fn, *args, transaction: bool = False, readonly: bool = None, writes: bool = None):
+        """Call ``fn(conn, *args)`` and retry once in transaction pooler mode if needed.
+
+        Only transactions and ``readonly`` calls are retried; any other call
+        that hits a rejected statement raises after the switch.
+
+        With ``readonly`` (by default, inside GET and HEAD requests) ``fn``
+        runs on the least busy read replica, and on the primary if no replica
+        is usable, fails, or has not yet replayed the client's latest write.
+        Transactions always use the primary.
+
+        ``writes`` says that ``fn`` changes data, so the client's next reads
+        must see it; it defaults to ``transaction``. Reads on the primary,
+        such as a login lookup, leave it unset.
+        """
+        if readonly is None:
+            readonly = read_only_request.get()
+        if readonly and not transaction and cls.replicas:
+            replica = cls._pick_replica()
+            conn = await cls._acquire_replica(replica) if replica else None
+            if conn is not None:
+                try:
+                    return await fn(conn, *args)
+                except REPLICA_RETRY_ERRORS as e:
+                    cls._replica_failed(replica, e)
+                finally:
+                    await replica.pool.release(conn)
+        wrote = primary_writes.get()
+        if wrote is not None and (transaction if writes is None else writes):
+            wrote[0] = True
+        for attempt in range(2):
+            pool = cls.pool
+            try:
+                if transaction:
+                    async with cls.transaction() as conn:
+                        return await fn(conn, *args)
+                async with cls.acquire() as conn:
+                    return await fn(conn, *args)
+            except POOLER_STATEMENT_ERRORS:
+                # A call still running on the pool that a switch replaced
+                # meanwhile is retried on the new pool as well.
+                if attempt or (cls.pooler_mode != "auto" and cls.pool is pool):
+                    raise
+                await cls.switch_to_transaction_pooler()
+                # Outside a transaction, fn may have committed writes before
+                # the failing statement; running it again could repeat them.
+                if not (transaction or readonly):
+                    raise
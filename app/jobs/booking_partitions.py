@@ -0,0 +1,86 @@
+from app.config import BOOKINGS_ARCHIVE_DIR, BOOKINGS_PARTITIONS_AHEAD, BOOKINGS_RETENTION_MONTHS
+from app.db import Database
+from app.repositories import booking_partitions as partitions_repo
+from datetime import date, datetime, timezone
+from pathlib import Path
+import asyncio
+import gzip
+import os
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _finish_file(out, tmp: Path, path: Path):
+    out.close()
+    with open(tmp, "rb") as written:
+        os.fsync(written.fileno())
+    os.replace(tmp, path)
+
+
+async def archive_partition(partition: str, directory: Path) -> dict:
+    """Write a detached partition to ``<directory>/<partition>.csv.gz``, then drop it.
+
+    The file is complete and synced before the table is dropped, so a crash
+    at any point leaves either the table or the file (or both).
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{partition}.csv.gz"
+    tmp = path.with_name(path.name + ".tmp")
+    out = gzip.open(tmp, "wb")
+    try:
+        async def write(chunk):
+            await asyncio.to_thread(out.write, chunk)
+
+        async with Database.acquire() as conn:
+            rows = await partitions_repo.copy_out(conn, partition, write)
+        await asyncio.to_thread(_finish_file, out, tmp, path)
+    finally:
+        out.close()
+    await Database.run(partitions_repo.finish_archive, partition, str(path), rows, transaction=True)
+    return {"partition": partition, "path": str(path), "rows": rows}
+
+
+async def maintain_partitions(months_ahead: int = BOOKINGS_PARTITIONS_AHEAD,
+                              retention_months: int = BOOKINGS_RETENTION_MONTHS,
+                              directory=BOOKINGS_ARCHIVE_DIR) -> dict:
+    """Create upcoming monthly bookings partitions and archive expired ones.
+
+    Args:
+        months_ahead (int): Months after the current one that must have a partition.
+        retention_months (int): Months kept in the database before the current
+            one; older partitions are detached, written to a gzipped CSV file
+            and dropped. 0 keeps everything.
+        directory: Where archive files are written; an absolute path, required
+            before anything is detached.
+
+    Returns:
+        dict: How many partitions were created and the archives written.
+
+    Raises:
+        ValueError: Partitions are due for archiving but ``directory`` is not
+            an absolute path. Nothing has been detached or dropped.
+    """
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    created = await Database.run(
+        partitions_repo.create_partitions, this_month, add_months(this_month, months_ahead), transaction=True
+    )
+    # Includes partitions left detached by an earlier run that failed.
+    pending = await Database.run(partitions_repo.list_pending)
+    if (retention_months > 0 or pending) and (directory is None or not Path(directory).is_absolute()):
+        raise ValueError(
+            "BOOKINGS_ARCHIVE_DIR must be an absolute path on durable storage to archive bookings partitions; "
+            f"got {directory!r}."
+        )
+
+    if retention_months > 0:
+        for expired in await Database.run(partitions_repo.list_expired, add_months(this_month, -retention_months)):
+            await Database.run(partitions_repo.detach, expired["partition"], expired["month"], transaction=True)
+            pending.append(expired["partition"])
+
+    archived = []
+    for partition in pending:
+        archived.append(await archive_partition(partition, Path(directory)))
+    return {"created": created, "archived": archived}
@@ -0,0 +1,66 @@
+from app.config import (
+    MAILER, MAIL_FROM, SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, SMTP_USE_TLS, BOOKINGS_MAINTENANCE_INTERVAL,
+)
+from app.db import Database
+from app.jobs.booking_partitions import maintain_partitions
+from app.jobs.image_gc import collect_garbage
+from app.jobs.queue import enqueue
+from app.utils.mailer import create_mailer
+from datetime import datetime
+
+# Job kind -> async handler taking the decoded payload. A handler that raises
+# is retried with backoff until the job runs out of attempts.
+HANDLERS = {}
+
+BOOKING_CONFIRMATION = "booking_confirmation"
+IMAGE_GC = "image_gc"
+BOOKING_PARTITIONS = "booking_partitions"
+
+# Swap for a MemoryMailer to capture mail instead of sending it.
+mailer = create_mailer(
+    MAILER,
+    host=SMTP_HOST,
+    port=SMTP_PORT,
+    sender=MAIL_FROM,
+    username=SMTP_USERNAME,
+    password=SMTP_PASSWORD,
+    use_tls=SMTP_USE_TLS,
+)
+
+
+def handler(kind: str):
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+@handler(BOOKING_CONFIRMATION)
+async def send_booking_confirmation(payload: dict):
+    when = datetime.fromisoformat(payload["datetime"])
+    await mailer.send(
+        payload["email"],
+        "Your table booking is confirmed",
+        f"Hello {payload['name']},\n\n"
+        f"Your table for {payload['no_of_people']} on {when:%A %d %B %Y at %H:%M %Z} is booked.\n"
+        f"Your booking reference is {payload['booking_id']}.\n",
+    )
+
+
+@handler(IMAGE_GC)
+async def remove_unreferenced_images(payload: dict):
+    report = await collect_garbage(dry_run=False)
+    print(f"Image cleanup deleted {report['deleted']} file(s), {report['bytes_freed']} bytes.")
+
+
+async def schedule_booking_partitions(conn, delay: float = 0):
+    # At most one queued run; startup and every run call this.
+    return await enqueue(conn, BOOKING_PARTITIONS, {}, delay=delay, unique=True)
+
+
+@handler(BOOKING_PARTITIONS)
+async def maintain_booking_partitions(payload: dict):
+    # Queue the next run first, so a failing run cannot end the schedule.
+    await Database.run(schedule_booking_partitions, BOOKINGS_MAINTENANCE_INTERVAL)
+    report = await maintain_partitions()
+    print(f"Bookings partitions: created {report['created']}, archived {len(report['archived'])}.")
@@ -0,0 +1,92 @@
+from app.config import UPLOAD_DIR, UPLOAD_PREFIX, IMAGE_GC_GRACE_SECONDS, IMAGE_GC_BATCH_SIZE
+from app.db import Database
+from app.repositories import images as images_repo
+import asyncio
+import os
+import time
+
+# Paths listed in a report; the counts always cover every file.
+REPORT_LIMIT = 100
+
+
+def _normalise(path) -> str:
+    return os.path.normpath(os.path.abspath(path))
+
+
+def _scan(directory, grace_seconds: float):
+    """``(path, size)`` of every upload old enough to collect, and how many were too new.
+
+    Only files the upload routes stored (named with UPLOAD_PREFIX) are looked
+    at; anything else in the directory is never collected.
+    """
+    cutoff = time.time() - grace_seconds
+    candidates, recent = [], 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.startswith(UPLOAD_PREFIX) or not entry.is_file(follow_symlinks=False):
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime > cutoff:
+                recent += 1
+                continue
+            candidates.append((entry.path, stat.st_size))
+    return candidates, recent
+
+
+def _unlink(batch):
+    deleted = freed = 0
+    for path, size in batch:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            continue
+        deleted += 1
+        freed += size
+    return deleted, freed
+
+
+async def collect_garbage(dry_run: bool = True, directory=UPLOAD_DIR, grace_seconds: float = IMAGE_GC_GRACE_SECONDS,
+                          batch_size: int = IMAGE_GC_BATCH_SIZE, pause: float = 0.05) -> dict:
+    """Delete uploaded files that no row references any more.
+
+    Only files saved by the upload routes are candidates (see ``_scan``).
+    Files modified within ``grace_seconds`` are kept, since the row that will
+    reference them may not be committed yet. Deletion happens ``batch_size``
+    files at a time in a worker thread, pausing between batches.
+
+    Args:
+        dry_run (bool): Only report what would be deleted.
+        directory: The upload directory to clean.
+        grace_seconds (float): Minimum file age before it may be deleted.
+        batch_size (int): Files deleted per batch.
+        pause (float): Seconds to wait between batches.
+
+    Returns:
+        dict: Counts of scanned, referenced, too-recent and unreferenced files,
+        what was deleted and the first unreferenced paths.
+    """
+    candidates, recent = await asyncio.to_thread(_scan, directory, grace_seconds)
+    referenced = {_normalise(path) for path in await Database.run(images_repo.list_referenced)}
+    garbage = [(path, size) for path, size in candidates if _normalise(path) not in referenced]
+
+    report = {
+        "dry_run": dry_run,
+        "scanned": len(candidates) + recent,
+        "too_recent": recent,
+        "referenced": len(candidates) - len(garbage),
+        "unreferenced": len(garbage),
+        "unreferenced_bytes": sum(size for _, size in garbage),
+        "deleted": 0,
+        "bytes_freed": 0,
+        "paths": [path for path, _ in garbage[:REPORT_LIMIT]],
+    }
+    if dry_run:
+        return report
+
+    for start in range(0, len(garbage), batch_size):
+        if start:
+            await asyncio.sleep(pause)
+        deleted, freed = await asyncio.to_thread(_unlink, garbage[start:start + batch_size])
+        report["deleted"] += deleted
+        report["bytes_freed"] += freed
+    return report
@@ -0,0 +1,23 @@
+from app.repositories import jobs as jobs_repo
+import json
+
+
+async def enqueue(conn, kind: str, payload: dict, max_attempts: int = 5, delay: float = 0, unique: bool = False) -> int:
+    """Queue a background job on ``conn``.
+
+    Args:
+        conn: The connection, ideally inside the transaction of the write that
+            triggers the job, so the job exists exactly when the write commits.
+        kind (str): A key of app.jobs.handlers.HANDLERS.
+        payload (dict): JSON-serialisable arguments for the handler.
+        max_attempts (int): Runs before the job is marked failed.
+        delay (float): Seconds to wait before the first run.
+        unique (bool): Skip it if a job of the same kind is already queued.
+
+    Returns:
+        int: The job ID, or None when skipped.
+    """
+    payload_json = json.dumps(payload, default=str)
+    if unique:
+        return await jobs_repo.enqueue_once(conn, kind, payload_json, max_attempts, delay)
+    return await jobs_repo.enqueue(conn, kind, payload_json, max_attempts, delay)
@@ -0,0 +1,175 @@
+"""Background job worker.
+
+Runs inside the web process by default (see JOBS_IN_PROCESS), or on its own:
+
+    python -m app.jobs.worker
+"""
+from app.config import DB_CONNECTION_STRING, DB_POOLER_MODE, JOBS_CONCURRENCY, JOBS_POLL_INTERVAL
+from app.db import Database
+from app.jobs.handlers import HANDLERS
+from app.repositories import jobs as jobs_repo
+import asyncio
+import json
+import random
+import signal
+import time
+
+
+class JobMetrics:
+    """Per-kind outcome counts and run times for one worker."""
+
+    def __init__(self):
+        self.kinds = {}
+
+    def record(self, kind: str, outcome: str, seconds: float):
+        entry = self.kinds.setdefault(kind, {"succeeded": 0, "retried": 0, "failed": 0, "runs": 0, "seconds": 0.0})
+        entry[outcome] += 1
+        entry["runs"] += 1
+        entry["seconds"] += seconds
+
+    def snapshot(self) -> dict:
+        return {
+            kind: {
+                "succeeded": entry["succeeded"],
+                "retried": entry["retried"],
+                "failed": entry["failed"],
+                "mean_ms": round(entry["seconds"] * 1000 / entry["runs"], 3),
+            }
+            for kind, entry in self.kinds.items()
+        }
+
+
+class Worker:
+    """Claims due jobs from the jobs table and runs up to ``concurrency`` at once.
+
+    Failed runs are retried after an exponentially growing, jittered delay
+    until ``max_attempts`` is reached. A job whose worker died mid-run is
+    claimed again once its ``lease_seconds`` expire, so handlers should be
+    safe to run twice.
+    """
+
+    # The worker running in this process, if any; see wake().
+    current = None
+
+    def __init__(self, handlers: dict = HANDLERS, concurrency: int = JOBS_CONCURRENCY,
+                 poll_interval: float = JOBS_POLL_INTERVAL, lease_seconds: float = 300,
+                 retry_base: float = 5, retry_max: float = 3600):
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.metrics = JobMetrics()
+        self._tasks = set()
+        self._runner = None
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+
+    @classmethod
+    def wake(cls):
+        """Poll right away instead of at the next interval, e.g. after enqueuing."""
+        if cls.current is not None:
+            cls.current._wakeup.set()
+
+    def start(self):
+        Worker.current = self
+        self._runner = asyncio.create_task(self.run())
+
+    async def stop(self, timeout: float = 30):
+        """Stop claiming jobs and give running ones ``timeout`` seconds to finish."""
+        self._stopping.set()
+        if self._runner is not None:
+            await self._runner
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            # Unfinished jobs keep their lease and are picked up again later.
+            for task in pending:
+                task.cancel()
+        if Worker.current is self:
+            Worker.current = None
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._tasks), "concurrency": self.concurrency, "kinds": self.metrics.snapshot()}
+
+    async def run(self):
+        while not self._stopping.is_set():
+            free = self.concurrency - len(self._tasks)
+            claimed = []
+            if free > 0:
+                try:
+                    claimed = await Database.run(jobs_repo.claim, free, self.lease_seconds)
+                except Exception as e:
+                    print(f"Error claiming jobs: {e}")
+            for job in claimed:
+                task = asyncio.create_task(self.execute(job))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            if free > 0 and len(claimed) == free:
+                continue  # More may be due; poll again straight away.
+            self._wakeup.clear()
+            waiters = [asyncio.ensure_future(self._stopping.wait()), asyncio.ensure_future(self._wakeup.wait())]
+            if free == 0:
+                # Every slot is busy; poll again as soon as one frees up.
+                waiters.append(asyncio.ensure_future(asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)))
+            _, pending = await asyncio.wait(waiters, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in pending:
+                waiter.cancel()
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def execute(self, job):
+        kind = job["kind"]
+        started = time.perf_counter()
+        try:
+            handler = self.handlers.get(kind)
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind '{kind}'.")
+            await handler(json.loads(job["payload"]))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            elapsed = time.perf_counter() - started
+            try:
+                if isinstance(e, LookupError) or job["attempts"] >= job["max_attempts"]:
+                    await Database.run(jobs_repo.fail, job["id"], error)
+                    self.metrics.record(kind, "failed", elapsed)
+                    print(f"Job {job['id']} ({kind}) failed after {job['attempts']} attempt(s): {error}")
+                else:
+                    await Database.run(jobs_repo.retry, job["id"], error, self.backoff(job["attempts"]))
+                    self.metrics.record(kind, "retried", elapsed)
+            except Exception as db_error:
+                print(f"Error recording the outcome of job {job['id']}: {db_error}")
+            return
+
+        try:
+            await Database.run(jobs_repo.complete, job["id"])
+        except Exception as e:
+            print(f"Error recording the outcome of job {job['id']}: {e}")
+        self.metrics.record(kind, "succeeded", time.perf_counter() - started)
+
+
+async def main():
+    from app.migrations import apply_migrations
+
+    await Database.connect(DB_CONNECTION_STRING, pooler_mode=DB_POOLER_MODE, min_size=1, max_size=JOBS_CONCURRENCY + 1)
+    await Database.run(apply_migrations)
+    worker = Worker()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    worker.start()
+    print(f"Job worker running with concurrency {worker.concurrency}.")
+    try:
+        await stop.wait()
+    finally:
+        await worker.stop()
+        await Database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,7 +1,14 @@
 from fastapi import FastAPI
 from app.startup import startup, shutdown
-from app.routes import user, booking, contact_us, admin
+from app.routes import user, booking, contact_us, admin, search, home, health
 from fastapi.middleware.cors import CORSMiddleware
+from app.config import (
+    COMPRESSION_MIN_SIZE, COMPRESSION_CACHE_MB, READ_YOUR_WRITES_SECONDS, READ_YOUR_WRITES_COOKIE_SAMESITE,
+    READ_YOUR_WRITES_COOKIE_SECURE,
+)
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.drain import DrainMiddleware
+from app.middleware.replicas import ReadRoutingMiddleware
 
 app = FastAPI()
 
@@ -21,6 +28,21 @@ app.add_middleware(
     allow_methods=["*"],  # Allow all HTTP methods (GET, POST, etc.)
     allow_headers=["*"],  # Allow all headers
 )
+# Sends GET queries to read replicas, when configured
+app.add_middleware(
+    ReadRoutingMiddleware,
+    sticky_seconds=READ_YOUR_WRITES_SECONDS,
+    cookie_samesite=READ_YOUR_WRITES_COOKIE_SAMESITE,
+    cookie_secure=None if READ_YOUR_WRITES_COOKIE_SECURE == "auto" else READ_YOUR_WRITES_COOKIE_SECURE in ("1", "true", "yes"),
+)
+# Counts requests still running, so shutdown can wait for them
+app.add_middleware(DrainMiddleware)
+# Outermost, so it also compresses error responses
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MIN_SIZE,
+    cache_bytes=COMPRESSION_CACHE_MB * 1024 * 1024,
+)
 @app.get("/")
 def root():
     return {"message": "Welcome to the Modular Hotel Backend API!"}
@@ -30,7 +52,12 @@ app.include_router(user.router, prefix="/users")
 app.include_router(booking.router, prefix="/bookings")
 app.include_router(contact_us.router, prefix="/contact-us")
 app.include_router(admin.router, prefix="/admin")
+app.include_router(search.router, prefix="/search")
+app.include_router(home.router, prefix="/home")
+app.include_router(health.router)
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    from app.server import main
+
+    main()
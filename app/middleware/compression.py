@@ -0,0 +1,220 @@
+from collections import OrderedDict
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+import gzip
+import hashlib
+
+# brotli and zstandard are optional (the "compression" extra); gzip is always
+# available.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+# Never buffered: each event has to reach the client as soon as it is sent.
+STREAMING_TYPES = ("text/event-stream",)
+
+
+def _compressors() -> dict:
+    compressors = {}
+    if zstandard is not None:
+        compressors["zstd"] = lambda body: zstandard.ZstdCompressor(level=3).compress(body)
+    if brotli is not None:
+        compressors["br"] = lambda body: brotli.compress(body, quality=5)
+    compressors["gzip"] = lambda body: gzip.compress(body, compresslevel=6, mtime=0)
+    return compressors
+
+
+# Server preference, best ratio-for-CPU first.
+COMPRESSORS = _compressors()
+
+
+def negotiate(accept_encoding: str, available=COMPRESSORS):
+    """Pick the encoding to use for an Accept-Encoding header, or None.
+
+    Args:
+        accept_encoding (str): The request's Accept-Encoding header.
+        available: Supported encodings, in server preference order.
+
+    Returns:
+        str: The accepted encoding with the highest q-value, ties broken by
+        server preference; None if the client accepts none of them.
+    """
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressedCache:
+    """LRU of compressed bodies keyed by ``(entity tag, encoding)``, bounded in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self.size -= len(self._entries.pop(key))
+        self._entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+
+class CompressionMiddleware:
+    """Compress JSON and text responses with the best encoding the client accepts.
+
+    Bodies under ``minimum_size`` are sent as is, and bodies of at least
+    ``threadpool_size`` bytes are compressed in the thread pool so the event
+    loop keeps serving other requests. Compressed GET responses are cached by
+    entity tag and encoding: the response's ETag when the route sets one, a
+    digest of the body otherwise, so a repeated catalog response costs no
+    compression CPU. Streamed responses pass through untouched. Every JSON
+    or text response carries ``Vary: Accept-Encoding``, compressed or not.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, threadpool_size: int = 64 * 1024,
+                 cache_bytes: int = 32 * 1024 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.threadpool_size = threadpool_size
+        self.cache = CompressedCache(cache_bytes) if cache_bytes else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # Even without an accepted encoding the responder runs, to add Vary.
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        resource = scope["path"], scope.get("query_string", b"")
+        responder = _CompressionResponder(self, encoding, resource if scope["method"] == "GET" else None)
+        await self.app(scope, receive, responder.wrap(send))
+
+    async def compress(self, encoding: str, body: bytes) -> bytes:
+        return await self._offload(COMPRESSORS[encoding], body)
+
+    async def digest(self, body: bytes) -> bytes:
+        return await self._offload(_digest, body)
+
+    async def _offload(self, fn, body: bytes):
+        if len(body) >= self.threadpool_size:
+            return await run_in_threadpool(fn, body)
+        return fn(body)
+
+
+def _digest(body: bytes) -> bytes:
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, resource):
+        self.middleware = middleware
+        self.encoding = encoding
+        # Path and query of a GET request; None when the response is not cached.
+        self.resource = resource
+        self.start = None
+        self.passthrough = False
+
+    def wrap(self, send):
+        async def wrapped(message):
+            await self.send(send, message)
+        return wrapped
+
+    async def send(self, send, message):
+        if message["type"] == "http.response.start":
+            # Hold the headers until the body shows whether to compress.
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+                or content_type.startswith(STREAMING_TYPES)
+            )
+            if self.passthrough:
+                await send(message)
+                return
+            # Compressed or not, the body depends on Accept-Encoding, so
+            # caches must key on it even for small or identity responses.
+            MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            if self.encoding is None:
+                self.passthrough = True
+                await send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await send(message)
+            return
+
+        body = message.get("body", b"")
+        if message.get("more_body", False):
+            # A streamed body; send it uncompressed rather than buffer it.
+            self.passthrough = True
+            await send(self.start)
+            await send(message)
+            return
+        if len(body) < self.middleware.minimum_size:
+            await send(self.start)
+            await send(message)
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        compressed = await self._compressed(body, headers)
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        await send(self.start)
+        await send({"type": "http.response.body", "body": compressed})
+
+    async def _compressed(self, body: bytes, headers) -> bytes:
+        cache = self.middleware.cache
+        if cache is None or self.resource is None or self.start["status"] != 200:
+            return await self.middleware.compress(self.encoding, body)
+        # A route's ETag is only meaningful for its own URL; a body digest is
+        # the same wherever the body came from.
+        etag = headers.get("etag")
+        if etag:
+            key = (self.resource, etag, self.encoding)
+        else:
+            key = (await self.middleware.digest(body), self.encoding)
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = await self.middleware.compress(self.encoding, body)
+            cache.put(key, compressed)
+        return compressed
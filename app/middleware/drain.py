@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+
+class DrainMiddleware:
+    """Count in-flight HTTP requests so shutdown can wait for them to finish.
+
+    ``draining`` is set as soon as the server starts shutting down (see
+    ``app.server.Server``), or at the latest by ``drain()``: from then on
+    /readyz reports the instance as not ready. Shutdown calls ``drain()``
+    before closing the database pool; it returns once every request already
+    in progress has completed, or after ``timeout``. Long-lived responses
+    should check ``draining`` and end early.
+    """
+
+    in_flight = 0
+    draining = False
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        DrainMiddleware.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            DrainMiddleware.in_flight -= 1
+
+    @classmethod
+    async def drain(cls, timeout: float, poll: float = 0.05) -> int:
+        """Stop reporting ready and wait for in-flight requests.
+
+        Args:
+            timeout (float): Longest time to wait, in seconds.
+            poll (float): How often to check, in seconds.
+
+        Returns:
+            int: Requests still running when the wait ended; 0 if all finished.
+        """
+        cls.draining = True
+        deadline = time.monotonic() + timeout
+        while cls.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(poll)
+        return cls.in_flight
@@ -0,0 +1,73 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from app.db import Database, min_lsn, primary_writes, read_only_request
+import re
+
+LSN_COOKIE = "db_lsn"
+
+LSN_PATTERN = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+
+READ_METHODS = ("GET", "HEAD")
+
+
+class ReadRoutingMiddleware:
+    """Route GET and HEAD requests' queries to read replicas without losing a client's own writes.
+
+    A successful response to a request that ran a write on the primary sets
+    a short-lived cookie with the primary's WAL position. While it lasts,
+    the client's reads only go to a replica that has replayed that far, and
+    to the primary otherwise. Does nothing unless replicas are configured.
+
+    Args:
+        sticky_seconds (float): Lifetime of the cookie.
+        cookie_samesite (str): Its SameSite attribute: "none", "lax" or "strict".
+        cookie_secure (bool): Whether it is Secure; None follows the request scheme.
+    """
+
+    def __init__(self, app, sticky_seconds: float = 10, cookie_samesite: str = "none", cookie_secure: bool = None):
+        if cookie_samesite not in ("none", "lax", "strict"):
+            raise ValueError(f"cookie_samesite must be none, lax or strict, not {cookie_samesite!r}")
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+        self.cookie_samesite = cookie_samesite
+        self.cookie_secure = cookie_secure
+
+    def lsn_cookie(self, scope, lsn: str) -> str:
+        secure = self.cookie_secure if self.cookie_secure is not None else scope.get("scheme") == "https"
+        # Browsers reject SameSite=None without Secure.
+        samesite = "lax" if self.cookie_samesite == "none" and not secure else self.cookie_samesite
+        cookie = f"{LSN_COOKIE}={lsn}; Max-Age={self.sticky_seconds:g}; Path=/; HttpOnly; SameSite={samesite.capitalize()}"
+        return cookie + "; Secure" if secure else cookie
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not Database.replicas or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in READ_METHODS:
+            lsn = cookie_parser(Headers(scope=scope).get("cookie", "")).get(LSN_COOKIE)
+            read_only = read_only_request.set(True)
+            after = min_lsn.set(lsn if lsn and LSN_PATTERN.match(lsn) else None)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                min_lsn.reset(after)
+                read_only_request.reset(read_only)
+            return
+
+        wrote = [False]
+
+        async def send_with_lsn(message):
+            if message["type"] == "http.response.start" and message["status"] < 400 and wrote[0]:
+                try:
+                    lsn = await Database.current_lsn()
+                    MutableHeaders(raw=message["headers"]).append("Set-Cookie", self.lsn_cookie(scope, lsn))
+                except Exception as e:
+                    print(f"Error reading the WAL position for read-your-writes: {e}")
+            await send(message)
+
+        writes = primary_writes.set(wrote)
+        try:
+            await self.app(scope, receive, send_with_lsn)
+        finally:
+            primary_writes.reset(writes)
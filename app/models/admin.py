@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from datetime import date
+from typing import Dict, List, Optional, Union
+from app.models.common import Message, Timestamp
 
 class AdminBase(BaseModel):
     name: str
@@ -19,4 +22,224 @@ class Package(BaseModel):
 
 class MenuDisplayInput(BaseModel):
     occasion_id: int
-    packages: List[Package]
\ No newline at end of file
+    packages: List[Package]
+
+
+# Responses. tags and images are JSONB, sent as the JSON text Postgres returns.
+class Occasion(BaseModel):
+    id: int
+    name: str
+    heading: str
+    description: str
+    price: float
+    standard_price: Optional[float]
+    outstandard_price: Optional[float]
+    tags: str
+    images: str
+
+
+# Only the ?fields= / ?view= columns are set; the rest are left out of the JSON.
+# Rows are sent as they come, so a column without a field here is kept too.
+class PartialOccasion(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    id: int
+    name: Optional[str] = None
+    heading: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+    standard_price: Optional[float] = None
+    outstandard_price: Optional[float] = None
+    tags: Optional[str] = None
+    images: Optional[str] = None
+    thumbnail: Optional[str] = None
+
+
+class OccasionList(BaseModel):
+    occasions: List[Occasion]
+
+
+class PartialOccasionList(BaseModel):
+    occasions: List[PartialOccasion]
+
+
+class Dish(BaseModel):
+    id: int
+    name: Optional[str]
+    image: Optional[str]
+
+
+class Menu(BaseModel):
+    id: int
+    heading: Optional[str]
+    heading_image: Optional[str]
+    dishes: List[Dish]
+
+
+class MenuList(BaseModel):
+    menus: List[Menu]
+
+
+class SubPackageResponse(BaseModel):
+    subpackage_id: int
+    name: Optional[str]
+    price: Optional[float]
+
+
+class PackageResponse(BaseModel):
+    package_id: int
+    name: Optional[str]
+    price: Optional[float]
+    subpackages: List[SubPackageResponse]
+
+
+class MenuDisplay(BaseModel):
+    occasion_id: int
+    menu_display: List[PackageResponse]
+
+
+class PackageSubPackages(BaseModel):
+    package_id: int
+    subpackages: List[SubPackageResponse]
+
+
+class Event(BaseModel):
+    id: int
+    name: Optional[str]
+    description: Optional[str]
+    price: Optional[float]
+    pic_path: Optional[str]
+
+
+class PartialEvent(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    id: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+    pic_path: Optional[str] = None
+
+
+class EventList(BaseModel):
+    events: List[Event]
+
+
+class PartialEventList(BaseModel):
+    events: List[PartialEvent]
+
+
+class AnalyticsBucket(BaseModel):
+    # A date or hour label, or the hour of the day for "hour_of_day".
+    bucket: Union[str, int]
+    bookings: int
+    covers: int
+
+
+class BookingAnalytics(BaseModel):
+    granularity: str
+    timezone: str
+    start: Optional[date]
+    end: Optional[date]
+    total_bookings: int
+    total_covers: int
+    buckets: List[AnalyticsBucket]
+
+
+# Rows of the check and partitions queries, sent whole.
+class AnalyticsMismatch(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    rollup: str
+    period: str
+    expected_bookings: int
+    rollup_bookings: int
+    expected_covers: int
+    rollup_covers: int
+
+
+class AnalyticsCheck(BaseModel):
+    consistent: bool
+    mismatched_slots: int
+    mismatches: List[AnalyticsMismatch]
+
+
+class AnalyticsRebuilt(Message):
+    repaired_slots: int
+
+
+class BookingPartition(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    partition: str
+    bounds: str
+    estimated_rows: int
+    bytes: int
+
+
+class BookingArchive(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    partition: str
+    range_start: Timestamp
+    range_end: Timestamp
+    path: Optional[str]
+    rows: Optional[int]
+    detached_at: Timestamp
+    archived_at: Optional[Timestamp]
+
+
+class BookingPartitions(BaseModel):
+    partitions: List[BookingPartition]
+    archives: List[BookingArchive]
+
+
+class ImageGcReport(BaseModel):
+    dry_run: bool
+    scanned: int
+    too_recent: int
+    referenced: int
+    unreferenced: int
+    unreferenced_bytes: int
+    deleted: int
+    bytes_freed: int
+    # The first unreferenced paths only; the counts cover every file.
+    paths: List[str]
+
+
+class JobQueueStats(BaseModel):
+    # Jobs per status, e.g. "queued", "running", "failed"
+    counts: Dict[str, int]
+    oldest_due_seconds: Optional[float]
+
+
+class JobKindStats(BaseModel):
+    succeeded: int
+    retried: int
+    failed: int
+    mean_ms: float
+
+
+class WorkerStats(BaseModel):
+    in_flight: int
+    concurrency: int
+    kinds: Dict[str, JobKindStats]
+
+
+# worker is null when this process runs no job worker.
+class JobsStats(BaseModel):
+    queue: JobQueueStats
+    worker: Optional[WorkerStats]
+
+
+class BookingFeedStats(BaseModel):
+    connected: bool
+    subscribers: int
+    published: int
+    history: int
+    disconnected_subscribers: int
+
+
+# feed is null when this process has not started the booking feed.
+class BookingFeedStatus(BaseModel):
+    feed: Optional[BookingFeedStats]
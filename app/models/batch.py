@@ -0,0 +1,77 @@
+from pydantic import BaseModel, EmailStr, field_validator
+from datetime import timezone
+import datetime as dt
+from typing import List, Literal, Optional
+from app.models.common import Message
+
+
+class EventFields(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+    pic_path: Optional[str] = None
+
+
+class ServiceFields(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    image_path: Optional[str] = None
+
+
+class TeamMemberFields(BaseModel):
+    name: Optional[str] = None
+    designation: Optional[str] = None
+    description: Optional[str] = None
+    image_path: Optional[str] = None
+
+
+class BookingFields(BaseModel):
+    user_id: Optional[str] = None
+    name: Optional[str] = None
+    email: Optional[EmailStr] = None
+    phone_no: Optional[str] = None
+    # Module-qualified: a bare "datetime" would resolve to this field's default.
+    datetime: Optional[dt.datetime] = None
+    no_of_people: Optional[int] = None
+    special_request: Optional[str] = None
+
+    @field_validator("datetime")
+    @classmethod
+    def ensure_timezone(cls, value):
+        # Same rule as BookingInput: naive times are UTC
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc) if value is not None else None
+
+
+# Fields model per batch resource
+BATCH_FIELDS = {
+    "events": EventFields,
+    "services": ServiceFields,
+    "team_members": TeamMemberFields,
+    "bookings": BookingFields,
+}
+
+
+class BatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    resource: Literal["events", "services", "team_members", "bookings"]
+    id: Optional[int] = None
+    fields: dict = {}
+
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation]
+
+
+class BatchResult(BaseModel):
+    index: int
+    op: str
+    resource: str
+    # The new row's id for a create
+    id: Optional[int]
+    status: Literal["created", "updated", "deleted", "not_found"]
+
+
+class BatchApplied(Message):
+    results: List[BatchResult]
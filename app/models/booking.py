@@ -1,5 +1,7 @@
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
 from datetime import datetime, timezone
+from typing import List, Optional
+from app.models.common import Message, Timestamp
 
 class BookingInput(BaseModel):
     user_id: str
@@ -8,15 +10,68 @@ class BookingInput(BaseModel):
     phone_no: str
     datetime: datetime
     no_of_people: int
-    special_request: str = None
+    special_request: Optional[str] = None
 
-    @validator("datetime", pre=True, always=True)
+    @field_validator("datetime")
+    @classmethod
     def ensure_timezone(cls, value):
-        # Convert string to datetime if necessary
-        if isinstance(value, str):
-            value = datetime.fromisoformat(value)
-        
-        # Ensure the datetime is timezone-aware
+        # Strings are already parsed; a naive datetime is taken as UTC
         if value.tzinfo is None:
             value = value.replace(tzinfo=timezone.utc)
         return value.astimezone(timezone.utc)
+
+
+class BookingCreated(Message):
+    booking_id: int
+
+
+class UserBooking(BaseModel):
+    id: int
+    name: Optional[str]
+    email: Optional[str]
+    phone_no: Optional[str]
+    datetime: Optional[Timestamp]
+    no_of_people: Optional[int]
+    special_request: Optional[str]
+
+
+class UserBookings(BaseModel):
+    user_id: str
+    bookings: List[UserBooking]
+
+
+# Every column of bookings is sent, including any without a field here.
+# The projections below keep unknown columns the same way.
+class Booking(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    id: int
+    user_id: Optional[str]
+    name: Optional[str]
+    email: Optional[str]
+    phone_no: Optional[str]
+    datetime: Optional[Timestamp]
+    no_of_people: Optional[int]
+    special_request: Optional[str]
+
+
+# Only the ?fields= / ?view= columns are set; the rest are left out of the JSON.
+class PartialBooking(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    id: int
+    user_id: Optional[str] = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone_no: Optional[str] = None
+    datetime: Optional[Timestamp] = None
+    no_of_people: Optional[int] = None
+    special_request: Optional[str] = None
+
+
+class BookingList(BaseModel):
+    bookings: List[Booking]
+
+
+class PartialBookingList(BaseModel):
+    bookings: List[PartialBooking]
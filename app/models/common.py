@@ -0,0 +1,15 @@
+from pydantic import BaseModel, PlainSerializer
+from datetime import datetime
+from typing import Annotated, Optional
+
+# Timestamps keep their isoformat() text ("+00:00"), as the API has always
+# sent them; pydantic's own JSON would write UTC as "Z".
+Timestamp = Annotated[datetime, PlainSerializer(datetime.isoformat, return_type=str, when_used="json")]
+
+
+class Message(BaseModel):
+    message: str
+
+
+class JobQueued(Message):
+    job_id: Optional[int] = None
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+
+class Liveness(BaseModel):
+    status: Literal["ok"]
+
+
+class ReplicaStatus(BaseModel):
+    available: bool
+    # Connections in use; null while the replica's pool is not open
+    busy: Optional[int]
+    reads: int
+    fallbacks: int
+
+
+class ReadinessChecks(BaseModel):
+    draining: bool
+    pool_warmed: bool
+    # Null when the database could not be asked
+    pending_migrations: Optional[List[str]]
+    # Only present when the database check failed
+    database_error: Optional[str] = None
+    replicas: List[ReplicaStatus]
+
+
+class Readiness(BaseModel):
+    status: Literal["ready", "not_ready"]
+    checks: ReadinessChecks
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from app.models.admin import Menu, PartialEvent, PartialOccasion
+
+
+# A section that failed is null and its error is listed under "errors".
+class HomePage(BaseModel):
+    occasions: Optional[List[PartialOccasion]]
+    events: Optional[List[PartialEvent]]
+    menus: Optional[List[Menu]]
+    errors: Optional[Dict[str, str]] = None
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+
+class SearchResult(BaseModel):
+    type: Literal["occasion", "event", "menu", "dish"]
+    id: int
+    title: Optional[str]
+    subtitle: Optional[str]
+    price: Optional[float]
+    image: Optional[str]
+    # The menu a dish belongs to
+    menu_id: Optional[int]
+    rank: float
+
+
+class SearchResults(BaseModel):
+    query: Optional[str]
+    total: int
+    limit: int
+    offset: int
+    results: List[SearchResult]
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, EmailStr
+from app.models.common import Message
 
 class UserSignup(BaseModel):
     email: EmailStr
@@ -7,4 +8,18 @@ class UserSignup(BaseModel):
 
 class UserLogin(BaseModel):
     email: EmailStr
-    password: str
\ No newline at end of file
+    password: str
+
+
+class SignupResponse(Message):
+    user_id: str
+
+
+class UserProfile(BaseModel):
+    user_id: str
+    email: str
+    username: str
+
+
+class LoginResponse(Message):
+    user: UserProfile
@@ -0,0 +1,176 @@
+from functools import lru_cache
+
+# Set-based create/update/delete for the admin batch endpoint. Each statement
+# handles every operation of one kind on one table: rows travel as one array
+# per column and are unpacked with unnest, so a batch costs one create, one
+# delete and one update per distinct set of changed columns on each table,
+# however many rows it touches.
+
+# Writable columns and their Postgres array element types, per table. The
+# table and column names are interpolated into SQL, so only these are allowed.
+COLUMNS = {
+    "events": {
+        "pic_path": "text",
+        "name": "text",
+        "description": "text",
+        "price": "float8",
+    },
+    "services": {
+        "name": "text",
+        "description": "text",
+        "image_path": "text",
+    },
+    "team_members": {
+        "name": "text",
+        "designation": "text",
+        "description": "text",
+        "image_path": "text",
+    },
+    "bookings": {
+        "user_id": "text",
+        "name": "text",
+        "email": "text",
+        "phone_no": "text",
+        "datetime": "timestamptz",
+        "no_of_people": "int4",
+        "special_request": "text",
+    },
+}
+
+# Fields a create must provide, matching what the single-row endpoints require.
+REQUIRED = {
+    "events": ("pic_path", "name", "description", "price"),
+    "services": ("name",),
+    "team_members": ("name",),
+    "bookings": ("user_id", "name", "email", "phone_no", "datetime", "no_of_people"),
+}
+
+# Columns holding upload paths; changing or deleting them can orphan a file.
+IMAGE_COLUMNS = {
+    "events": "pic_path",
+    "services": "image_path",
+    "team_members": "image_path",
+}
+
+
+def _insert_sql(table: str, columns: dict) -> str:
+    names = ", ".join(columns)
+    arrays = ", ".join(f"${n}::{kind}[]" for n, kind in enumerate(columns.values(), start=1))
+    # INSERT ... RETURNING cannot see the input position, so each row's id is
+    # drawn from the table's sequence alongside it and inserted explicitly.
+    return f"""
+        WITH rows AS MATERIALIZED (
+            SELECT nextval(pg_get_serial_sequence('{table}', 'id')) AS id, position, {names}
+            FROM unnest({arrays}) WITH ORDINALITY AS u({names}, position)
+        ), inserted AS (
+            INSERT INTO {table} (id, {names})
+            SELECT id, {names} FROM rows ORDER BY position
+            RETURNING id
+        )
+        SELECT inserted.id, rows.position FROM inserted JOIN rows USING (id)
+    """
+
+
+@lru_cache(maxsize=None)
+def _update_sql(table: str, names: tuple) -> str:
+    """Update of exactly the columns ``names``, which may set them to NULL."""
+    kinds = COLUMNS[table]
+    arrays = ", ".join(f"${n}::{kinds[name]}[]" for n, name in enumerate(names, start=2))
+    assignments = ", ".join(f"{name} = u.{name}" for name in names)
+    return f"""
+        UPDATE {table} AS t
+        SET {assignments}
+        FROM unnest($1::int[], {arrays}) AS u(id, {', '.join(names)})
+        WHERE t.id = u.id
+        RETURNING t.id
+    """
+
+
+def _delete_sql(table: str) -> str:
+    return f"DELETE FROM {table} WHERE id = ANY($1::int[]) RETURNING id"
+
+
+INSERT = {table: _insert_sql(table, columns) for table, columns in COLUMNS.items()}
+DELETE = {table: _delete_sql(table) for table in COLUMNS}
+
+
+def _columns(rows, names):
+    return [[row.get(name) for row in rows] for name in names]
+
+
+async def create(conn, table: str, rows) -> list:
+    """Insert ``rows`` (dicts of column values) and return their ids in input order."""
+    columns = COLUMNS[table]
+    records = await conn.fetch(INSERT[table], *_columns(rows, columns))
+    ids = [None] * len(rows)
+    for record in records:
+        ids[record["position"] - 1] = record["id"]
+    return ids
+
+
+async def update(conn, table: str, changes: dict) -> set:
+    """Apply ``{id: {column: value}}`` and return the ids that exist.
+
+    Only the columns given for a row are written, so ``None`` sets a column
+    to NULL. Rows changing the same set of columns share one statement.
+    """
+    by_columns = {}
+    for id, fields in changes.items():
+        by_columns.setdefault(tuple(name for name in COLUMNS[table] if name in fields), []).append(id)
+    found = set()
+    for names, ids in by_columns.items():
+        records = await conn.fetch(_update_sql(table, names), ids, *_columns([changes[id] for id in ids], names))
+        found.update(record["id"] for record in records)
+    return found
+
+
+async def delete(conn, table: str, ids) -> set:
+    """Delete rows by id and return the ids that existed."""
+    records = await conn.fetch(DELETE[table], list(ids))
+    return {record["id"] for record in records}
+
+
+async def apply(conn, operations) -> list:
+    """Run a validated batch; call it inside a transaction.
+
+    Per table, creates run first, then updates, then deletes, so an update
+    and a delete of the same row leave it deleted. Several updates of one row
+    are merged, later fields winning.
+
+    Args:
+        operations (list): Dicts with ``op``, ``resource``, ``id`` and ``fields``.
+
+    Returns:
+        list: One ``{"index", "op", "resource", "id", "status"}`` dict per
+        operation, in request order; ``status`` is "created", "updated",
+        "deleted" or "not_found".
+    """
+    results = [
+        {"index": index, "op": operation["op"], "resource": operation["resource"], "id": operation["id"], "status": None}
+        for index, operation in enumerate(operations)
+    ]
+    for table in COLUMNS:
+        by_op = {"create": [], "update": [], "delete": []}
+        for index, operation in enumerate(operations):
+            if operation["resource"] == table:
+                by_op[operation["op"]].append(index)
+
+        if by_op["create"]:
+            ids = await create(conn, table, [operations[index]["fields"] for index in by_op["create"]])
+            for index, id in zip(by_op["create"], ids):
+                results[index]["id"] = id
+                results[index]["status"] = "created"
+
+        if by_op["update"]:
+            changes = {}
+            for index in by_op["update"]:
+                changes.setdefault(operations[index]["id"], {}).update(operations[index]["fields"])
+            found = await update(conn, table, changes)
+            for index in by_op["update"]:
+                results[index]["status"] = "updated" if results[index]["id"] in found else "not_found"
+
+        if by_op["delete"]:
+            found = await delete(conn, table, {operations[index]["id"] for index in by_op["delete"]})
+            for index in by_op["delete"]:
+                results[index]["status"] = "deleted" if results[index]["id"] in found else "not_found"
+    return results
@@ -0,0 +1,129 @@
+# Reads booking_rollups and booking_rollups_daily (migration 0004), never
+# bookings itself, except for the consistency check and rebuild. Rollups
+# outlive the bookings partitions archived out of the database (migration
+# 0006), so the check and rebuild only cover months not yet archived.
+
+GRANULARITIES = ("hour", "day", "week", "hour_of_day")
+
+# Days and weeks in UTC: at most a few thousand daily rows whatever the range.
+# $1 granularity for date_trunc, $2 / $3 first and last date (inclusive) or NULL.
+DAILY_SERIES = """
+    SELECT date_trunc($1, day)::date AS bucket,
+           sum(bookings)::bigint AS bookings,
+           sum(covers)::bigint AS covers
+    FROM booking_rollups_daily
+    WHERE ($2::date IS NULL OR day >= $2)
+      AND ($3::date IS NULL OR day <= $3)
+    GROUP BY 1
+    HAVING sum(bookings) <> 0
+    ORDER BY 1
+"""
+
+# Any granularity in any whole-hour time zone, regrouped from hourly rows.
+# $1 granularity for date_trunc, $2 time zone, $3 / $4 first and last local
+# date (inclusive) or NULL.
+SERIES = """
+    SELECT date_trunc($1, slot AT TIME ZONE $2) AS bucket,
+           sum(bookings)::bigint AS bookings,
+           sum(covers)::bigint AS covers
+    FROM booking_rollups
+    WHERE ($3::date IS NULL OR slot >= $3::date::timestamp AT TIME ZONE $2)
+      AND ($4::date IS NULL OR slot < ($4::date + 1)::timestamp AT TIME ZONE $2)
+    GROUP BY 1
+    HAVING sum(bookings) <> 0
+    ORDER BY 1
+"""
+
+HOUR_OF_DAY = """
+    SELECT extract(hour FROM slot AT TIME ZONE $1)::int AS bucket,
+           sum(bookings)::bigint AS bookings,
+           sum(covers)::bigint AS covers
+    FROM booking_rollups
+    WHERE ($2::date IS NULL OR slot >= $2::date::timestamp AT TIME ZONE $1)
+      AND ($3::date IS NULL OR slot < ($3::date + 1)::timestamp AT TIME ZONE $1)
+    GROUP BY 1
+    HAVING sum(bookings) <> 0
+    ORDER BY 1
+"""
+
+# Start of the first month still in bookings; everything before is archived.
+LIVE_FROM = "(SELECT coalesce(max(range_end), '-infinity') FROM bookings_archives)"
+
+RAW_BY_SLOT = f"""
+    SELECT date_trunc('hour', datetime, 'UTC') AS slot, count(*) AS bookings, coalesce(sum(no_of_people), 0) AS covers
+    FROM bookings
+    WHERE datetime >= {LIVE_FROM}
+    GROUP BY 1
+"""
+
+LIVE_ROLLUPS = f"(SELECT * FROM booking_rollups WHERE slot >= {LIVE_FROM})"
+
+LIVE_ROLLUPS_DAILY = f"(SELECT * FROM booking_rollups_daily WHERE day >= ({LIVE_FROM} AT TIME ZONE 'UTC')::date)"
+
+# Hours and days where a rollup disagrees with a full aggregation of bookings.
+CHECK = f"""
+    WITH raw AS ({RAW_BY_SLOT}),
+    raw_daily AS (
+        SELECT (slot AT TIME ZONE 'UTC')::date AS day, sum(bookings) AS bookings, sum(covers) AS covers
+        FROM raw GROUP BY 1
+    )
+    SELECT 'hour' AS rollup, coalesce(raw.slot, r.slot)::text AS period,
+           coalesce(raw.bookings, 0) AS expected_bookings, coalesce(r.bookings, 0) AS rollup_bookings,
+           coalesce(raw.covers, 0) AS expected_covers, coalesce(r.covers, 0) AS rollup_covers
+    FROM raw
+    FULL JOIN {LIVE_ROLLUPS} r ON r.slot = raw.slot
+    WHERE coalesce(raw.bookings, 0) <> coalesce(r.bookings, 0)
+       OR coalesce(raw.covers, 0) <> coalesce(r.covers, 0)
+    UNION ALL
+    SELECT 'day', coalesce(raw_daily.day, d.day)::text,
+           coalesce(raw_daily.bookings, 0), coalesce(d.bookings, 0),
+           coalesce(raw_daily.covers, 0), coalesce(d.covers, 0)
+    FROM raw_daily
+    FULL JOIN {LIVE_ROLLUPS_DAILY} d ON d.day = raw_daily.day
+    WHERE coalesce(raw_daily.bookings, 0) <> coalesce(d.bookings, 0)
+       OR coalesce(raw_daily.covers, 0) <> coalesce(d.covers, 0)
+    ORDER BY 1, 2
+"""
+
+LOCK_BOOKINGS = "LOCK TABLE bookings IN SHARE MODE"
+
+CLEAR = f"DELETE FROM booking_rollups WHERE slot >= {LIVE_FROM}"
+
+CLEAR_DAILY = f"DELETE FROM booking_rollups_daily WHERE day >= ({LIVE_FROM} AT TIME ZONE 'UTC')::date"
+
+REBUILD = f"INSERT INTO booking_rollups (slot, bookings, covers) {RAW_BY_SLOT}"
+
+REBUILD_DAILY = f"""
+    INSERT INTO booking_rollups_daily (day, bookings, covers)
+    SELECT (slot AT TIME ZONE 'UTC')::date, sum(bookings), sum(covers)
+    FROM {LIVE_ROLLUPS} r
+    GROUP BY 1
+"""
+
+
+async def series(conn, granularity: str, tz: str, start=None, end=None):
+    """Bookings and covers per bucket, in local time of ``tz``, between two dates inclusive."""
+    if granularity == "hour_of_day":
+        return await conn.fetch(HOUR_OF_DAY, tz, start, end)
+    if tz == "UTC" and granularity in ("day", "week"):
+        return await conn.fetch(DAILY_SERIES, granularity, start, end)
+    return await conn.fetch(SERIES, granularity, tz, start, end)
+
+
+async def check(conn):
+    """Every unarchived hour and day where the rollups disagree with the bookings table."""
+    return await conn.fetch(CHECK)
+
+
+async def rebuild(conn) -> list:
+    """Recompute both rollups for the unarchived months from bookings. Run inside a transaction.
+
+    Returns the mismatches that were found before rebuilding.
+    """
+    await conn.execute(LOCK_BOOKINGS)
+    mismatches = await conn.fetch(CHECK)
+    await conn.execute(CLEAR)
+    await conn.execute(CLEAR_DAILY)
+    await conn.execute(REBUILD)
+    await conn.execute(REBUILD_DAILY)
+    return mismatches
@@ -0,0 +1,89 @@
+# Monthly partitions of bookings (migration 0006) and their archives.
+
+# Only names the maintenance function creates are ever detached or dropped.
+PARTITION_NAME = "^bookings_[0-9]{4}_[0-9]{2}$"
+
+LIST_PARTITIONS = """
+    SELECT c.relname AS partition,
+           pg_get_expr(c.relpartbound, c.oid) AS bounds,
+           greatest(c.reltuples, 0)::bigint AS estimated_rows,
+           pg_total_relation_size(c.oid) AS bytes
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'bookings'::regclass
+    ORDER BY c.relname
+"""
+
+CREATE_PARTITIONS = "SELECT bookings_create_partitions($1, $2)"
+
+# Attached monthly partitions for months before $1.
+LIST_EXPIRED = f"""
+    SELECT c.relname AS partition,
+           to_date(substr(c.relname, 10), 'YYYY_MM') AS month
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'bookings'::regclass
+      AND c.relname ~ '{PARTITION_NAME}'
+      AND to_date(substr(c.relname, 10), 'YYYY_MM') < $1
+    ORDER BY 1
+"""
+
+RECORD_DETACHED = """
+    INSERT INTO bookings_archives (partition, range_start, range_end)
+    VALUES ($1, $2::date::timestamp AT TIME ZONE 'UTC', ($2::date + interval '1 month')::timestamp AT TIME ZONE 'UTC')
+"""
+
+# Detached but not yet written out, e.g. after a crash mid-archive.
+LIST_PENDING = "SELECT partition FROM bookings_archives WHERE archived_at IS NULL ORDER BY partition"
+
+RECORD_ARCHIVED = "UPDATE bookings_archives SET path = $2, rows = $3, archived_at = now() WHERE partition = $1"
+
+LIST_ARCHIVES = """
+    SELECT partition, range_start, range_end, path, rows, detached_at, archived_at
+    FROM bookings_archives
+    ORDER BY partition
+"""
+
+
+def _quoted(partition: str) -> str:
+    # Names come from pg_class and match PARTITION_NAME; quote them anyway.
+    return '"' + partition.replace('"', '""') + '"'
+
+
+async def list_partitions(conn):
+    return await conn.fetch(LIST_PARTITIONS)
+
+
+async def list_archives(conn):
+    return await conn.fetch(LIST_ARCHIVES)
+
+
+async def create_partitions(conn, first_month, last_month) -> int:
+    """Create the missing monthly partitions between two months, inclusive."""
+    return await conn.fetchval(CREATE_PARTITIONS, first_month, last_month)
+
+
+async def list_expired(conn, before):
+    return await conn.fetch(LIST_EXPIRED, before)
+
+
+async def detach(conn, partition: str, month):
+    """Detach a partition and record it for archiving. Run inside a transaction."""
+    await conn.execute(RECORD_DETACHED, partition, month)
+    await conn.execute(f"ALTER TABLE bookings DETACH PARTITION {_quoted(partition)}")
+
+
+async def list_pending(conn) -> list:
+    return [row["partition"] for row in await conn.fetch(LIST_PENDING)]
+
+
+async def copy_out(conn, partition: str, output) -> int:
+    """Write a detached partition as CSV with a header to ``output``; returns the row count."""
+    status = await conn.copy_from_table(partition, output=output, format="csv", header=True)
+    return int(status.split()[-1])
+
+
+async def finish_archive(conn, partition: str, path: str, rows: int):
+    """Record the archive file and drop the table. Run inside a transaction."""
+    await conn.execute(RECORD_ARCHIVED, partition, path, rows)
+    await conn.execute(f"DROP TABLE IF EXISTS {_quoted(partition)}")
@@ -0,0 +1,99 @@
+from app.repositories.fields import select_list
+
+INSERT = """
+    INSERT INTO bookings (user_id, name, email, phone_no, datetime, no_of_people, special_request)
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+    RETURNING id
+"""
+
+LIST_FOR_USER = """
+    SELECT id, name, email, phone_no, datetime, no_of_people, special_request
+    FROM bookings
+    WHERE user_id = $1
+"""
+
+# Reservations from now on. now() is evaluated when the plan starts, so only
+# the current and later monthly partitions are read.
+LIST_UPCOMING_FOR_USER = """
+    SELECT id, name, email, phone_no, datetime, no_of_people, special_request
+    FROM bookings
+    WHERE user_id = $1 AND datetime >= now()
+    ORDER BY datetime
+"""
+
+LIST_ALL = "SELECT * FROM bookings"
+
+# By id alone every monthly partition's index is probed; with the booking's
+# datetime as well only its own partition is read.
+GET = "SELECT * FROM bookings WHERE id = $1"
+
+GET_AT = "SELECT * FROM bookings WHERE id = $1 AND datetime = $2"
+
+# $1 / $2 start (inclusive) and end (exclusive) or NULL for open-ended; the
+# bounds prune the monthly partitions outside the range.
+DATETIME_RANGE = """
+    WHERE datetime >= coalesce($1, '-infinity'::timestamptz)
+      AND datetime < coalesce($2, 'infinity'::timestamptz)
+"""
+
+LIST_BETWEEN = LIST_ALL + DATETIME_RANGE
+
+# Selectable fields for ?fields= / ?view= (see app.repositories.fields).
+FIELDS = {
+    "id": "id",
+    "user_id": "user_id",
+    "name": "name",
+    "email": "email",
+    "phone_no": "phone_no",
+    "datetime": "datetime",
+    "no_of_people": "no_of_people",
+    "special_request": "special_request",
+}
+
+VIEWS = {
+    "card": ("id", "name", "datetime", "no_of_people"),
+}
+
+DELETE = "DELETE FROM bookings WHERE id = $1"
+
+DELETE_AT = "DELETE FROM bookings WHERE id = $1 AND datetime = $2"
+
+
+async def create(conn, user_id, name, email, phone_no, datetime, no_of_people, special_request) -> int:
+    return await conn.fetchval(INSERT, user_id, name, email, phone_no, datetime, no_of_people, special_request)
+
+
+async def list_for_user(conn, user_id: str, upcoming: bool = False):
+    if upcoming:
+        return await conn.fetch(LIST_UPCOMING_FOR_USER, user_id)
+    return await conn.fetch(LIST_FOR_USER, user_id)
+
+
+async def list_all(conn, start=None, end=None):
+    """Every booking, or those with ``start <= datetime < end`` when either bound is given."""
+    if start is None and end is None:
+        return await conn.fetch(LIST_ALL)
+    return await conn.fetch(LIST_BETWEEN, start, end)
+
+
+async def get(conn, id: int, datetime=None):
+    if datetime is None:
+        return await conn.fetchrow(GET, id)
+    return await conn.fetchrow(GET_AT, id, datetime)
+
+
+def fields_query(names, ranged: bool = False) -> str:
+    query = f"SELECT {select_list(names, FIELDS)} FROM bookings"
+    return query + DATETIME_RANGE if ranged else query
+
+
+async def list_fields(conn, names, start=None, end=None):
+    if start is None and end is None:
+        return await conn.fetch(fields_query(names))
+    return await conn.fetch(fields_query(names, ranged=True), start, end)
+
+
+async def delete(conn, id: int, datetime=None) -> bool:
+    if datetime is None:
+        return await conn.execute(DELETE, id) != "DELETE 0"
+    return await conn.execute(DELETE_AT, id, datetime) != "DELETE 0"
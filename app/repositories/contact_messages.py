@@ -0,0 +1,14 @@
+INSERT = """
+    INSERT INTO contact_us (name, email, subject, message)
+    VALUES ($1, $2, $3, $4)
+"""
+
+DELETE = "DELETE FROM contact_us WHERE id = $1"
+
+
+async def create(conn, name: str, email: str, subject: str, message: str):
+    await conn.execute(INSERT, name, email, subject, message)
+
+
+async def delete(conn, id: int) -> bool:
+    return await conn.execute(DELETE, id) != "DELETE 0"
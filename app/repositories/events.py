@@ -0,0 +1,58 @@
+from app.repositories.fields import select_list
+
+LIST_ALL = "SELECT id, name, description, price, pic_path FROM events"
+
+# Selectable fields for ?fields= / ?view= (see app.repositories.fields).
+FIELDS = {
+    "id": "id",
+    "name": "name",
+    "description": "description",
+    "price": "price",
+    "pic_path": "pic_path",
+}
+
+VIEWS = {
+    "card": ("id", "name", "price", "pic_path"),
+}
+
+INSERT = """
+    INSERT INTO events (pic_path, name, description, price)
+    VALUES ($1, $2, $3, $4)
+"""
+
+# Partial update: a NULL parameter keeps the current value, so one statement
+# covers every combination of fields.
+UPDATE = """
+    UPDATE events
+    SET name = COALESCE($2, name),
+        description = COALESCE($3, description),
+        price = COALESCE($4, price),
+        pic_path = COALESCE($5, pic_path)
+    WHERE id = $1
+"""
+
+DELETE = "DELETE FROM events WHERE id = $1"
+
+
+async def list_all(conn):
+    return await conn.fetch(LIST_ALL)
+
+
+def fields_query(names) -> str:
+    return f"SELECT {select_list(names, FIELDS)} FROM events"
+
+
+async def list_fields(conn, names):
+    return await conn.fetch(fields_query(names))
+
+
+async def create(conn, pic_path: str, name: str, description: str, price: float):
+    await conn.execute(INSERT, pic_path, name, description, price)
+
+
+async def update(conn, id: int, name=None, description=None, price=None, pic_path=None) -> bool:
+    return await conn.execute(UPDATE, id, name, description, price, pic_path) != "UPDATE 0"
+
+
+async def delete(conn, id: int) -> bool:
+    return await conn.execute(DELETE, id) != "DELETE 0"
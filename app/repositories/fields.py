@@ -0,0 +1,44 @@
+# Sparse fieldsets for list endpoints. Each repository that supports them
+# declares FIELDS, mapping every selectable response field to the SQL
+# expression that produces it, and VIEWS, named field sets such as "card".
+# Only names found in FIELDS ever reach the SQL text.
+
+
+def resolve(fields: str, view: str, columns: dict, views: dict):
+    """Turn ``?fields=`` / ``?view=`` into an ordered tuple of field names.
+
+    Args:
+        fields (str): Comma-separated field names, or None.
+        view (str): Name of a predefined view, or None.
+        columns (dict): The repository's FIELDS whitelist.
+        views (dict): The repository's VIEWS.
+
+    Returns:
+        tuple: Field names in whitelist order, always including "id", or None
+        when neither was given and the full record is wanted.
+
+    Raises:
+        ValueError: For unknown fields or views, or when both are given.
+    """
+    if fields and view:
+        raise ValueError("Use either 'fields' or 'view', not both.")
+    if view:
+        if view not in views:
+            raise ValueError(f"Unknown view '{view}'. Available: {', '.join(views)}.")
+        return views[view]
+    if not fields:
+        return None
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - columns.keys())
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(columns)}.")
+    # A canonical order keeps the number of distinct statements small.
+    return tuple(name for name in columns if name == "id" or name in requested)
+
+
+def select_list(names, columns: dict) -> str:
+    return ", ".join(
+        name if columns[name] == name else f"{columns[name]} AS {name}"
+        for name in names
+    )
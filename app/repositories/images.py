@@ -0,0 +1,14 @@
+# Every column that points at a file in UPLOAD_DIR. Keep this in sync when a
+# table gains an image column, or the garbage collector will delete its files.
+LIST_REFERENCED = """
+    SELECT jsonb_array_elements_text(images) AS path FROM occasions
+    UNION SELECT pic_path FROM events
+    UNION SELECT image FROM dishes
+    UNION SELECT heading_image FROM menu_headings
+    UNION SELECT image_path FROM services
+    UNION SELECT image_path FROM team_members
+"""
+
+
+async def list_referenced(conn) -> set:
+    return {row["path"] for row in await conn.fetch(LIST_REFERENCED) if row["path"]}
@@ -0,0 +1,78 @@
+INSERT = """
+    INSERT INTO jobs (kind, payload, max_attempts, run_at)
+    VALUES ($1, $2, $3, now() + make_interval(secs => $4))
+    RETURNING id
+"""
+
+# Skipped while a job of the same kind is still waiting to run, so a burst of
+# triggers collapses into one run.
+INSERT_ONCE = """
+    INSERT INTO jobs (kind, payload, max_attempts, run_at)
+    SELECT $1, $2, $3, now() + make_interval(secs => $4)
+    WHERE NOT EXISTS (SELECT 1 FROM jobs WHERE kind = $1 AND status = 'queued')
+    RETURNING id
+"""
+
+# Claims due jobs without blocking on rows other workers hold: SKIP LOCKED
+# lets any number of workers poll the same table. Jobs left "running" past
+# the lease by a worker that died are claimed again.
+CLAIM = """
+    UPDATE jobs
+    SET status = 'running', attempts = attempts + 1, locked_at = now()
+    WHERE id IN (
+        SELECT id FROM jobs
+        WHERE (status = 'queued' AND run_at <= now())
+           OR (status = 'running' AND locked_at < now() - make_interval(secs => $2))
+        ORDER BY run_at
+        LIMIT $1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, kind, payload, attempts, max_attempts
+"""
+
+COMPLETE = "UPDATE jobs SET status = 'done', finished_at = now(), last_error = NULL WHERE id = $1"
+
+RETRY = """
+    UPDATE jobs
+    SET status = 'queued', run_at = now() + make_interval(secs => $3), locked_at = NULL, last_error = $2
+    WHERE id = $1
+"""
+
+FAIL = "UPDATE jobs SET status = 'failed', finished_at = now(), last_error = $2 WHERE id = $1"
+
+COUNT_BY_STATUS = "SELECT status, count(*) AS jobs FROM jobs GROUP BY status"
+
+OLDEST_DUE = "SELECT EXTRACT(EPOCH FROM now() - min(run_at)) FROM jobs WHERE status = 'queued' AND run_at <= now()"
+
+
+async def enqueue(conn, kind: str, payload_json: str, max_attempts: int = 5, delay: float = 0) -> int:
+    """Queue a job. Call it on the connection of the write that caused it so both commit together."""
+    return await conn.fetchval(INSERT, kind, payload_json, max_attempts, float(delay))
+
+
+async def enqueue_once(conn, kind: str, payload_json: str, max_attempts: int = 5, delay: float = 0):
+    """Like enqueue, unless a job of this kind is already queued. Returns the new ID or None."""
+    return await conn.fetchval(INSERT_ONCE, kind, payload_json, max_attempts, float(delay))
+
+
+async def claim(conn, limit: int, lease_seconds: float):
+    return await conn.fetch(CLAIM, limit, float(lease_seconds))
+
+
+async def complete(conn, id: int):
+    await conn.execute(COMPLETE, id)
+
+
+async def retry(conn, id: int, error: str, delay: float):
+    await conn.execute(RETRY, id, error, float(delay))
+
+
+async def fail(conn, id: int, error: str):
+    await conn.execute(FAIL, id, error)
+
+
+async def stats(conn) -> dict:
+    """Job counts per status and the age in seconds of the oldest due job."""
+    counts = {row["status"]: row["jobs"] for row in await conn.fetch(COUNT_BY_STATUS)}
+    lag = await conn.fetchval(OLDEST_DUE)
+    return {"counts": counts, "oldest_due_seconds": float(lag) if lag is not None else None}
@@ -0,0 +1,52 @@
+INSERT_HEADING = """
+    INSERT INTO menu_headings (heading, heading_image)
+    VALUES ($1, $2)
+    RETURNING id
+"""
+
+INSERT_DISH = """
+    INSERT INTO dishes (menu_id, name, image)
+    VALUES ($1, $2, $3)
+"""
+
+LIST_HEADINGS = "SELECT id, heading, heading_image FROM menu_headings"
+
+LIST_DISHES = "SELECT id, menu_id, name, image FROM dishes"
+
+GET_HEADING = "SELECT id, heading, heading_image FROM menu_headings WHERE id = $1"
+
+LIST_DISHES_FOR_HEADING = "SELECT id, menu_id, name, image FROM dishes WHERE menu_id = $1"
+
+# Dishes go with their heading (ON DELETE CASCADE).
+DELETE_HEADING = "DELETE FROM menu_headings WHERE id = $1"
+
+
+async def create(conn, heading: str, heading_image: str, dishes) -> int:
+    """Insert a heading and its ``(name, image)`` dishes. Run inside a transaction."""
+    heading_id = await conn.fetchval(INSERT_HEADING, heading, heading_image)
+    await conn.executemany(INSERT_DISH, [(heading_id, name, image) for name, image in dishes])
+    return heading_id
+
+
+async def list_all(conn) -> list:
+    """Every ``(heading, dishes)`` pair, in two statements instead of one per heading."""
+    headings = await conn.fetch(LIST_HEADINGS)
+    if not headings:
+        return []
+    dishes_by_menu = {}
+    for dish in await conn.fetch(LIST_DISHES):
+        dishes_by_menu.setdefault(dish["menu_id"], []).append(dish)
+    return [(heading, dishes_by_menu.get(heading["id"], [])) for heading in headings]
+
+
+async def get(conn, heading_id: int):
+    """The ``(heading, dishes)`` pair for one menu, or None."""
+    heading = await conn.fetchrow(GET_HEADING, heading_id)
+    if not heading:
+        return None
+    return heading, await conn.fetch(LIST_DISHES_FOR_HEADING, heading_id)
+
+
+async def delete(conn, heading_id: int) -> bool:
+    """Delete a heading and its dishes."""
+    return await conn.execute(DELETE_HEADING, heading_id) != "DELETE 0"
@@ -0,0 +1,110 @@
+from app.repositories.fields import select_list
+
+COLUMNS = "id, name, heading, description, price, standard_price, outstandard_price, tags, images"
+
+# Selectable fields for ?fields= / ?view= (see app.repositories.fields).
+FIELDS = {
+    "id": "id",
+    "name": "name",
+    "heading": "heading",
+    "description": "description",
+    "price": "price",
+    "standard_price": "standard_price",
+    "outstandard_price": "outstandard_price",
+    "tags": "tags",
+    "images": "images",
+    "thumbnail": "images ->> 0",
+}
+
+VIEWS = {
+    "card": ("id", "name", "price", "thumbnail"),
+}
+
+LIST_ALL = f"SELECT {COLUMNS} FROM occasions"
+
+GET = f"SELECT {COLUMNS} FROM occasions WHERE id = $1"
+
+EXISTS = "SELECT EXISTS (SELECT 1 FROM occasions WHERE id = $1)"
+
+INSERT = """
+    INSERT INTO occasions (name, heading, description, price, standard_price, outstandard_price, tags, images)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+"""
+
+# Packages and subpackages go with their occasion (ON DELETE CASCADE).
+DELETE = "DELETE FROM occasions WHERE id = $1"
+
+# Packages and subpackages make up an occasion's menu display.
+INSERT_PACKAGE = """
+    INSERT INTO packages (occasion_id, name, price)
+    VALUES ($1, $2, $3)
+    RETURNING id
+"""
+
+INSERT_SUBPACKAGE = """
+    INSERT INTO subpackages (package_id, name, price)
+    VALUES ($1, $2, $3)
+"""
+
+LIST_PACKAGES = "SELECT id, name, price FROM packages WHERE occasion_id = $1"
+
+LIST_OCCASION_SUBPACKAGES = """
+    SELECT s.id, s.package_id, s.name, s.price
+    FROM subpackages s
+    JOIN packages p ON p.id = s.package_id
+    WHERE p.occasion_id = $1
+"""
+
+LIST_SUBPACKAGES = "SELECT id, name, price FROM subpackages WHERE package_id = $1"
+
+
+async def list_all(conn):
+    return await conn.fetch(LIST_ALL)
+
+
+def fields_query(names) -> str:
+    return f"SELECT {select_list(names, FIELDS)} FROM occasions"
+
+
+async def list_fields(conn, names):
+    return await conn.fetch(fields_query(names))
+
+
+async def get(conn, id: int):
+    return await conn.fetchrow(GET, id)
+
+
+async def exists(conn, id: int) -> bool:
+    return await conn.fetchval(EXISTS, id)
+
+
+async def create(conn, name, heading, description, price, standard_price, outstandard_price, tags_json, images_json):
+    await conn.execute(INSERT, name, heading, description, price, standard_price, outstandard_price, tags_json, images_json)
+
+
+async def delete(conn, id: int) -> bool:
+    """Delete an occasion together with its menu display."""
+    return await conn.execute(DELETE, id) != "DELETE 0"
+
+
+async def add_packages(conn, occasion_id: int, packages):
+    """Insert ``(name, price, [(name, price), ...])`` packages. Run inside a transaction."""
+    for name, price, subpackages in packages:
+        package_id = await conn.fetchval(INSERT_PACKAGE, occasion_id, name, price)
+        await conn.executemany(INSERT_SUBPACKAGE, [(package_id, sub_name, sub_price) for sub_name, sub_price in subpackages])
+
+
+async def list_packages(conn, occasion_id: int) -> list:
+    """Every ``(package, subpackages)`` pair of an occasion, in two statements."""
+    packages = await conn.fetch(LIST_PACKAGES, occasion_id)
+    if not packages:
+        return []
+    subpackages_by_package = {}
+    for subpackage in await conn.fetch(LIST_OCCASION_SUBPACKAGES, occasion_id):
+        subpackages_by_package.setdefault(subpackage["package_id"], []).append(subpackage)
+    return [(package, subpackages_by_package.get(package["id"], [])) for package in packages]
+
+
+async def list_subpackages(conn, package_id: int):
+    return await conn.fetch(LIST_SUBPACKAGES, package_id)
+
@@ -0,0 +1,81 @@
+KINDS = ("occasion", "event", "menu", "dish")
+
+# One statement for every combination of filters: a NULL parameter disables
+# its filter. Postgres plans it per parameter set (a generic plan would cost
+# far more), folding the unused filters away so each branch is served by the
+# GIN index on its search_vector column and occasions_tags_idx for tag
+# containment. The total is counted over every hit, not just the page, and
+# LEFT JOINed so a page past the end still returns one row carrying it.
+#
+#   $1 search text (websearch syntax) or NULL
+#   $2 result kinds to include
+#   $3 tags the occasion must all carry, as a JSON array, or NULL
+#   $4 / $5 minimum / maximum price or NULL
+#   $6 / $7 limit / offset
+SEARCH = """
+    WITH hits AS (
+        SELECT 'occasion' AS kind, o.id, o.name AS title, o.heading AS subtitle,
+               o.price, o.images ->> 0 AS image, NULL::int AS menu_id,
+               coalesce(ts_rank_cd(o.search_vector, websearch_to_tsquery('english', $1::text)), 0) AS rank
+        FROM occasions o
+        WHERE 'occasion' = ANY($2::text[])
+          AND ($1::text IS NULL OR o.search_vector @@ websearch_to_tsquery('english', $1::text))
+          AND ($3::jsonb IS NULL OR o.tags @> $3::jsonb)
+          AND ($4::float8 IS NULL OR o.price >= $4)
+          AND ($5::float8 IS NULL OR o.price <= $5)
+
+        UNION ALL
+
+        SELECT 'event', e.id, e.name, left(e.description, 160),
+               e.price, e.pic_path, NULL,
+               coalesce(ts_rank_cd(e.search_vector, websearch_to_tsquery('english', $1::text)), 0)
+        FROM events e
+        WHERE 'event' = ANY($2::text[])
+          AND $3::jsonb IS NULL
+          AND ($1::text IS NULL OR e.search_vector @@ websearch_to_tsquery('english', $1::text))
+          AND ($4::float8 IS NULL OR e.price >= $4)
+          AND ($5::float8 IS NULL OR e.price <= $5)
+
+        UNION ALL
+
+        SELECT 'menu', m.id, m.heading, NULL,
+               NULL, m.heading_image, m.id,
+               coalesce(ts_rank_cd(m.search_vector, websearch_to_tsquery('english', $1::text)), 0)
+        FROM menu_headings m
+        WHERE 'menu' = ANY($2::text[])
+          AND $3::jsonb IS NULL AND $4::float8 IS NULL AND $5::float8 IS NULL
+          AND ($1::text IS NULL OR m.search_vector @@ websearch_to_tsquery('english', $1::text))
+
+        UNION ALL
+
+        SELECT 'dish', d.id, d.name, NULL,
+               NULL, d.image, d.menu_id,
+               coalesce(ts_rank_cd(d.search_vector, websearch_to_tsquery('english', $1::text)), 0)
+        FROM dishes d
+        WHERE 'dish' = ANY($2::text[])
+          AND $3::jsonb IS NULL AND $4::float8 IS NULL AND $5::float8 IS NULL
+          AND ($1::text IS NULL OR d.search_vector @@ websearch_to_tsquery('english', $1::text))
+    ),
+    total AS (
+        SELECT count(*) AS total FROM hits
+    ),
+    page AS (
+        SELECT kind, id, title, subtitle, price, image, menu_id, rank
+        FROM hits
+        ORDER BY rank DESC, kind, id
+        LIMIT $6 OFFSET $7
+    )
+    SELECT page.*, total.total
+    FROM total LEFT JOIN page ON true
+    ORDER BY page.rank DESC, page.kind, page.id
+"""
+
+
+async def search(conn, text, kinds, tags_json, min_price, max_price, limit: int, offset: int):
+    """Ranked catalog matches plus the total number of matches.
+
+    Tag and price filters only apply to the kinds that have those columns;
+    menus and dishes are left out as soon as either is given.
+    """
+    rows = await conn.fetch(SEARCH, text, list(kinds), tags_json, min_price, max_price, limit, offset)
+    return [row for row in rows if row["id"] is not None], rows[0]["total"]
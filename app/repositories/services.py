@@ -0,0 +1,19 @@
+# Partial update: a NULL parameter keeps the current value, so one statement
+# covers every combination of fields.
+UPDATE = """
+    UPDATE services
+    SET name = COALESCE($2, name),
+        description = COALESCE($3, description),
+        image_path = COALESCE($4, image_path)
+    WHERE id = $1
+"""
+
+DELETE = "DELETE FROM services WHERE id = $1"
+
+
+async def update(conn, id: int, name=None, description=None, image_path=None) -> bool:
+    return await conn.execute(UPDATE, id, name, description, image_path) != "UPDATE 0"
+
+
+async def delete(conn, id: int) -> bool:
+    return await conn.execute(DELETE, id) != "DELETE 0"
@@ -0,0 +1,20 @@
+# Partial update: a NULL parameter keeps the current value, so one statement
+# covers every combination of fields.
+UPDATE = """
+    UPDATE team_members
+    SET name = COALESCE($2, name),
+        designation = COALESCE($3, designation),
+        description = COALESCE($4, description),
+        image_path = COALESCE($5, image_path)
+    WHERE id = $1
+"""
+
+DELETE = "DELETE FROM team_members WHERE id = $1"
+
+
+async def update(conn, id: int, name=None, designation=None, description=None, image_path=None) -> bool:
+    return await conn.execute(UPDATE, id, name, designation, description, image_path) != "UPDATE 0"
+
+
+async def delete(conn, id: int) -> bool:
+    return await conn.execute(DELETE, id) != "DELETE 0"
@@ -0,0 +1,17 @@
+GET_BY_EMAIL = "SELECT user_id, email, username, password FROM users WHERE email = $1"
+
+EMAIL_EXISTS = "SELECT EXISTS (SELECT 1 FROM users WHERE email = $1)"
+
+INSERT = "INSERT INTO users (user_id, email, username, password) VALUES ($1, $2, $3, $4)"
+
+
+async def get_by_email(conn, email: str):
+    return await conn.fetchrow(GET_BY_EMAIL, email)
+
+
+async def email_exists(conn, email: str) -> bool:
+    return await conn.fetchval(EMAIL_EXISTS, email)
+
+
+async def create(conn, user_id: str, email: str, username: str, hashed_password: str):
+    await conn.execute(INSERT, user_id, email, username, hashed_password)
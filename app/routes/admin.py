@@ -1,97 +1,206 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from typing import List
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Header, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Union
+from app.booking_feed import BookingFeed
 from app.db import Database
-from app.config import UPLOAD_DIR
-from pydantic import BaseModel, EmailStr, validator
+from app.config import UPLOAD_DIR, UPLOAD_PREFIX, IMAGE_GC_DELAY, BATCH_MAX_OPERATIONS
+from app.models.admin import (
+    AnalyticsCheck, AnalyticsRebuilt, BookingAnalytics, BookingFeedStatus, BookingPartitions, EventList, ImageGcReport,
+    JobsStats, Menu, MenuDisplay, MenuDisplayInput, MenuList, Occasion, OccasionList, PackageSubPackages,
+    PartialEventList, PartialOccasionList,
+)
+from app.models.batch import BATCH_FIELDS, BatchApplied, BatchOperation, BatchRequest
+from app.models.booking import BookingList, PartialBookingList
+from app.models.common import JobQueued, Message
+from app.repositories import (
+    batch as batch_repo,
+    booking_analytics as booking_analytics_repo,
+    booking_partitions as booking_partitions_repo,
+    bookings as bookings_repo,
+    contact_messages as contact_messages_repo,
+    events as events_repo,
+    jobs as jobs_repo,
+    menus as menus_repo,
+    occasions as occasions_repo,
+    services as services_repo,
+    team_members as team_members_repo,
+)
+from app.repositories.fields import resolve as resolve_fields
+from app.jobs.handlers import BOOKING_PARTITIONS, IMAGE_GC
+from app.jobs.image_gc import collect_garbage
+from app.jobs.queue import enqueue
+from app.jobs.worker import Worker
+from app.middleware.drain import DrainMiddleware
+from app.utils.responses import ModelResponse, menu_response, subpackage_response
+from pydantic import ValidationError
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from functools import lru_cache
 import json
+import uuid
 from pathlib import Path
 
 
 
 router = APIRouter(prefix="/admin")
-class SubPackage(BaseModel):
-    name: str
-    price: float
 
+def upload_location(filename: str) -> Path:
+    """A new, unique path in UPLOAD_DIR that keeps the client file's extension."""
+    suffix = Path(filename or "").suffix.lower()
+    if not suffix[1:].isalnum():
+        suffix = ""
+    return UPLOAD_DIR / f"{UPLOAD_PREFIX}{uuid.uuid4().hex}{suffix}"
 
-class Package(BaseModel):
-    name: str
-    price: float
-    subpackages: List[SubPackage]
-
-
-class MenuDisplayInput(BaseModel):
-    occasion_id: int
-    packages: List[Package]
 
 # Utility function to save uploaded files
 async def save_files(files: List[UploadFile]):
     file_paths = []
     for file in files:
-        file_location = UPLOAD_DIR / file.filename
-        with file_location.open("wb") as buffer:
-            buffer.write(await file.read())
-        file_paths.append(str(file_location))
+        file_paths.append(await save_file(file))
     return file_paths
 
 
-@router.on_event("startup")
-async def create_occasions_table():
-    conn = Database.pool
-    try:
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS occasions (
-                id SERIAL PRIMARY KEY,
-                name TEXT NOT NULL,
-                heading TEXT NOT NULL,
-                description TEXT NOT NULL,
-                price FLOAT NOT NULL,
-                tags JSONB NOT NULL,
-                images JSONB NOT NULL
-            )
-        """)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error creating occasions table: {str(e)}")
 async def save_file(file: UploadFile) -> str:
-    file_location = UPLOAD_DIR / file.filename
+    file_location = upload_location(file.filename)
     with file_location.open("wb") as buffer:
         buffer.write(await file.read())
     return str(file_location)
-@router.get("/get-all-occasions/")
-async def get_all_occasions():
+
+
+async def enqueue_image_gc(conn, delay: float):
+    # Deletes in quick succession share one delayed run.
+    return await enqueue(conn, IMAGE_GC, {}, delay=delay, unique=True)
+
+
+async def schedule_image_gc():
+    """Queue a cleanup of the files a delete or image replacement left unreferenced."""
+    try:
+        await Database.run(enqueue_image_gc, IMAGE_GC_DELAY, writes=True)
+    except Exception as e:
+        print(f"Error scheduling image cleanup: {e}")
+
+
+def requested_fields(fields: str, view: str, repo):
+    """Validate ``?fields=`` / ``?view=`` against a repository's whitelist."""
+    try:
+        return resolve_fields(fields, view, repo.FIELDS, repo.VIEWS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Unbounded analytics ranges are checked over these dates; before 1970 most
+# zones still ran on local mean time, which no booking falls in.
+ANALYTICS_FIRST_DAY = date(1970, 1, 1)
+ANALYTICS_LAST_DAY = date(2100, 1, 1)
+
+
+@lru_cache(maxsize=256)
+def fractional_offset(tz: str, start: date, end: date):
+    """First UTC offset of ``tz`` between ``start`` and ``end`` that is not a whole hour, or None.
+
+    Offsets are sampled once a week (no zone has kept an offset for less),
+    from a day either side of the range so that its first and last local
+    days are covered in any zone.
+    """
+    zone = ZoneInfo(tz)
+    instant = datetime.combine(start or ANALYTICS_FIRST_DAY, time(), timezone.utc) - timedelta(days=1)
+    last = datetime.combine(end or ANALYTICS_LAST_DAY, time(), timezone.utc) + timedelta(days=2)
+    while True:
+        local = instant.astimezone(zone)
+        if local.utcoffset() % timedelta(hours=1):
+            return local.strftime("%z")
+        if instant >= last:
+            return None
+        instant = min(instant + timedelta(weeks=1), last)
+
+
+FIELDS_QUERY = Query(None, description="Comma-separated fields to return; 'id' is always included.")
+VIEW_QUERY = Query(None, description="Predefined field set, e.g. 'card'.")
+
+
+def batch_operation(operation: BatchOperation) -> dict:
+    """Validate one batch operation's id and fields; raises ValueError."""
+    model = BATCH_FIELDS[operation.resource]
+    unknown = sorted(set(operation.fields) - set(model.model_fields))
+    if unknown:
+        raise ValueError(f"Unknown fields for {operation.resource}: {', '.join(unknown)}.")
+    try:
+        # Only the fields sent: an explicit null clears the column in an update.
+        fields = model(**operation.fields).model_dump(exclude_unset=True)
+    except ValidationError as e:
+        raise ValueError("; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()))
+
+    required = batch_repo.REQUIRED[operation.resource]
+    cleared = [name for name in required if name in fields and fields[name] is None]
+    if operation.op == "create":
+        fields = {name: value for name, value in fields.items() if value is not None}
+        if operation.id is not None:
+            raise ValueError("A create must not specify an id.")
+        missing = [name for name in required if name not in fields]
+        if missing:
+            raise ValueError(f"Missing required fields: {', '.join(missing)}.")
+    elif operation.id is None:
+        raise ValueError(f"An id is required to {operation.op}.")
+    elif operation.op == "update" and not fields:
+        raise ValueError("No fields to update were provided.")
+    elif operation.op == "update" and cleared:
+        raise ValueError(f"Required fields cannot be null: {', '.join(cleared)}.")
+    elif operation.op == "delete" and fields:
+        raise ValueError("A delete takes no fields.")
+    return {"op": operation.op, "resource": operation.resource, "id": operation.id, "fields": fields}
+
+
+def batch_operations(batch: BatchRequest) -> list:
+    """Validate a whole batch, reporting every invalid operation at once."""
+    if not batch.operations:
+        raise HTTPException(status_code=400, detail="No operations were provided.")
+    if len(batch.operations) > BATCH_MAX_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"A batch takes at most {BATCH_MAX_OPERATIONS} operations.")
+    operations, errors = [], []
+    for index, operation in enumerate(batch.operations):
+        try:
+            operations.append(batch_operation(operation))
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+    if errors:
+        raise HTTPException(status_code=400, detail={"message": "Invalid operations; nothing was applied.", "errors": errors})
+    return operations
+
+
+@router.get("/get-all-occasions/", response_model=Union[OccasionList, PartialOccasionList])
+async def get_all_occasions(fields: str = FIELDS_QUERY, view: str = VIEW_QUERY):
     """
     Fetches all occasions from the database.
 
+    Args:
+        fields (str): Comma-separated subset of fields to return.
+        view (str): Predefined field set; "card" returns id, name, price and thumbnail.
+
     Returns:
         List of occasions with their details.
     """
-    conn = Database.pool
+    names = requested_fields(fields, view, occasions_repo)
     try:
-        occasions = await conn.fetch("SELECT * FROM occasions")
+        if names:
+            occasions = await Database.run(occasions_repo.list_fields, names)
+            if not occasions:
+                raise HTTPException(status_code=404, detail="No occasions found.")
+            return ModelResponse(
+                PartialOccasionList(occasions=[dict(occasion) for occasion in occasions]), exclude_unset=True
+            )
+
+        occasions = await Database.run(occasions_repo.list_all)
         if not occasions:
             raise HTTPException(status_code=404, detail="No occasions found.")
-        return {
-            "occasions": [
-                {
-                    "id": occasion["id"],
-                    "name": occasion["name"],
-                    "heading": occasion["heading"],
-                    "description": occasion["description"],
-                    "price": occasion["price"],
-                    "standard_price": occasion["standard_price"],  # New field
-                    "outstandard_price": occasion["outstandard_price"],
-                    "tags": occasion["tags"],
-                    "images": occasion["images"]
-                }
-                for occasion in occasions
-            ]
-        }
+        return ModelResponse(OccasionList(occasions=[dict(occasion) for occasion in occasions]))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching occasions: {str(e)}")
 
 
 # Get Occasion By ID
-@router.get("/get-occasion/{id}/")
+@router.get("/get-occasion/{id}/", response_model=Occasion)
 async def get_occasion_by_id(id: int):
     """
     Fetches a specific occasion by its ID.
@@ -102,28 +211,17 @@ async def get_occasion_by_id(id: int):
     Returns:
         Occasion details if found.
     """
-    conn = Database.pool
     try:
-        occasion = await conn.fetchrow("SELECT * FROM occasions WHERE id = $1", id)
+        occasion = await Database.run(occasions_repo.get, id)
         if not occasion:
             raise HTTPException(status_code=404, detail=f"Occasion with ID {id} not found.")
-        return {
-            "id": occasion["id"],
-            "name": occasion["name"],
-            "heading": occasion["heading"],
-            "description": occasion["description"],
-            "price": occasion["price"],
-            "standard_price": occasion["standard_price"],  # New field
-            "outstandard_price": occasion["outstandard_price"],
-            "tags": occasion["tags"],
-            "images": occasion["images"]
-        }
+        return ModelResponse(Occasion.model_validate(dict(occasion)))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching occasion: {str(e)}")
 
 
 # Delete Occasion By ID
-@router.delete("/delete-occasion/{id}/")
+@router.delete("/delete-occasion/{id}/", response_model=Message)
 async def delete_occasion_by_id(id: int):
     """
     Deletes an occasion by its ID.
@@ -134,17 +232,17 @@ async def delete_occasion_by_id(id: int):
     Returns:
         Success message if deleted.
     """
-    conn = Database.pool
     try:
-        result = await conn.execute("DELETE FROM occasions WHERE id = $1", id)
-        if result == "DELETE 0":  # If no rows were deleted
+        # Its packages and subpackages are removed by ON DELETE CASCADE
+        if not await Database.run(occasions_repo.delete, id, writes=True):  # If no rows were deleted
             raise HTTPException(status_code=404, detail=f"Occasion with ID {id} not found.")
+        await schedule_image_gc()
         return {"message": "Occasion deleted successfully."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting occasion: {str(e)}")
 
 # Add Occasion Route
-@router.post("/add-occasion/")
+@router.post("/add-occasion/", response_model=Message)
 async def add_occasion(
     name: str,
     heading: str,
@@ -171,17 +269,13 @@ async def add_occasion(
     Returns:
         dict: A success message.
     """
-    conn = Database.pool
     try:
         # Save the uploaded images
         image_paths = await save_files(images)
 
         # Insert the occasion into the database
-        await conn.execute(
-            """
-            INSERT INTO occasions (name, heading, description, price, standard_price, outstandard_price, tags, images)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-            """,
+        await Database.run(
+            occasions_repo.create,
             name,
             heading,
             description,
@@ -189,14 +283,15 @@ async def add_occasion(
             standard_price,  # Add the standard price
             outstandard_price,  # Add the outstandard price
             json.dumps(tags),  # Convert tags list to JSON
-            json.dumps(image_paths)  # Convert image paths list to JSON
+            json.dumps(image_paths),  # Convert image paths list to JSON
+            writes=True
         )
 
         return {"message": "Occasion added successfully!"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error adding occasion: {str(e)}")
 
-@router.post("/add-menu/")
+@router.post("/add-menu/", response_model=Message)
 async def add_menu(
     heading: str = Form(...),
     heading_image: UploadFile = File(...),
@@ -206,124 +301,63 @@ async def add_menu(
     """
     Add a new menu with a heading, heading image, and a list of dishes (each with a name and image).
     """
-    conn = Database.pool
-
     try:
-        # Save the heading image
+        # Save every image before opening the transaction so it stays short
         heading_image_path = await save_file(heading_image)
+        dish_image_paths = [await save_file(dish_image) for dish_image in dish_images]
 
-        # Insert heading into the database
-        heading_id = await conn.fetchval(
-            """
-            INSERT INTO menu_headings (heading, heading_image)
-            VALUES ($1, $2)
-            RETURNING id
-            """,
+        # Insert the heading and its dishes in one transaction
+        await Database.run(
+            menus_repo.create,
             heading,
-            heading_image_path
+            heading_image_path,
+            list(zip(dish_names, dish_image_paths)),
+            transaction=True
         )
 
-        for dish_name, dish_image in zip(dish_names, dish_images):
-            dish_image_path = await save_file(dish_image)
-            await conn.execute(
-                """
-                INSERT INTO dishes (menu_id, name, image)
-                VALUES ($1, $2, $3)
-                """,
-                heading_id,
-                dish_name,
-                dish_image_path
-            )
-
         return {"message": "Menu added successfully!"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error adding menu: {str(e)}")
 
 
-@router.get("/get-all-menu/")
+@router.get("/get-all-menu/", response_model=MenuList)
 async def get_all_menu():
     """
     Get all menus with their headings, images, and associated dishes.
     """
-    conn = Database.pool
-
     try:
-        # Fetch all headings
-        headings = await conn.fetch("SELECT * FROM menu_headings")
+        # Fetch all headings together with their dishes
+        menus = await Database.run(menus_repo.list_all)
 
-        if not headings:
+        if not menus:
             raise HTTPException(status_code=404, detail="No menus found.")
 
-        # Fetch associated dishes for each heading
-        all_menus = []
-        for heading in headings:
-            dishes = await conn.fetch(
-                """
-                SELECT * FROM dishes WHERE menu_id = $1
-                """,
-                heading["id"]
-            )
-            all_menus.append({
-                "id": heading["id"],
-                "heading": heading["heading"],
-                "heading_image": heading["heading_image"],
-                "dishes": [
-                    {
-                        "id": dish["id"],
-                        "name": dish["name"],
-                        "image": dish["image"]
-                    } for dish in dishes
-                ]
-            })
-
-        return {"menus": all_menus}
+        all_menus = [menu_response(heading, dishes) for heading, dishes in menus]
+
+        return ModelResponse(MenuList(menus=all_menus))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching menus: {str(e)}")
 
 
-@router.get("/get-menu-by-heading-id/{heading_id}/")
+@router.get("/get-menu-by-heading-id/{heading_id}/", response_model=Menu)
 async def get_menu_by_heading_id(heading_id: int):
     """
     Get a specific menu by its heading ID, including the heading image and associated dishes.
     """
-    conn = Database.pool
-
     try:
-        # Fetch the heading
-        heading = await conn.fetchrow(
-            """
-            SELECT * FROM menu_headings WHERE id = $1
-            """,
-            heading_id
-        )
+        # Fetch the heading and its associated dishes
+        menu = await Database.run(menus_repo.get, heading_id)
 
-        if not heading:
+        if not menu:
             raise HTTPException(status_code=404, detail="Menu heading not found.")
 
-        # Fetch associated dishes
-        dishes = await conn.fetch(
-            """
-            SELECT * FROM dishes WHERE menu_id = $1
-            """,
-            heading_id
-        )
-
-        return {
-            "id": heading["id"],
-            "heading": heading["heading"],
-            "heading_image": heading["heading_image"],
-            "dishes": [
-                {
-                    "id": dish["id"],
-                    "name": dish["name"],
-                    "image": dish["image"]
-                } for dish in dishes
-            ]
-        }
+        return ModelResponse(Menu.model_validate(menu_response(*menu)))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching menu: {str(e)}")
 
-@router.delete("/delete-menu/{heading_id}/")
+@router.delete("/delete-menu/{heading_id}/", response_model=Message)
 async def delete_menu(heading_id: int):
     """
     Delete a menu by its heading ID, including all associated dishes.
@@ -334,35 +368,11 @@ async def delete_menu(heading_id: int):
     Returns:
         dict: Success message if the menu is deleted successfully.
     """
-    conn = Database.pool
-
     try:
-        # Check if the heading exists
-        heading = await conn.fetchrow(
-            """
-            SELECT * FROM menu_headings WHERE id = $1
-            """,
-            heading_id
-        )
-
-        if not heading:
+        # Deleting the heading removes its dishes (ON DELETE CASCADE)
+        if not await Database.run(menus_repo.delete, heading_id, writes=True):
             raise HTTPException(status_code=404, detail="Menu heading not found.")
-
-        # Delete the associated dishes
-        await conn.execute(
-            """
-            DELETE FROM dishes WHERE menu_id = $1
-            """,
-            heading_id
-        )
-
-        # Delete the menu heading
-        await conn.execute(
-            """
-            DELETE FROM menu_headings WHERE id = $1
-            """,
-            heading_id
-        )
+        await schedule_image_gc()
 
         return {"message": f"Menu with heading ID {heading_id} deleted successfully."}
     except Exception as e:
@@ -370,50 +380,35 @@ async def delete_menu(heading_id: int):
 
 
 
-@router.post("/add-menu-display/")
+@router.post("/add-menu-display/", response_model=Message)
 async def add_menu_display(menu: MenuDisplayInput):
-    conn = Database.pool
-
     # Check if the occasion ID exists
-    occasion_exists = await conn.fetchval(
-        "SELECT COUNT(*) FROM occasions WHERE id = $1", menu.occasion_id
-    )
+    occasion_exists = await Database.run(occasions_repo.exists, menu.occasion_id)
 
     if not occasion_exists:
         raise HTTPException(status_code=400, detail="Invalid occasion ID.")
 
     try:
-        # Insert packages into the database
-        for package in menu.packages:
-            package_id = await conn.fetchval(
-                """
-                INSERT INTO packages (occasion_id, name, price)
-                VALUES ($1, $2, $3)
-                RETURNING id
-                """,
-                menu.occasion_id,
-                package.name,
-                package.price
-            )
-
-            # Insert subpackages for each package
-            for subpackage in package.subpackages:
-                await conn.execute(
-                    """
-                    INSERT INTO subpackages (package_id, name, price)
-                    VALUES ($1, $2, $3)
-                    """,
-                    package_id,
-                    subpackage.name,
-                    subpackage.price
-                )
+        # Insert packages and their subpackages in one transaction
+        await Database.run(
+            occasions_repo.add_packages,
+            menu.occasion_id,
+            [
+                (
+                    package.name,
+                    package.price,
+                    [(subpackage.name, subpackage.price) for subpackage in package.subpackages]
+                ) for package in menu.packages
+            ],
+            transaction=True
+        )
 
         return {"message": "Menu display added successfully!"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error adding menu display: {str(e)}")
 
 
-@router.get("/get-menu-display/{occasion_id}/")
+@router.get("/get-menu-display/{occasion_id}/", response_model=MenuDisplay)
 async def get_menu_display(occasion_id: int):
     """
     Retrieves the menu display for a specific occasion.
@@ -424,49 +419,28 @@ async def get_menu_display(occasion_id: int):
     Returns:
         dict: The menu display including packages and subpackages.
     """
-    conn = app.state.db_pool
-
     try:
-        # Fetch packages for the occasion
-        packages = await conn.fetch(
-            """
-            SELECT * FROM packages WHERE occasion_id = $1
-            """,
-            occasion_id
-        )
+        # Fetch packages for the occasion together with their subpackages
+        packages = await Database.run(occasions_repo.list_packages, occasion_id)
 
         if not packages:
             raise HTTPException(status_code=404, detail="No packages found for this occasion.")
 
-        # Fetch subpackages for each package
-        menu_display = []
-        for package in packages:
-            subpackages = await conn.fetch(
-                """
-                SELECT * FROM subpackages WHERE package_id = $1
-                """,
-                package["id"]
-            )
-
-            menu_display.append({
+        menu_display = [
+            {
                 "package_id": package["id"],
                 "name": package["name"],
                 "price": package["price"],
-                "subpackages": [
-                    {
-                        "subpackage_id": subpackage["id"],
-                        "name": subpackage["name"],
-                        "price": subpackage["price"]
-                    } for subpackage in subpackages
-                ]
-            })
+                "subpackages": [subpackage_response(subpackage) for subpackage in subpackages]
+            } for package, subpackages in packages
+        ]
 
-        return {"occasion_id": occasion_id, "menu_display": menu_display}
+        return ModelResponse(MenuDisplay(occasion_id=occasion_id, menu_display=menu_display))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching menu display: {str(e)}")
 
 
-@router.get("/get-subpackages/{package_id}/")
+@router.get("/get-subpackages/{package_id}/", response_model=PackageSubPackages)
 async def get_subpackages(package_id: int):
     """
     Retrieves subpackages for a specific package.
@@ -477,34 +451,21 @@ async def get_subpackages(package_id: int):
     Returns:
         dict: The subpackages for the package.
     """
-    conn = app.state.db_pool
-
     try:
-        subpackages = await conn.fetch(
-            """
-            SELECT * FROM subpackages WHERE package_id = $1
-            """,
-            package_id
-        )
+        subpackages = await Database.run(occasions_repo.list_subpackages, package_id)
 
         if not subpackages:
             raise HTTPException(status_code=404, detail="No subpackages found for this package.")
 
-        return {
-            "package_id": package_id,
-            "subpackages": [
-                {
-                    "subpackage_id": subpackage["id"],
-                    "name": subpackage["name"],
-                    "price": subpackage["price"]
-                } for subpackage in subpackages
-            ]
-        }
+        return ModelResponse(PackageSubPackages(
+            package_id=package_id,
+            subpackages=[subpackage_response(subpackage) for subpackage in subpackages]
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching subpackages: {str(e)}")
 
 
-@router.delete("/delete-menu-display/{occasion_id}/")
+@router.delete("/delete-menu-display/{occasion_id}/", response_model=Message)
 async def delete_menu_display(occasion_id: int):
     """
     Deletes a menu display for a specific occasion, including all associated packages and subpackages.
@@ -515,138 +476,313 @@ async def delete_menu_display(occasion_id: int):
     Returns:
         dict: A success message if the deletion is successful.
     """
-    # Acquire a connection from the pool
-    async with app.state.db_pool.acquire() as conn:
-        try:
-            # Check if the occasion exists
-            occasion_exists = await conn.fetchval(
-                "SELECT COUNT(*) FROM occasions WHERE id = $1", occasion_id
-            )
+    try:
+        # Check if the occasion exists
+        occasion_exists = await Database.run(occasions_repo.exists, occasion_id)
+
+        if not occasion_exists:
+            raise HTTPException(status_code=404, detail="Occasion not found.")
 
-            if not occasion_exists:
-                raise HTTPException(status_code=404, detail="Occasion not found.")
-
-            # Start a transaction
-            async with conn.transaction():
-                # Delete subpackages associated with the packages of the occasion
-                await conn.execute(
-                    """
-                    DELETE FROM subpackages
-                    WHERE package_id IN (
-                        SELECT id FROM packages WHERE occasion_id = $1
-                    )
-                    """,
-                    occasion_id
-                )
-
-                # Delete packages associated with the occasion
-                await conn.execute(
-                    """
-                    DELETE FROM packages WHERE occasion_id = $1
-                    """,
-                    occasion_id
-                )
-
-                # Delete the occasion itself
-                await conn.execute(
-                    """
-                    DELETE FROM occasions WHERE id = $1
-                    """,
-                    occasion_id
-                )
-
-            return {"message": f"Menu display for occasion ID {occasion_id} deleted successfully."}
-
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error deleting menu display: {str(e)}")
+        # Deleting the occasion removes its packages and subpackages (ON DELETE CASCADE)
+        await Database.run(occasions_repo.delete, occasion_id, writes=True)
+        await schedule_image_gc()
+
+        return {"message": f"Menu display for occasion ID {occasion_id} deleted successfully."}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error deleting menu display: {str(e)}")
 # Add Event
-@router.post("/add-event/")
+@router.post("/add-event/", response_model=Message)
 async def add_event(name: str, description: str, price: float, image: UploadFile = File(...)):
-    conn = Database.pool
     try:
         image_path = await save_file(image)
-        await conn.execute(
-            """
-            INSERT INTO events (pic_path, name, description, price)
-            VALUES ($1, $2, $3, $4)
-            """,
-            image_path, name, description, price
-        )
+        await Database.run(events_repo.create, image_path, name, description, price, writes=True)
         return {"message": "Event added successfully!"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 # Get All Events
-@router.get("/get-all-events/")
-async def get_all_events():
-    conn = Database.pool
+@router.get("/get-all-events/", response_model=Union[EventList, PartialEventList])
+async def get_all_events(fields: str = FIELDS_QUERY, view: str = VIEW_QUERY):
+    names = requested_fields(fields, view, events_repo)
     try:
-        events = await conn.fetch("SELECT * FROM events")
+        if names:
+            events = await Database.run(events_repo.list_fields, names)
+            if not events:
+                raise HTTPException(status_code=404, detail="No events found.")
+            return ModelResponse(PartialEventList(events=[dict(event) for event in events]), exclude_unset=True)
+
+        events = await Database.run(events_repo.list_all)
         if not events:
             raise HTTPException(status_code=404, detail="No events found.")
-        return {
-            "events": [
-                {
-                    "id": event["id"],
-                    "name": event["name"],
-                    "description": event["description"],
-                    "price": event["price"],
-                    "pic_path": event["pic_path"]
-                }
-                for event in events
-            ]
-        }
+        return ModelResponse(EventList(events=[dict(event) for event in events]))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 
 # Admin Get All Table Bookings
-@router.get("/get-all-bookings/")
-async def get_all_bookings():
-    conn = Database.pool
+@router.get("/get-all-bookings/", response_model=Union[BookingList, PartialBookingList])
+async def get_all_bookings(fields: str = FIELDS_QUERY, view: str = VIEW_QUERY, start: date = None, end: date = None):
+    """
+    All bookings, optionally only those between two UTC dates (inclusive).
+
+    A date range reads only the monthly partitions it overlaps.
+    """
+    names = requested_fields(fields, view, bookings_repo)
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end.")
+    start_at = datetime.combine(start, time.min, timezone.utc) if start else None
+    end_at = datetime.combine(end + timedelta(days=1), time.min, timezone.utc) if end else None
     try:
-        bookings = await conn.fetch("SELECT * FROM bookings")
+        if names:
+            bookings = await Database.run(bookings_repo.list_fields, names, start_at, end_at)
+        else:
+            bookings = await Database.run(bookings_repo.list_all, start_at, end_at)
         if not bookings:
             raise HTTPException(status_code=404, detail="No table bookings found.")
-        return {
-            "bookings": [dict(booking) for booking in bookings]
-        }
+        if names:
+            return ModelResponse(PartialBookingList(bookings=[dict(booking) for booking in bookings]), exclude_unset=True)
+        return ModelResponse(BookingList(bookings=[dict(booking) for booking in bookings]))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
+# Live feed of booking changes, instead of polling get-all-bookings
+@router.get("/booking-feed/")
+async def booking_feed(last_event_id: str = Header(None)):
+    """
+    Server-Sent Events stream of booking changes.
+
+    Each ``booking`` event carries ``{"id", "type", "booking"}`` with type
+    "insert", "update" or "delete". Open the stream first, then load the
+    bookings, so nothing falls in between. Browsers reconnect on their own and
+    send Last-Event-ID to resume; a ``reset`` event means changes were missed
+    and the bookings should be reloaded.
+
+    Args:
+        last_event_id (str): The id of the last event received, to resume after it.
+
+    Returns:
+        StreamingResponse: A text/event-stream response that stays open.
+    """
+    feed = BookingFeed.current
+    if feed is None or DrainMiddleware.draining:
+        raise HTTPException(status_code=503, detail="The booking feed is not running.")
+    return StreamingResponse(
+        feed.stream(last_event_id),
+        media_type="text/event-stream",
+        # Proxies must neither cache nor buffer the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Subscribers and throughput of this process's booking feed
+@router.get("/booking-feed/stats/", response_model=BookingFeedStatus)
+async def booking_feed_stats():
+    return ModelResponse(BookingFeedStatus(feed=BookingFeed.current.stats() if BookingFeed.current else None))
+
+# Bookings and covers over time, served from the rollup tables
+@router.get("/booking-analytics/", response_model=BookingAnalytics)
+async def get_booking_analytics(granularity: str = "day", start: date = None, end: date = None, tz: str = "UTC"):
+    """
+    Booking counts and total covers (no_of_people) per period.
+
+    Args:
+        granularity (str): "hour", "day", "week" (starting Monday) or "hour_of_day" (0-23 across the range).
+        start (date): First day to include, in the given time zone.
+        end (date): Last day to include, in the given time zone.
+        tz (str): IANA time zone the periods are computed in; its offset must be a whole
+            number of hours throughout the range.
+
+    Returns:
+        BookingAnalytics: One bucket per period that has bookings, plus the totals.
+    """
+    if granularity not in booking_analytics_repo.GRANULARITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"granularity must be one of: {', '.join(booking_analytics_repo.GRANULARITIES)}.",
+        )
+    try:
+        ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown time zone '{tz}'.")
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end.")
+    # The rollups are hourly, so they only regroup into whole-hour local periods.
+    offset = fractional_offset(tz, start, end)
+    if offset is not None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Time zone '{tz}' is at UTC{offset} within the range; only whole-hour offsets are supported.",
+        )
+
+    try:
+        rows = await Database.run(booking_analytics_repo.series, granularity, tz, start, end)
+        if granularity in ("day", "week"):
+            label = lambda bucket: bucket.isoformat()[:10]
+        elif granularity == "hour":
+            label = lambda bucket: bucket.isoformat()
+        else:
+            label = lambda bucket: bucket
+        return ModelResponse(BookingAnalytics(
+            granularity=granularity,
+            timezone=tz,
+            start=start,
+            end=end,
+            total_bookings=sum(row["bookings"] for row in rows),
+            total_covers=sum(row["covers"] for row in rows),
+            buckets=[
+                {"bucket": label(row["bucket"]), "bookings": row["bookings"], "covers": row["covers"]}
+                for row in rows
+            ]
+        ))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching booking analytics: {str(e)}")
+
+
+# Compare the rollup table against a full aggregation of bookings
+@router.get("/booking-analytics/check/", response_model=AnalyticsCheck)
+async def check_booking_analytics():
+    try:
+        mismatches = await Database.run(booking_analytics_repo.check)
+        return ModelResponse(AnalyticsCheck(
+            consistent=not mismatches,
+            mismatched_slots=len(mismatches),
+            mismatches=[dict(row) for row in mismatches[:100]]
+        ))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error checking booking analytics: {str(e)}")
+
+
+# Recompute the rollup table from bookings
+@router.post("/booking-analytics/rebuild/", response_model=AnalyticsRebuilt)
+async def rebuild_booking_analytics():
+    try:
+        mismatches = await Database.run(booking_analytics_repo.rebuild, transaction=True)
+        return {"message": "Booking analytics rebuilt.", "repaired_slots": len(mismatches)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error rebuilding booking analytics: {str(e)}")
+
+# Monthly bookings partitions and the archives of expired ones
+@router.get("/booking-partitions/", response_model=BookingPartitions)
+async def get_booking_partitions():
+    try:
+        partitions = await Database.run(booking_partitions_repo.list_partitions)
+        archives = await Database.run(booking_partitions_repo.list_archives)
+        return ModelResponse(BookingPartitions(
+            partitions=[dict(partition) for partition in partitions],
+            archives=[dict(archive) for archive in archives],
+        ))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+
+# Create upcoming partitions and archive expired ones now rather than at the daily run
+@router.post("/booking-partitions/", status_code=202, response_model=JobQueued)
+async def maintain_booking_partitions():
+    try:
+        job_id = await Database.run(enqueue, BOOKING_PARTITIONS, {}, writes=True)
+        Worker.wake()
+        return {"message": "Bookings partition maintenance queued.", "job_id": job_id}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+# Report uploaded images that no row references any more
+@router.get("/image-gc/", response_model=ImageGcReport)
+async def image_gc_report():
+    """
+    Dry run of the image garbage collector.
+
+    Returns:
+        ImageGcReport: How many files would be deleted and the first of their paths.
+    """
+    try:
+        return ModelResponse(ImageGcReport(**await collect_garbage(dry_run=True)))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error scanning images: {str(e)}")
+
+
+# Delete unreferenced images in the background
+@router.post("/image-gc/", status_code=202, response_model=JobQueued)
+async def run_image_gc():
+    try:
+        job_id = await Database.run(enqueue, IMAGE_GC, {}, writes=True)
+        Worker.wake()
+        return {"message": "Image cleanup queued.", "job_id": job_id}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+# Background job queue depth and this process's worker metrics
+@router.get("/jobs-stats/", response_model=JobsStats)
+async def get_jobs_stats():
+    try:
+        queue = await Database.run(jobs_repo.stats)
+        return ModelResponse(JobsStats(queue=queue, worker=Worker.current.stats() if Worker.current else None))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+# Create, update and delete events, services, team members and bookings in one transaction
+@router.post("/batch/", response_model=BatchApplied)
+async def apply_batch(batch: BatchRequest):
+    """
+    Apply a list of operations atomically with a few set-based statements.
+
+    Args:
+        batch (BatchRequest): Operations, each with ``op`` ("create", "update"
+            or "delete"), ``resource`` ("events", "services", "team_members" or
+            "bookings"), ``id`` (update and delete) and ``fields`` (create and update).
+
+    Returns:
+        BatchApplied: Per-operation results in request order, with the new id of each
+        created row and a status of "created", "updated", "deleted" or "not_found".
+    """
+    operations = batch_operations(batch)
+    try:
+        results = await Database.run(batch_repo.apply, operations, transaction=True)
+        # Deleted rows and replaced images may leave uploads unreferenced
+        if any(
+            result["resource"] in batch_repo.IMAGE_COLUMNS
+            and (result["status"] == "deleted"
+                 or (result["status"] == "updated"
+                     and batch_repo.IMAGE_COLUMNS[result["resource"]] in operation["fields"]))
+            for result, operation in zip(results, operations)
+        ):
+            await schedule_image_gc()
+        return {"message": "Batch applied successfully.", "results": results}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error applying batch: {str(e)}")
+
 # Delete a Team Member
-@router.delete("/delete-team-member/{id}/")
+@router.delete("/delete-team-member/{id}/", response_model=Message)
 async def delete_team_member(id: int):
-    conn = Database.pool
     try:
-        result = await conn.execute("DELETE FROM team_members WHERE id = $1", id)
-        if result == "DELETE 0":  # If no rows were deleted
+        if not await Database.run(team_members_repo.delete, id, writes=True):  # If no rows were deleted
             raise HTTPException(status_code=404, detail=f"Team member with ID {id} not found.")
+        await schedule_image_gc()
         return {"message": "Team member deleted successfully."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 
 # Delete a Service
-@router.delete("/delete-service/{id}/")
+@router.delete("/delete-service/{id}/", response_model=Message)
 async def delete_service(id: int):
-    conn = Database.pool
     try:
-        result = await conn.execute("DELETE FROM services WHERE id = $1", id)
-        if result == "DELETE 0":  # If no rows were deleted
+        if not await Database.run(services_repo.delete, id, writes=True):  # If no rows were deleted
             raise HTTPException(status_code=404, detail=f"Service with ID {id} not found.")
+        await schedule_image_gc()
         return {"message": "Service deleted successfully."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 # Delete a Contact Us Message by ID
-@router.delete("/delete-contact/{id}/")
+@router.delete("/delete-contact/{id}/", response_model=Message)
 async def delete_contact(id: int):
-    conn = Database.pool
     try:
-        # Execute DELETE query on the contact_us table
-        result = await conn.execute("DELETE FROM contact_us WHERE id = $1", id)
-        if result == "DELETE 0":  # If no rows are deleted
+        if not await Database.run(contact_messages_repo.delete, id, writes=True):  # If no rows are deleted
             raise HTTPException(status_code=404, detail=f"Contact message with ID {id} not found.")
         return {"message": "Contact message deleted successfully."}
     except Exception as e:
@@ -654,61 +790,44 @@ async def delete_contact(id: int):
 
 
 # Delete an Event
-@router.delete("/delete-event/{id}/")
+@router.delete("/delete-event/{id}/", response_model=Message)
 async def delete_event(id: int):
-    conn = Database.pool
     try:
-        result = await conn.execute("DELETE FROM events WHERE id = $1", id)
-        if result == "DELETE 0":  # If no rows were deleted
+        if not await Database.run(events_repo.delete, id, writes=True):  # If no rows were deleted
             raise HTTPException(status_code=404, detail=f"Event with ID {id} not found.")
+        await schedule_image_gc()
         return {"message": "Event deleted successfully."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
     
 # Delete a Booking by ID
-@router.delete("/delete-booking/{id}/")
-async def delete_booking(id: int):
-    conn = Database.pool
+@router.delete("/delete-booking/{id}/", response_model=Message)
+async def delete_booking(
+    id: int,
+    at: datetime = Query(None, alias="datetime", description="The booking's datetime; only its month is searched."),
+):
     try:
-        result = await conn.execute("DELETE FROM bookings WHERE id = $1", id)
-        if result == "DELETE 0":  # If no rows were deleted
+        if not await Database.run(bookings_repo.delete, id, at, writes=True):  # If no rows were deleted
             raise HTTPException(status_code=404, detail=f"Booking with ID {id} not found.")
         return {"message": "Booking deleted successfully."}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
-@router.put("/update-event/{id}/")
+@router.put("/update-event/{id}/", response_model=Message)
 async def update_event(id: int, name: str = None, description: str = None, price: float = None, image: UploadFile = None):
-    conn = Database.pool
-    try:
-        update_columns = []
-        values = []
-
-        if name:
-            update_columns.append("name = $1")
-            values.append(name)
-        if description:
-            update_columns.append("description = $" + str(len(values) + 1))
-            values.append(description)
-        if price is not None:
-            update_columns.append("price = $" + str(len(values) + 1))
-            values.append(price)
-        if image:
-            image_path = await save_file(image)
-            update_columns.append("pic_path = $" + str(len(values) + 1))
-            values.append(image_path)
-        
-        if not update_columns:
+    try:
+        # Empty values mean "leave unchanged"; the repository keeps NULLs as is
+        name = name or None
+        description = description or None
+        if not (name or description or price is not None or image):
             raise HTTPException(status_code=400, detail="No fields to update were provided.")
 
-        values.append(id)
-        update_query = f"""
-            UPDATE events 
-            SET {', '.join(update_columns)} 
-            WHERE id = ${len(values)}
-        """
-        result = await conn.execute(update_query, *values)
-        if result == "UPDATE 0":
+        image_path = await save_file(image) if image else None
+        if not await Database.run(events_repo.update, id, name, description, price, image_path, writes=True):
             raise HTTPException(status_code=404, detail=f"Event with ID {id} not found.")
+        if image_path:
+            await schedule_image_gc()  # The replaced image may no longer be used
         return {"message": "Event updated successfully."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
@@ -716,75 +835,41 @@ async def update_event(id: int, name: str = None, description: str = None, price
 
 
 # Update Service
-@router.put("/update-service/{id}/")
+@router.put("/update-service/{id}/", response_model=Message)
 async def update_service(id: int, name: str = None, description: str = None, image: UploadFile = None):
-    conn = Database.pool
-    try:
-        update_columns = []
-        values = []
-
-        if name:
-            update_columns.append("name = $1")
-            values.append(name)
-        if description:
-            update_columns.append("description = $" + str(len(values) + 1))
-            values.append(description)
-        if image:
-            image_path = await save_file(image)
-            update_columns.append("image_path = $" + str(len(values) + 1))
-            values.append(image_path)
-        
-        if not update_columns:
+    try:
+        # Empty values mean "leave unchanged"; the repository keeps NULLs as is
+        name = name or None
+        description = description or None
+        if not (name or description or image):
             raise HTTPException(status_code=400, detail="No fields to update were provided.")
 
-        values.append(id)
-        update_query = f"""
-            UPDATE services 
-            SET {', '.join(update_columns)} 
-            WHERE id = ${len(values)}
-        """
-        result = await conn.execute(update_query, *values)
-        if result == "UPDATE 0":
+        image_path = await save_file(image) if image else None
+        if not await Database.run(services_repo.update, id, name, description, image_path, writes=True):
             raise HTTPException(status_code=404, detail=f"Service with ID {id} not found.")
+        if image_path:
+            await schedule_image_gc()  # The replaced image may no longer be used
         return {"message": "Service updated successfully."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 
 # Update Team Member
-@router.put("/update-team-member/{id}/")
+@router.put("/update-team-member/{id}/", response_model=Message)
 async def update_team_member(id: int, name: str = None, designation: str = None, description: str = None, image: UploadFile = None):
-    conn = Database.pool
-    try:
-        update_columns = []
-        values = []
-
-        if name:
-            update_columns.append("name = $1")
-            values.append(name)
-        if designation:
-            update_columns.append("designation = $" + str(len(values) + 1))
-            values.append(designation)
-        if description:
-            update_columns.append("description = $" + str(len(values) + 1))
-            values.append(description)
-        if image:
-            image_path = await save_file(image)
-            update_columns.append("image_path = $" + str(len(values) + 1))
-            values.append(image_path)
-        
-        if not update_columns:
+    try:
+        # Empty values mean "leave unchanged"; the repository keeps NULLs as is
+        name = name or None
+        designation = designation or None
+        description = description or None
+        if not (name or designation or description or image):
             raise HTTPException(status_code=400, detail="No fields to update were provided.")
 
-        values.append(id)
-        update_query = f"""
-            UPDATE team_members 
-            SET {', '.join(update_columns)} 
-            WHERE id = ${len(values)}
-        """
-        result = await conn.execute(update_query, *values)
-        if result == "UPDATE 0":
+        image_path = await save_file(image) if image else None
+        if not await Database.run(team_members_repo.update, id, name, designation, description, image_path, writes=True):
             raise HTTPException(status_code=404, detail=f"Team member with ID {id} not found.")
+        if image_path:
+            await schedule_image_gc()  # The replaced image may no longer be used
         return {"message": "Team member updated successfully."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
\ No newline at end of file
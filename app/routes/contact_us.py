@@ -1,17 +1,12 @@
 from fastapi import APIRouter
+from app.models.common import Message
 from app.models.contact_us import ContactUsInput
 from app.db import Database
+from app.repositories import contact_messages
 
 router = APIRouter()
 
-@router.post("/")
+@router.post("/", response_model=Message)
 async def contact_us(contact: ContactUsInput):
-    conn = Database.pool
-    await conn.execute(
-        """
-        INSERT INTO contact_us (name, email, subject, message)
-        VALUES ($1, $2, $3, $4)
-        """,
-        contact.name, contact.email, contact.subject, contact.message
-    )
+    await Database.run(contact_messages.create, contact.name, contact.email, contact.subject, contact.message, writes=True)
     return {"message": "Thank you for reaching out to us. We will get back to you soon!"}
\ No newline at end of file
@@ -0,0 +1,49 @@
+from fastapi import APIRouter
+from app.config import READINESS_TIMEOUT
+from app.db import Database
+from app.middleware.drain import DrainMiddleware
+from app.migrations import pending_migrations
+from app.models.health import Liveness, Readiness
+from app.utils.responses import ModelResponse
+import asyncio
+
+router = APIRouter()
+
+
+# Liveness: the process is up and its event loop is responding
+@router.get("/healthz", response_model=Liveness)
+async def healthz():
+    return {"status": "ok"}
+
+
+# Readiness: safe to route traffic here
+@router.get("/readyz", response_model=Readiness, responses={503: {"model": Readiness}})
+async def readyz():
+    """
+    Report whether this instance should receive traffic.
+
+    Ready means the database pool is open and warmed up, every migration is
+    applied and the instance is not shutting down. Replica health is reported
+    but does not affect readiness.
+
+    Returns:
+        Readiness: 200 when ready, 503 otherwise, with the result of each check.
+    """
+    checks = {
+        "draining": DrainMiddleware.draining,
+        "pool_warmed": Database.pool is not None and Database.warmed,
+        "pending_migrations": None,
+    }
+    if checks["pool_warmed"]:
+        try:
+            checks["pending_migrations"] = await asyncio.wait_for(
+                Database.run(pending_migrations, readonly=False), READINESS_TIMEOUT
+            )
+        except Exception as e:
+            checks["database_error"] = str(e) or type(e).__name__
+    # Informational: reads fall back to the primary without replicas.
+    checks["replicas"] = Database.replica_stats()
+    ready = checks["pool_warmed"] and not checks["draining"] and checks["pending_migrations"] == []
+    # exclude_unset: database_error only appears when the check failed.
+    return ModelResponse(Readiness(status="ready" if ready else "not_ready", checks=checks),
+                         exclude_unset=True, status_code=200 if ready else 503)
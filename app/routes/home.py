@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Request, Response
+from app.config import HOME_SECTION_TIMEOUT
+from app.db import Database
+from app.models.home import HomePage
+from app.repositories import events as events_repo, menus as menus_repo, occasions as occasions_repo
+from app.utils.responses import ModelResponse, menu_response
+import asyncio
+import hashlib
+
+router = APIRouter()
+
+
+async def occasions_section():
+    rows = await Database.run(occasions_repo.list_fields, occasions_repo.VIEWS["card"])
+    return [dict(row) for row in rows]
+
+
+async def events_section():
+    rows = await Database.run(events_repo.list_fields, events_repo.VIEWS["card"])
+    return [dict(row) for row in rows]
+
+
+async def menus_section():
+    return [menu_response(heading, dishes) for heading, dishes in await Database.run(menus_repo.list_all)]
+
+
+# Every section runs on its own pool connection, concurrently with the others.
+SECTIONS = {
+    "occasions": occasions_section,
+    "events": events_section,
+    "menus": menus_section,
+}
+
+
+async def load_section(loader, timeout: float):
+    """Run one section loader. Returns ``(data, error)``; exactly one is None."""
+    try:
+        return await asyncio.wait_for(loader(), timeout), None
+    except asyncio.TimeoutError:
+        return None, f"Timed out after {timeout:g}s."
+    except Exception as e:
+        return None, str(e)
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+@router.get("/", response_model=HomePage)
+async def get_home(request: Request):
+    """
+    Everything the landing page needs in one request: occasion and event cards and the full menu.
+
+    Sections are fetched concurrently, each with its own timeout. A section that
+    fails or times out is returned as null and listed under "errors"; the rest of
+    the page is still served.
+
+    Returns:
+        Response: The combined sections. Complete responses carry an ETag and
+        answer a matching If-None-Match with 304 Not Modified.
+    """
+    results = await asyncio.gather(*(load_section(loader, HOME_SECTION_TIMEOUT) for loader in SECTIONS.values()))
+
+    payload = {name: data for name, (data, _) in zip(SECTIONS, results)}
+    errors = {name: error for name, (_, error) in zip(SECTIONS, results) if error}
+    if errors:
+        payload["errors"] = errors
+    # Card sections carry only their view's fields.
+    page = HomePage.model_validate(payload)
+    if errors:
+        # A degraded page must not be revalidated as if it were complete.
+        status_code = 503 if len(errors) == len(SECTIONS) else 200
+        return ModelResponse(page, exclude_unset=True, status_code=status_code, headers={"Cache-Control": "no-store"})
+
+    # One tag over all sections: the page changes whenever any of them does.
+    response = ModelResponse(page, exclude_unset=True, headers={"Cache-Control": "no-cache"})
+    etag = f'"{hashlib.sha1(response.body).hexdigest()}"'
+    if etag_matches(etag, request.headers.get("if-none-match", "")):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    response.headers["ETag"] = etag
+    return response
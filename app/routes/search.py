@@ -0,0 +1,68 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List
+from app.db import Database
+from app.models.search import SearchResults
+from app.repositories import search as search_repo
+from app.utils.responses import ModelResponse
+import json
+
+router = APIRouter()
+
+MAX_PAGE_SIZE = 100
+
+
+@router.get("/", response_model=SearchResults)
+async def search_catalog(
+    q: str = None,
+    types: List[str] = Query(None),
+    tags: List[str] = Query(None),
+    min_price: float = None,
+    max_price: float = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Full-text search across occasions, events, menu headings and dishes.
+
+    Args:
+        q (str): Search text; supports quoted phrases, "or" and "-" exclusion.
+        types (List[str]): Restrict results to these kinds (occasion, event, menu, dish).
+        tags (List[str]): Only occasions carrying all of these tags.
+        min_price (float): Only occasions and events priced at least this.
+        max_price (float): Only occasions and events priced at most this.
+        limit (int): Page size.
+        offset (int): Number of results to skip.
+
+    Returns:
+        SearchResults: One page of results ranked by relevance, and the total match count.
+    """
+    kinds = types or list(search_repo.KINDS)
+    unknown = [kind for kind in kinds if kind not in search_repo.KINDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown result type(s): {', '.join(unknown)}.")
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(status_code=400, detail="min_price must not exceed max_price.")
+    q = (q or "").strip() or None
+    if not (q or tags or min_price is not None or max_price is not None):
+        raise HTTPException(status_code=400, detail="Provide a search text, tags or a price range.")
+
+    try:
+        rows, total = await Database.run(
+            search_repo.search,
+            q,
+            kinds,
+            json.dumps(tags) if tags else None,
+            min_price,
+            max_price,
+            limit,
+            offset,
+        )
+        return ModelResponse(SearchResults(
+            query=q,
+            total=total,
+            limit=limit,
+            offset=offset,
+            results=[dict(row, type=row["kind"]) for row in rows],
+        ))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching catalog: {str(e)}")
@@ -0,0 +1,188 @@
+"""Production server: uvicorn with one worker process per usable CPU.
+
+    python -m app.server
+
+Uses uvloop and httptools when they are installed (the "server" extra). The
+worker count follows WEB_CONCURRENCY, or else the CPUs this process may run
+on, capped by the container's cgroup CPU quota. Send SIGHUP to replace the
+workers one at a time, e.g. after deploying new code in place; each old
+worker is stopped only once its replacement has started up. SIGTTIN and
+SIGTTOU add and remove a worker.
+"""
+from app.config import (
+    SERVER_ACCESS_LOG, SERVER_BACKLOG, SERVER_HOST, SERVER_HTTP, SERVER_KEEPALIVE_TIMEOUT, SERVER_LOOP, SERVER_PORT,
+    SERVER_STARTUP_TIMEOUT, SHUTDOWN_DRAIN_TIMEOUT, WEB_CONCURRENCY,
+)
+from app.middleware.drain import DrainMiddleware
+from app.startup import close_streams
+from importlib.util import find_spec
+from multiprocessing import Pipe
+from pathlib import Path
+from uvicorn.supervisors.multiprocess import Multiprocess, Process
+import math
+import os
+import time
+import uvicorn
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def cpu_quota(root: Path = CGROUP_ROOT):
+    """CPUs allowed by the cgroup CPU quota, or None when there is no quota.
+
+    Reads cpu.max (cgroup v2) or cpu.cfs_quota_us / cpu.cfs_period_us
+    (cgroup v1).
+
+    Returns:
+        float: The quota in CPUs, e.g. 1.5; None if unlimited or unknown.
+    """
+    try:
+        quota, period = (root / "cpu.max").read_text().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int((root / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((root / "cpu" / "cpu.cfs_period_us").read_text())
+        return quota / period if quota > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def worker_count() -> int:
+    """One worker per CPU this process may use, at least one."""
+    cpus = os.process_cpu_count() or 1
+    quota = cpu_quota()
+    if quota is not None:
+        # A fractional quota cannot keep one more worker busy.
+        cpus = min(cpus, math.floor(quota))
+    return max(1, cpus)
+
+
+def loop_implementation(choice: str = SERVER_LOOP) -> str:
+    if choice != "auto":
+        return choice
+    return "uvloop" if find_spec("uvloop") else "asyncio"
+
+
+def http_implementation(choice: str = SERVER_HTTP) -> str:
+    if choice != "auto":
+        return choice
+    return "httptools" if find_spec("httptools") else "h11"
+
+
+class Server(uvicorn.Server):
+    # Set in a worker started by WorkerProcess: told once startup is complete.
+    ready_pipe = None
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets=sockets)
+        # Only set once the app's startup (pool, migrations, warm-up) has
+        # succeeded and the worker is accepting connections.
+        if self.started and Server.ready_pipe is not None:
+            try:
+                Server.ready_pipe.send(b"ready")
+            except OSError:
+                # The supervisor gave up waiting and is stopping this worker.
+                pass
+
+    async def shutdown(self, sockets=None):
+        # Not ready from the first moment of shutdown, not only once the
+        # app's lifespan shutdown runs after connections have drained.
+        DrainMiddleware.draining = True
+        # uvicorn waits for open connections before running the app's
+        # shutdown, and event streams never finish by themselves.
+        await close_streams()
+        await super().shutdown(sockets=sockets)
+
+
+class WorkerProcess(Process):
+    """A uvicorn worker process that reports when it has finished starting up."""
+
+    def __init__(self, config, target, sockets):
+        self.ready_parent, self.ready_child = Pipe(duplex=False)
+        super().__init__(config, target, sockets)
+
+    def target(self, sockets=None):
+        Server.ready_pipe = self.ready_child
+        return super().target(sockets)
+
+    def start(self):
+        super().start()
+        # The worker has its own copy; the parent only reads.
+        self.ready_child.close()
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Whether the worker started up within ``timeout`` seconds; False once it has exited."""
+        deadline = time.monotonic() + timeout
+        try:
+            while time.monotonic() < deadline:
+                if self.ready_parent.poll(0.1):
+                    # poll() is also true at end of file, once the worker has exited.
+                    try:
+                        return self.ready_parent.recv() == b"ready"
+                    except EOFError:
+                        return False
+                if not self.process.is_alive():
+                    return False
+            return False
+        finally:
+            self.ready_parent.close()
+
+    def stop(self, timeout: float):
+        """SIGTERM, then SIGKILL if the worker has not exited after ``timeout`` seconds."""
+        self.terminate()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+        self.join()
+
+
+class Supervisor(Multiprocess):
+    """uvicorn's worker supervisor, with replacement before removal on reload.
+
+    Each new worker must finish its startup before the one it replaces is
+    stopped, so a reload never takes more than one worker out of service;
+    connections arriving meanwhile wait in the shared listen backlog. If a
+    new worker exits or does not start up within SERVER_STARTUP_TIMEOUT, the
+    reload stops there and the remaining old workers keep serving.
+    """
+
+    def restart_all(self):
+        for index, process in enumerate(self.processes):
+            replacement = WorkerProcess(self.config, self.target, self.sockets)
+            replacement.start()
+            if not replacement.wait_ready(SERVER_STARTUP_TIMEOUT):
+                print(f"New worker [{replacement.pid}] failed to start up; keeping worker [{process.pid}] and the rest.")
+                replacement.stop(SHUTDOWN_DRAIN_TIMEOUT)
+                return
+            process.terminate()
+            process.join()
+            self.processes[index] = replacement
+
+
+def main():
+    workers = WEB_CONCURRENCY or worker_count()
+    config = uvicorn.Config(
+        "app.main:app",
+        host=SERVER_HOST,
+        port=SERVER_PORT,
+        loop=loop_implementation(),
+        http=http_implementation(),
+        workers=workers,
+        backlog=SERVER_BACKLOG,
+        timeout_keep_alive=SERVER_KEEPALIVE_TIMEOUT,
+        access_log=SERVER_ACCESS_LOG,
+        # Requests still running after this long are cut off, so the
+        # orchestrator's kill never lands mid-shutdown.
+        timeout_graceful_shutdown=SHUTDOWN_DRAIN_TIMEOUT,
+    )
+    print(f"Starting {workers} worker(s) with the {config.loop} event loop and the {config.http} HTTP parser.")
+    server = Server(config)
+    # Supervised even with one worker, so it is restarted if it dies and can
+    # be reloaded without closing the socket.
+    Supervisor(config, target=server.run, sockets=[config.bind_socket()]).run()
+
+
+if __name__ == "__main__":
+    main()
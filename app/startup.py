@@ -1,10 +1,45 @@
-from app.config import DB_CONNECTION_STRING
+from app.config import (
+    DB_CONNECTION_STRING, DB_POOLER_MODE, DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_REPLICA_CONNECTION_STRINGS,
+    DB_REPLICA_RETRY_SECONDS, JOBS_IN_PROCESS, SHUTDOWN_DRAIN_TIMEOUT,
+)
+from app.booking_feed import BookingFeed
 from app.db import Database
+from app.jobs.handlers import schedule_booking_partitions
+from app.jobs.worker import Worker
+from app.middleware.drain import DrainMiddleware
+from app.migrations import apply_migrations
+from app.warmup import HOT_STATEMENTS
 
 async def startup():
-    """Create the database pool on app startup."""
-    await Database.connect(DB_CONNECTION_STRING)
+    """Create the database pools, apply pending migrations, warm up the pool and start the booking feed and job worker on app startup."""
+    DrainMiddleware.draining = False
+    await Database.connect(
+        DB_CONNECTION_STRING,
+        pooler_mode=DB_POOLER_MODE,
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=DB_POOL_MAX_SIZE,
+        replicas=DB_REPLICA_CONNECTION_STRINGS,
+        replica_retry_seconds=DB_REPLICA_RETRY_SECONDS,
+    )
+    await Database.run(apply_migrations)
+    await Database.warm_up(HOT_STATEMENTS)
+    # Daily bookings partition upkeep; one queued run however many instances start.
+    await Database.run(schedule_booking_partitions)
+    BookingFeed().start()
+    if JOBS_IN_PROCESS:
+        Worker().start()
+
+async def close_streams():
+    """End open event streams; they would otherwise hold a graceful shutdown for its full timeout."""
+    if BookingFeed.current is not None:
+        await BookingFeed.current.stop()
 
 async def shutdown():
-    """Release the database pool on app shutdown."""
+    """End live feeds, let in-flight requests and background jobs finish, then release the database pool on app shutdown."""
+    await close_streams()
+    remaining = await DrainMiddleware.drain(SHUTDOWN_DRAIN_TIMEOUT)
+    if remaining:
+        print(f"Shutting down with {remaining} request(s) still in flight.")
+    if Worker.current is not None:
+        await Worker.current.stop()
     await Database.disconnect()
\ No newline at end of file
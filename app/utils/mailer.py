@@ -0,0 +1,75 @@
+from abc import ABC, abstractmethod
+from email.message import EmailMessage
+import asyncio
+import smtplib
+
+
+class Mailer(ABC):
+    """Sends email. Pick an implementation with the MAILER setting."""
+
+    @abstractmethod
+    async def send(self, to: str, subject: str, body: str):
+        ...
+
+
+class SMTPMailer(Mailer):
+    """Delivers through an SMTP server.
+
+    Point it at a local stand-in such as MailHog or Mailpit
+    (SMTP_HOST=localhost, SMTP_PORT=1025) to see messages without sending them.
+    """
+
+    def __init__(self, host: str, port: int, sender: str, username: str = None, password: str = None,
+                 use_tls: bool = False, timeout: float = 10):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+
+    async def send(self, to: str, subject: str, body: str):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = to
+        message["Subject"] = subject
+        message.set_content(body)
+        # smtplib blocks; keep it off the event loop.
+        await asyncio.to_thread(self._deliver, message)
+
+    def _deliver(self, message: EmailMessage):
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(message)
+
+
+class ConsoleMailer(Mailer):
+    """Prints messages instead of sending them; the default without SMTP settings."""
+
+    async def send(self, to: str, subject: str, body: str):
+        print(f"Mail to {to}: {subject}\n{body}")
+
+
+class MemoryMailer(Mailer):
+    """Keeps sent messages in ``outbox`` as ``(to, subject, body)`` tuples."""
+
+    def __init__(self):
+        self.outbox = []
+
+    async def send(self, to: str, subject: str, body: str):
+        self.outbox.append((to, subject, body))
+
+
+def create_mailer(kind: str, **smtp) -> Mailer:
+    """Build the mailer named by MAILER: "smtp", "console" or "memory"."""
+    if kind == "smtp":
+        return SMTPMailer(**smtp)
+    if kind == "memory":
+        return MemoryMailer()
+    if kind != "console":
+        print(f"Unknown MAILER '{kind}', printing mail to the console instead.")
+    return ConsoleMailer()
@@ -0,0 +1,49 @@
+from fastapi import Response
+from pydantic import BaseModel
+
+
+class ModelResponse(Response):
+    """JSON response rendered straight from a Pydantic model by pydantic-core.
+
+    Returning one of these skips FastAPI's response handling, which would
+    validate the model again and encode it a second time with ``json.dumps``.
+    Declare the model as the route's ``response_model`` so it still appears in
+    the OpenAPI schema.
+
+    Args:
+        content (BaseModel): The response body.
+        exclude_unset (bool): Leave out fields that were never set, for
+            responses that only carry the fields a client asked for.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content: BaseModel, exclude_unset: bool = False, **kwargs):
+        self.exclude_unset = exclude_unset
+        super().__init__(content, **kwargs)
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content, exclude_unset=self.exclude_unset)
+
+
+def menu_response(heading, dishes) -> dict:
+    return {
+        "id": heading["id"],
+        "heading": heading["heading"],
+        "heading_image": heading["heading_image"],
+        "dishes": [
+            {
+                "id": dish["id"],
+                "name": dish["name"],
+                "image": dish["image"]
+            } for dish in dishes
+        ]
+    }
+
+
+def subpackage_response(subpackage) -> dict:
+    return {
+        "subpackage_id": subpackage["id"],
+        "name": subpackage["name"],
+        "price": subpackage["price"]
+    }
@@ -0,0 +1,36 @@
+from app.repositories import (
+    bookings as bookings_repo,
+    events as events_repo,
+    jobs as jobs_repo,
+    menus as menus_repo,
+    occasions as occasions_repo,
+    users as users_repo,
+)
+
+# Statements prepared on every pooled connection at startup (see
+# Database.warm_up), so the first request after a deploy skips the Parse
+# round trip. The texts must match what the repositories send exactly.
+HOT_STATEMENTS = (
+    # Occasions
+    occasions_repo.LIST_ALL,
+    occasions_repo.GET,
+    occasions_repo.EXISTS,
+    occasions_repo.LIST_PACKAGES,
+    occasions_repo.LIST_OCCASION_SUBPACKAGES,
+    occasions_repo.fields_query(occasions_repo.VIEWS["card"]),
+    # Events
+    events_repo.LIST_ALL,
+    events_repo.fields_query(events_repo.VIEWS["card"]),
+    # Menus
+    menus_repo.LIST_HEADINGS,
+    menus_repo.LIST_DISHES,
+    menus_repo.GET_HEADING,
+    menus_repo.LIST_DISHES_FOR_HEADING,
+    # Bookings, including the confirmation job queued with each one
+    bookings_repo.INSERT,
+    bookings_repo.LIST_FOR_USER,
+    bookings_repo.LIST_UPCOMING_FOR_USER,
+    jobs_repo.INSERT,
+    # Sign-in
+    users_repo.GET_BY_EMAIL,
+)
@@ -0,0 +1,220 @@
+"""Requests per second through the production server at several worker counts.
+
+Starts ``python -m app.server`` once per worker count against a throwaway
+Postgres database, drives one endpoint over keep-alive HTTP/1.1 connections
+from separate load processes, and prints one JSON document with throughput
+and latency per worker count.
+
+    BENCH_DB_CONNECTION_STRING=postgresql://postgres@localhost/bench \\
+        uv run --group bench --extra server python -m benchmarks.http_load --workers 1,2,4,8
+
+The database is wiped and re-seeded with the chosen profile; never point it at
+a database you care about. The load generator shares the machine with the
+server: on a machine with few cores the two compete for CPU.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+async def _connection(host, port, request, warmup_until, deadline, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(request)
+            status = await reader.readline()
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            if started < warmup_until:
+                continue
+            if status.split(b" ", 2)[1:2] == [b"200"]:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+    finally:
+        writer.close()
+    return errors
+
+
+async def _load(url, connections, warmup, duration, accept_encoding):
+    parts = urlsplit(url)
+    request = (
+        f"GET {parts.path or '/'}{'?' + parts.query if parts.query else ''} HTTP/1.1\r\n"
+        f"Host: {parts.netloc}\r\nAccept-Encoding: {accept_encoding}\r\n\r\n"
+    ).encode()
+    now = time.perf_counter()
+    latencies = []
+    errors = await asyncio.gather(*(
+        _connection(parts.hostname, parts.port or 80, request, now + warmup, now + warmup + duration, latencies)
+        for _ in range(connections)
+    ))
+    return latencies, sum(errors)
+
+
+def load_process(url, connections, warmup, duration, accept_encoding):
+    """One load generator process; returns its latencies in seconds and error count."""
+    return asyncio.run(_load(url, connections, warmup, duration, accept_encoding))
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return round(ordered[index] * 1000, 3)
+
+
+def measure(url, args):
+    per_process = max(1, args.connections // args.load_processes)
+    with ProcessPoolExecutor(args.load_processes) as pool:
+        futures = [
+            pool.submit(load_process, url, per_process, args.warmup, args.duration, args.accept_encoding)
+            for _ in range(args.load_processes)
+        ]
+        results = [future.result() for future in futures]
+    latencies = [latency for samples, _ in results for latency in samples]
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "throughput_rps": round(len(latencies) / args.duration, 1),
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def wait_ready(base_url, server, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"app.server exited with status {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"{base_url}/readyz", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("app.server did not become ready in time")
+
+
+def run_server(workers, args, workdir):
+    env = dict(
+        os.environ,
+        DB_CONNECTION_STRING=args.dsn,
+        WEB_CONCURRENCY=str(workers),
+        SERVER_HOST="127.0.0.1",
+        SERVER_PORT=str(args.port),
+        SERVER_ACCESS_LOG="false",
+        PYTHONPATH=str(REPO_ROOT),
+    )
+    # Confirmation mail stays in memory and seeded bookings are kept.
+    env.setdefault("MAILER", "memory")
+    env.setdefault("BOOKINGS_RETENTION_MONTHS", "0")
+    # Every worker opens its own pool; keep the total within max_connections.
+    env.setdefault("DB_POOL_MIN_SIZE", "2")
+    env.setdefault("DB_POOL_MAX_SIZE", "5")
+    return subprocess.Popen(
+        [sys.executable, "-m", "app.server"], env=env, cwd=workdir,
+        stdout=subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL,
+    )
+
+
+async def seed_database(dsn, profile):
+    import asyncpg
+
+    from benchmarks.seed import PROFILES, seed
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        await seed(conn, **PROFILES[profile])
+    finally:
+        await conn.close()
+
+
+def parse_args(argv=None):
+    from benchmarks.seed import PROFILES
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts")
+    parser.add_argument("--path", default="/admin/admin/get-all-events/")
+    parser.add_argument("--profile", default="small", help=f"one of {', '.join(PROFILES)}")
+    parser.add_argument("--connections", type=int, default=64, help="keep-alive connections, over all load processes")
+    parser.add_argument("--load-processes", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10, help="seconds measured per worker count")
+    parser.add_argument("--warmup", type=float, default=3, help="seconds of load before measuring")
+    parser.add_argument("--accept-encoding", default="gzip, br, zstd")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--verbose", action="store_true", help="show the server's output")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    args.workers = [int(n) for n in args.workers.split(",") if n]
+    if args.profile not in PROFILES:
+        parser.error(f"unknown profile: {args.profile}")
+    args.dsn = os.getenv("BENCH_DB_CONNECTION_STRING")
+    if not args.dsn:
+        parser.error("BENCH_DB_CONNECTION_STRING must point at a disposable database")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    asyncio.run(seed_database(args.dsn, args.profile))
+    workdir = tempfile.mkdtemp(prefix="restourantweb-http-bench-")
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    results = []
+    for workers in args.workers:
+        server = run_server(workers, args, workdir)
+        try:
+            wait_ready(base_url, server)
+            result = measure(base_url + args.path, args)
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+        result.update(workers=workers, path=args.path)
+        results.append(result)
+        print(
+            f"[{workers} worker(s)] {args.path}: rps={result['throughput_rps']} "
+            f"p50={result['p50_ms']}ms p99={result['p99_ms']}ms errors={result['errors']}",
+            file=sys.stderr,
+        )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.process_cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "profile": args.profile,
+        "connections": args.connections,
+        "load_processes": args.load_processes,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(REPO_ROOT))
+    main()
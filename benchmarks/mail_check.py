@@ -0,0 +1,107 @@
+"""End-to-end check of booking confirmation email.
+
+Books a table through the API, runs the job worker until the confirmation
+job is done and checks that ``SMTPMailer`` delivered the message, with the
+booking reference, to the in-process SMTP sink from ``benchmarks.smtp_sink``.
+Exits with status 1 if the mail does not arrive or looks wrong.
+
+    BENCH_DB_CONNECTION_STRING=postgresql://postgres@localhost/bench \\
+        uv run --group bench python -m benchmarks.mail_check
+
+The database is wiped and re-seeded; never point it at a database you care
+about.
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+USERNAME = "bench-mailer"
+PASSWORD = "bench-secret"
+
+
+async def run(args) -> list:
+    import asyncpg
+    import httpx
+
+    from app.db import Database
+    from app.jobs import handlers
+    from app.jobs.worker import Worker
+    from app.main import app
+    from app.migrations import apply_migrations
+    from app.utils.mailer import SMTPMailer
+    from benchmarks.seed import PROFILES, seed
+    from benchmarks.smtp_sink import SMTPSink
+
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        ids = await seed(conn, **PROFILES["small"])
+    finally:
+        await conn.close()
+
+    sink = SMTPSink()
+    await sink.start()
+    handlers.mailer = SMTPMailer("127.0.0.1", sink.port, "bookings@example.com",
+                                 username=USERNAME, password=PASSWORD, use_tls=False)
+    await Database.connect(args.dsn, min_size=1, max_size=4)
+    # Only the confirmation handler, so nothing else queued in the database runs here.
+    worker = Worker(handlers={handlers.BOOKING_CONFIRMATION: handlers.HANDLERS[handlers.BOOKING_CONFIRMATION]},
+                    poll_interval=0.1)
+    failures = []
+    try:
+        await Database.run(apply_migrations)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            response = await client.post("/bookings/book-table/", json={
+                "user_id": ids["user_ids"][0],
+                "name": "Mail Check",
+                "email": "mail-check@example.com",
+                "phone_no": "+10000000000",
+                "datetime": "2030-06-01T19:30:00+00:00",
+                "no_of_people": 4,
+            })
+        if response.status_code != 200:
+            return [f"booking failed with {response.status_code}: {response.text}"]
+        booking_id = response.json()["booking_id"]
+
+        worker.start()
+        try:
+            await sink.wait_for(1, args.timeout)
+        except TimeoutError:
+            return [f"no mail reached the sink within {args.timeout}s; worker stats {worker.stats()}"]
+
+        message = sink.messages[0]
+        if message["To"] != "mail-check@example.com":
+            failures.append(f"mail went to {message['To']}")
+        if message["Subject"] != "Your table booking is confirmed":
+            failures.append(f"unexpected subject {message['Subject']!r}")
+        if f"Your booking reference is {booking_id}." not in message.get_content():
+            failures.append("the body does not carry the booking reference")
+        if sink.logins != [(USERNAME, PASSWORD)]:
+            failures.append(f"unexpected logins {sink.logins}")
+    finally:
+        await worker.stop()
+        await Database.disconnect()
+        await sink.close()
+    return failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--timeout", type=float, default=10, help="seconds to wait for the mail")
+    args = parser.parse_args(argv)
+    args.dsn = os.getenv("BENCH_DB_CONNECTION_STRING")
+    if not args.dsn:
+        parser.error("BENCH_DB_CONNECTION_STRING must point at a disposable database")
+    return args
+
+
+def main(argv=None):
+    failures = asyncio.run(run(parse_args(argv)))
+    if failures:
+        print(f"Mail check failed: {'; '.join(failures)}", file=sys.stderr)
+        sys.exit(1)
+    print("Mail check passed: the booking confirmation reached the SMTP sink.")
+
+
+if __name__ == "__main__":
+    main()
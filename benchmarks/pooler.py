@@ -0,0 +1,199 @@
+"""A minimal transaction-pooling proxy for Postgres, standing in for PgBouncer.
+
+Clients get a server connection when they send a message and give it back
+when Postgres reports the transaction finished (ReadyForQuery, status idle,
+with no Sync or Query of theirs still unanswered), exactly like PgBouncer's
+``pool_mode = transaction``. Server connections are handed out in turn, so
+a named prepared statement is soon looked up on a connection that never saw
+it, as it would be behind a busy PgBouncer.
+
+Only what the benchmarks need: one upstream database, trust authentication,
+no TLS and no cancel requests (any other startup packet is refused).
+
+    python -m benchmarks.pooler --server postgresql://postgres@localhost/bench --port 6432 --pool-size 20
+"""
+import argparse
+import asyncio
+import struct
+import sys
+from pathlib import Path
+from urllib.parse import urlsplit
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+PROTOCOL_VERSION = 196608
+SSL_REQUEST = 80877103
+GSSENC_REQUEST = 80877104
+
+
+def message(kind: bytes, body: bytes = b"") -> bytes:
+    return kind + struct.pack("!i", len(body) + 4) + body
+
+
+async def read_message(reader):
+    header = await reader.readexactly(5)
+    length = struct.unpack("!i", header[1:])[0]
+    return header[:1], header + await reader.readexactly(length - 4)
+
+
+class ServerConnection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, host, port, user, database):
+        reader, writer = await asyncio.open_connection(host, port)
+        params = b"".join(
+            key.encode() + b"\0" + value.encode() + b"\0"
+            for key, value in (("user", user), ("database", database), ("client_encoding", "UTF8"))
+        ) + b"\0"
+        writer.write(struct.pack("!ii", len(params) + 8, PROTOCOL_VERSION) + params)
+        statuses = []
+        while True:
+            kind, raw = await read_message(reader)
+            if kind == b"R" and struct.unpack("!i", raw[5:9])[0] != 0:
+                writer.close()
+                raise ConnectionError("the stand-in pooler only supports trust authentication")
+            if kind == b"E":
+                writer.close()
+                raise ConnectionError(raw[5:].replace(b"\0", b" ").decode(errors="replace"))
+            if kind == b"S":
+                statuses.append(raw)
+            if kind == b"Z":
+                return cls(reader, writer), statuses
+
+    def close(self):
+        self.writer.close()
+
+
+class Pooler:
+    """Shares ``pool_size`` server connections among any number of clients."""
+
+    def __init__(self, server_dsn: str, pool_size: int):
+        parts = urlsplit(server_dsn)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 5432
+        self.user = parts.username or "postgres"
+        self.database = parts.path.lstrip("/") or self.user
+        self.pool_size = pool_size
+        # FIFO of idle server connections; None is a slot not yet connected.
+        self.idle = asyncio.Queue()
+        for _ in range(pool_size):
+            self.idle.put_nowait(None)
+        self.statuses = []
+        self.clients = 0
+        self.max_clients = 0
+        self.transactions = 0
+
+    async def acquire(self) -> ServerConnection:
+        server = await self.idle.get()
+        if server is None:
+            try:
+                server, self.statuses = await ServerConnection.open(self.host, self.port, self.user, self.database)
+            except BaseException:
+                self.idle.put_nowait(None)
+                raise
+        return server
+
+    def release(self, server: ServerConnection, broken: bool = False):
+        if broken:
+            server.close()
+            server = None
+        self.idle.put_nowait(server)
+
+    async def start(self, host: str, port: int):
+        # The parameters clients are told about come from a real server.
+        server = await self.acquire()
+        self.release(server)
+        return await asyncio.start_server(self.serve_client, host, port, backlog=4096)
+
+    async def _startup(self, reader, writer) -> bool:
+        while True:
+            length, code = struct.unpack("!ii", await reader.readexactly(8))
+            # Startup parameters are ignored; every client shares one database.
+            await reader.readexactly(length - 8)
+            if code in (SSL_REQUEST, GSSENC_REQUEST):
+                writer.write(b"N")
+                continue
+            if code != PROTOCOL_VERSION:
+                return False
+            writer.write(
+                message(b"R", struct.pack("!i", 0))
+                + b"".join(self.statuses)
+                + message(b"K", struct.pack("!ii", 0, 0))
+                + message(b"Z", b"I")
+            )
+            return True
+
+    async def serve_client(self, reader, writer):
+        self.clients += 1
+        self.max_clients = max(self.max_clients, self.clients)
+        state = {"server": None, "pending": 0, "relay": None}
+        try:
+            if not await self._startup(reader, writer):
+                return
+            while True:
+                kind, raw = await read_message(reader)
+                if kind == b"X":
+                    return
+                if state["server"] is None:
+                    state["server"] = await self.acquire()
+                    state["relay"] = asyncio.create_task(self._relay(state, writer))
+                if kind in (b"S", b"Q", b"F"):
+                    state["pending"] += 1
+                state["server"].writer.write(raw)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.clients -= 1
+            if state["relay"] is not None:
+                state["relay"].cancel()
+            if state["server"] is not None:
+                # Gone mid-transaction: the server connection's state is unknown.
+                self.release(state["server"], broken=True)
+            writer.close()
+
+    async def _relay(self, state, client_writer):
+        """Forward one transaction's replies, then return the server connection."""
+        server = state["server"]
+        while True:
+            try:
+                kind, raw = await read_message(server.reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                state["server"] = None
+                self.release(server, broken=True)
+                client_writer.close()
+                return
+            if kind == b"Z":
+                state["pending"] -= 1
+                if state["pending"] <= 0 and raw[5:6] == b"I":
+                    # Released before the client sees ReadyForQuery, so its
+                    # next message always finds the connection handed back.
+                    state["server"] = None
+                    state["relay"] = None
+                    state["pending"] = 0
+                    self.transactions += 1
+                    self.release(server)
+                    client_writer.write(raw)
+                    return
+            client_writer.write(raw)
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", required=True, help="Postgres DSN to pool connections to")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6432)
+    parser.add_argument("--pool-size", type=int, default=20, help="server connections shared by all clients")
+    args = parser.parse_args(argv)
+    pooler = Pooler(args.server, args.pool_size)
+    server = await pooler.start(args.host, args.port)
+    print(f"Pooling {args.host}:{args.port} onto {args.pool_size} server connection(s).", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(REPO_ROOT))
+    asyncio.run(main())
@@ -0,0 +1,262 @@
+"""Load test of Database behind a transaction pooler, with 10x max_connections clients.
+
+Starts the stand-in pooler from ``benchmarks.pooler`` (PgBouncer's
+transaction mode) in front of a throwaway Postgres database, then opens ten
+times the server's ``max_connections`` client connections to it, spread over
+several processes, each running its own ``Database`` pool. Every client
+connection runs a mix of single reads and multi-statement transactions for
+the whole run.
+
+In the default ``auto`` mode each process starts with prepared statements
+on, so the pooler soon rejects one; the process must switch to transaction
+mode once and finish without a single failed call. The run fails (exit
+status 1) on any error, on a process still outside transaction mode at the
+end, or if Postgres ever saw more backends than the pooler's pool size.
+
+    BENCH_DB_CONNECTION_STRING=postgresql://postgres@localhost/bench \\
+        uv run --group bench python -m benchmarks.pooler_load
+
+The database is wiped and re-seeded; never point it at a database you care
+about.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SERVER_BACKENDS = """
+    SELECT count(*) FROM pg_stat_activity
+    WHERE datname = current_database() AND backend_type = 'client backend' AND pid <> pg_backend_pid()
+"""
+
+
+async def _read_booking(conn, user_id):
+    from app.repositories import bookings as bookings_repo
+
+    return await bookings_repo.list_for_user(conn, user_id)
+
+
+async def _read_occasion(conn, occasion_id):
+    from app.repositories import occasions as occasions_repo
+
+    return await occasions_repo.get(conn, occasion_id)
+
+
+async def _book_and_read_back(conn, user_id):
+    """Several statements that must reach one server connection."""
+    from app.repositories import bookings as bookings_repo
+
+    booking_id = await bookings_repo.create(
+        conn, user_id, "Pooler Guest", "guest@example.com", "+10000000000",
+        None, 2, None,
+    )
+    if await bookings_repo.get(conn, booking_id) is None:
+        raise RuntimeError(f"booking {booking_id} not visible inside its own transaction")
+    return booking_id
+
+
+async def _client(dsn, connections, mode, duration, ids, seed_value):
+    from app.db import Database
+
+    rng = random.Random(seed_value)
+    await Database.connect(dsn, pooler_mode=mode, min_size=connections, max_size=connections)
+    latencies, errors = [], Counter()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            choice = rng.random()
+            started = time.perf_counter()
+            try:
+                if choice < 0.4:
+                    await Database.run(_read_booking, rng.choice(ids["user_ids"]), readonly=True)
+                elif choice < 0.8:
+                    await Database.run(_read_occasion, rng.choice(ids["occasion_ids"]), readonly=True)
+                else:
+                    await Database.run(_book_and_read_back, rng.choice(ids["user_ids"]), transaction=True)
+            except Exception as e:
+                errors[f"{type(e).__name__}: {e}"[:200]] += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(connections)))
+    finally:
+        result = {
+            "calls": len(latencies),
+            "errors": dict(errors),
+            "pooler_mode": Database.pooler_mode,
+            "latencies": latencies,
+        }
+        await Database.disconnect()
+    return result
+
+
+def client_process(dsn, connections, mode, duration, ids, seed_value):
+    """One client process with its own Database pool of ``connections`` connections."""
+    return asyncio.run(_client(dsn, connections, mode, duration, ids, seed_value))
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return round(ordered[index] * 1000, 3)
+
+
+async def prepare_database(dsn, profile):
+    import asyncpg
+
+    from benchmarks.seed import PROFILES, seed
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        ids = await seed(conn, **PROFILES[profile])
+        max_connections = int(await conn.fetchval("SHOW max_connections"))
+    finally:
+        await conn.close()
+    return {"user_ids": ids["user_ids"], "occasion_ids": ids["occasion_ids"]}, max_connections
+
+
+async def sample_backends(dsn, stop: asyncio.Event) -> int:
+    """Highest number of client backends on the database seen until ``stop``."""
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    highest = 0
+    try:
+        while not stop.is_set():
+            highest = max(highest, await conn.fetchval(SERVER_BACKENDS))
+            try:
+                await asyncio.wait_for(stop.wait(), 0.2)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await conn.close()
+    return highest
+
+
+def start_pooler(args):
+    pooler = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.pooler", "--server", args.dsn,
+         "--port", str(args.port), "--pool-size", str(args.pool_size)],
+        cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    # The pooler prints one line once it is listening.
+    if not pooler.stdout.readline():
+        raise RuntimeError(f"the stand-in pooler exited with status {pooler.wait()}")
+    return pooler
+
+
+def pooled_dsn(dsn: str, port: int) -> str:
+    parts = urlsplit(dsn)
+    netloc = f"{parts.username or 'postgres'}@127.0.0.1:{port}"
+    return urlunsplit((parts.scheme, netloc, parts.path, parts.query, parts.fragment))
+
+
+async def run(args):
+    ids, max_connections = await prepare_database(args.dsn, args.profile)
+    clients = args.clients or 10 * max_connections
+    per_process = -(-clients // args.processes)
+    pooler = start_pooler(args)
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_backends(args.dsn, stop))
+    loop = asyncio.get_running_loop()
+    try:
+        with ProcessPoolExecutor(args.processes) as pool:
+            futures = [
+                loop.run_in_executor(
+                    pool, client_process, pooled_dsn(args.dsn, args.port),
+                    min(per_process, clients - n * per_process), args.mode, args.duration, ids, n,
+                )
+                for n in range(args.processes)
+                if clients - n * per_process > 0
+            ]
+            results = await asyncio.gather(*futures)
+    finally:
+        stop.set()
+        highest_backends = await sampler
+        pooler.terminate()
+        pooler.wait(timeout=30)
+
+    errors = Counter()
+    for result in results:
+        errors.update(result["errors"])
+    latencies = [latency for result in results for latency in result["latencies"]]
+    modes = sorted({result["pooler_mode"] for result in results})
+    failures = []
+    if errors:
+        failures.append(f"{sum(errors.values())} failed call(s)")
+    if modes != ["transaction"]:
+        failures.append(f"pooler modes at the end: {', '.join(modes)}")
+    if highest_backends > args.pool_size:
+        failures.append(f"{highest_backends} server backends for a pool of {args.pool_size}")
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "mode": args.mode,
+        "max_connections": max_connections,
+        "client_connections": clients,
+        "processes": len(results),
+        "pooler_pool_size": args.pool_size,
+        "highest_server_backends": highest_backends,
+        "calls": len(latencies),
+        "throughput_per_s": round(len(latencies) / args.duration, 1),
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "errors": dict(errors),
+        "passed": not failures,
+        "failures": failures,
+    }
+
+
+def parse_args(argv=None):
+    from benchmarks.seed import PROFILES
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, help="client connections in total; default 10x max_connections")
+    parser.add_argument("--processes", type=int, default=10, help="client processes, one Database pool each")
+    parser.add_argument("--mode", default="auto", choices=("auto", "transaction"), help="DB_POOLER_MODE of the clients")
+    parser.add_argument("--pool-size", type=int, default=20, help="server connections the pooler keeps")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of load")
+    parser.add_argument("--profile", default="small", help=f"one of {', '.join(PROFILES)}")
+    parser.add_argument("--port", type=int, default=6432)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.profile not in PROFILES:
+        parser.error(f"unknown profile: {args.profile}")
+    args.dsn = os.getenv("BENCH_DB_CONNECTION_STRING")
+    if not args.dsn:
+        parser.error("BENCH_DB_CONNECTION_STRING must point at a disposable database")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+    if not report["passed"]:
+        print(f"Pooler load test failed: {'; '.join(report['failures'])}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(REPO_ROOT))
+    main()
@@ -0,0 +1,299 @@
+"""In-process ASGI benchmark for every router in app.main.
+
+Drives ``app.main:app`` through httpx's ASGI transport (no sockets, no
+uvicorn) against a throwaway Postgres database, and prints one JSON document
+with throughput, p50/p99 latency, allocation and DB query counts per endpoint.
+
+    BENCH_DB_CONNECTION_STRING=postgresql://postgres@localhost/bench \\
+        uv run --group bench python -m benchmarks.run --profiles small,medium
+
+The database named by BENCH_DB_CONNECTION_STRING is wiped and re-seeded for
+every profile; never point it at a database you care about. Uploaded files
+are written to a temporary directory. Set BENCH_REPLICA_CONNECTION_STRINGS
+to streaming replicas of it to route GET requests through them.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class QueryCounter:
+    """Counts statements sent to Postgres through asyncpg's query logger."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _log(self, record):
+        self.count += 1
+
+    async def attach(self, conn):
+        conn.add_query_logger(self._log)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _request(client, scenario, ctx, i):
+    kwargs = scenario.build(ctx, i)
+    kwargs.setdefault("url", scenario.path)
+    response = await client.request(scenario.method, **kwargs)
+    if scenario.check is not None:
+        scenario.check(response)
+    return response
+
+
+async def run_scenario(client, scenario, ctx, counter, args):
+    from app.db import Database
+
+    # The first request shows what a freshly started instance pays.
+    first_ms = None
+    for i in range(args.warmup):
+        started = time.perf_counter()
+        await _request(client, scenario, ctx, i)
+        if first_ms is None:
+            first_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    latencies = []
+    statuses = {}
+    sizes = []
+    wire_sizes = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(i):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await _request(client, scenario, ctx, i)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            sizes.append(len(response.content))
+            wire_sizes.append(response.num_bytes_downloaded)
+
+    await asyncio.sleep(0)
+    queries_before = counter.count
+    statements_before = Database.statement_stats()
+    replica_reads_before = sum(replica["reads"] for replica in Database.replica_stats())
+    started = time.perf_counter()
+    await asyncio.gather(*(one(args.warmup + i) for i in range(args.iterations)))
+    elapsed = time.perf_counter() - started
+    # Query log callbacks are scheduled with call_soon; let them run.
+    await asyncio.sleep(0)
+    queries = counter.count - queries_before
+    statements = Database.statement_stats()
+    hits = statements["hits"] - statements_before["hits"]
+    replica_reads = sum(replica["reads"] for replica in Database.replica_stats()) - replica_reads_before
+    misses = statements["misses"] - statements_before["misses"]
+
+    # Allocation pass, sequential and separate so tracing does not skew latency.
+    peaks = []
+    offset = args.warmup + args.iterations
+    tracemalloc.start()
+    try:
+        for i in range(args.alloc_iterations):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            await _request(client, scenario, ctx, offset + i)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+
+    errors = sum(n for status, n in statuses.items() if status >= 500)
+    return {
+        "endpoint": scenario.name,
+        "router": scenario.router,
+        "method": scenario.method,
+        "path": scenario.path,
+        "requests": args.iterations,
+        "concurrency": args.concurrency,
+        "status_counts": {str(k): v for k, v in sorted(statuses.items())},
+        "errors": errors,
+        "throughput_rps": round(args.iterations / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "first_ms": first_ms,
+        "db_queries_per_request": round(queries / args.iterations, 2),
+        "statement_cache_hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+        "replica_reads_per_request": round(replica_reads / args.iterations, 2),
+        "alloc_peak_kib_p50": round(statistics.median(peaks) / 1024, 1) if peaks else None,
+        "response_bytes_p50": int(statistics.median(sizes)),
+        "wire_bytes_p50": int(statistics.median(wire_sizes)),
+    }
+
+
+async def run_profile(name, sizes, args):
+    import asyncpg
+    import httpx
+
+    from app.config import DB_POOLER_MODE, DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_REPLICA_CONNECTION_STRINGS
+    from app.db import Database
+    from app.jobs.worker import Worker
+    from app.main import app
+    from app.warmup import HOT_STATEMENTS
+    from benchmarks.scenarios import SCENARIOS
+    from benchmarks.seed import seed
+
+    scenarios = [s for s in SCENARIOS if not args.only or s.name in args.only]
+
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        ctx = await seed(conn, **sizes)
+        rows_needed = args.warmup + args.iterations + args.alloc_iterations
+        for scenario in scenarios:
+            if scenario.setup:
+                ctx[scenario.name] = await scenario.setup(conn, rows_needed)
+    finally:
+        await conn.close()
+    ctx["run_id"] = uuid.uuid4().hex[:8]
+
+    await app.router.startup()
+    # Reopen the pool with the query counter attached to every connection,
+    # pausing the in-process job worker while the pool is swapped.
+    counter = QueryCounter()
+    worker = Worker.current
+    if worker is not None:
+        await worker.stop()
+    await Database.disconnect()
+    await Database.connect(
+        args.dsn, pooler_mode=DB_POOLER_MODE, min_size=DB_POOL_MIN_SIZE, max_size=DB_POOL_MAX_SIZE,
+        init=counter.attach, replicas=DB_REPLICA_CONNECTION_STRINGS,
+    )
+    if not args.cold:
+        await Database.warm_up(HOT_STATEMENTS)
+    if worker is not None:
+        Worker().start()
+    results = []
+    try:
+        # Unhandled exceptions become 500s, as they would behind uvicorn.
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        headers = {"Accept-Encoding": args.accept_encoding}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+            for scenario in scenarios:
+                result = await run_scenario(client, scenario, ctx, counter, args)
+                result.update(profile=name, **sizes)
+                results.append(result)
+                print(
+                    f"[{name}] {scenario.name}: p50={result['p50_ms']}ms p99={result['p99_ms']}ms "
+                    f"first={result['first_ms']}ms "
+                    f"rps={result['throughput_rps']} queries/req={result['db_queries_per_request']} "
+                    f"stmt_hit_rate={result['statement_cache_hit_rate']} "
+                    f"replica_reads/req={result['replica_reads_per_request']}",
+                    file=sys.stderr,
+                )
+    finally:
+        await app.router.shutdown()
+    compare_sizes(results, scenarios)
+    return results
+
+
+def compare_sizes(results, scenarios):
+    """Add each projected scenario's response size relative to its baseline."""
+    by_name = {result["endpoint"]: result for result in results}
+    for scenario in scenarios:
+        if scenario.baseline not in by_name or scenario.name not in by_name:
+            continue
+        result, baseline = by_name[scenario.name], by_name[scenario.baseline]
+        result["baseline"] = scenario.baseline
+        if baseline["response_bytes_p50"]:
+            result["response_bytes_ratio"] = round(result["response_bytes_p50"] / baseline["response_bytes_p50"], 4)
+        print(
+            f"[{result['profile']}] {scenario.name}: {result['response_bytes_p50']} bytes vs "
+            f"{baseline['response_bytes_p50']} for {scenario.baseline} ({result.get('response_bytes_ratio')}x)",
+            file=sys.stderr,
+        )
+
+
+def parse_args(argv=None):
+    from benchmarks.seed import PROFILES
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default="small,medium", help=f"comma-separated, from {', '.join(PROFILES)}")
+    parser.add_argument("--only", default="", help="comma-separated scenario names to run")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--alloc-iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--accept-encoding", default="gzip, br, zstd",
+                        help="Accept-Encoding sent with every request; 'identity' disables compression")
+    parser.add_argument("--cold", action="store_true",
+                        help="skip the pool warm-up done at startup, to measure first requests without it")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    args.profiles = [p for p in args.profiles.split(",") if p]
+    args.only = {s for s in args.only.split(",") if s}
+    unknown = [p for p in args.profiles if p not in PROFILES]
+    if unknown:
+        parser.error(f"unknown profile(s): {', '.join(unknown)}")
+    args.dsn = os.getenv("BENCH_DB_CONNECTION_STRING")
+    # Streaming replicas of that database, comma-separated; optional.
+    args.replicas = [dsn for dsn in os.getenv("BENCH_REPLICA_CONNECTION_STRINGS", "").split(",") if dsn]
+    if not args.dsn:
+        parser.error("BENCH_DB_CONNECTION_STRING must point at a disposable database")
+    return args
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    # Relative to where the suite was started, not the directory below.
+    if args.output:
+        args.output = Path(args.output).resolve()
+    # The app reads its settings at import time; point it at the bench
+    # database and keep uploads out of the working tree.
+    os.environ["DB_CONNECTION_STRING"] = args.dsn
+    os.environ["DB_REPLICA_CONNECTION_STRINGS"] = ",".join(args.replicas)
+    # Booking confirmations are still queued and sent by the job worker, but
+    # kept in memory rather than printed over the report.
+    os.environ.setdefault("MAILER", "memory")
+    # Seeded bookings are years old; keep them in the database.
+    os.environ.setdefault("BOOKINGS_RETENTION_MONTHS", "0")
+    os.chdir(tempfile.mkdtemp(prefix="restourantweb-bench-"))
+
+    from benchmarks.seed import PROFILES
+
+    results = []
+    for name in args.profiles:
+        results.extend(await run_profile(name, PROFILES[name], args))
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "accept_encoding": args.accept_encoding,
+        "replicas": len(args.replicas),
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(REPO_ROOT))
+    asyncio.run(main())
@@ -0,0 +1,289 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, List, Optional
+
+from benchmarks.seed import BENCH_PASSWORD, WORDS
+
+# The admin router declares its own "/admin" prefix and is mounted under
+# "/admin" again in app.main.
+ADMIN = "/admin/admin"
+
+# Smallest valid PNG, used for every upload.
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+@dataclass
+class Scenario:
+    """One endpoint under test.
+
+    ``build(ctx, i)`` returns the keyword arguments for ``httpx.AsyncClient.request``
+    for the i-th iteration. ``setup(conn, n)`` can insert n throwaway rows for
+    destructive scenarios; its result is stored in ``ctx[name]``. ``baseline``
+    names the scenario whose response size this one is compared against.
+    ``check(response)``, if given, runs on every response and raises
+    AssertionError when the endpoint returned the wrong thing.
+    """
+    name: str
+    router: str
+    method: str
+    path: str
+    build: Callable[[dict, int], dict]
+    setup: Optional[Callable[..., Awaitable[list]]] = None
+    baseline: Optional[str] = None
+    check: Optional[Callable[[Any], None]] = None
+
+
+def _check_past_end(response):
+    body = response.json()
+    assert response.status_code == 200, response.status_code
+    assert body["results"] == [], "a page past the end returned results"
+    assert body["total"] > 0, "a page past the end lost the total"
+
+
+def _png(name: str):
+    return (name, PNG, "image/png")
+
+
+def _pick(ctx: dict, key: str, i: int):
+    values = ctx[key]
+    return values[i % len(values)]
+
+
+async def _insert_ids(conn, query: str, rows) -> list:
+    return [await conn.fetchval(query, *row) for row in rows]
+
+
+async def _setup_occasions(conn, n):
+    return await _insert_ids(conn, """
+        INSERT INTO occasions (name, heading, description, price, standard_price, outstandard_price, tags, images)
+        VALUES ($1, 'heading', 'description', 100, 100, 100, '[]', '[]') RETURNING id
+    """, ((f"disposable {i}",) for i in range(n)))
+
+
+async def _setup_menu_displays(conn, n):
+    occasion_ids = await _setup_occasions(conn, n)
+    for occasion_id in occasion_ids:
+        package_id = await conn.fetchval(
+            "INSERT INTO packages (occasion_id, name, price) VALUES ($1, 'package', 10) RETURNING id",
+            occasion_id,
+        )
+        await conn.execute(
+            "INSERT INTO subpackages (package_id, name, price) VALUES ($1, 'sub', 1), ($1, 'sub', 2)",
+            package_id,
+        )
+    return occasion_ids
+
+
+async def _setup_menus(conn, n):
+    heading_ids = await _insert_ids(conn, """
+        INSERT INTO menu_headings (heading, heading_image) VALUES ($1, 'x.png') RETURNING id
+    """, ((f"disposable {i}",) for i in range(n)))
+    for heading_id in heading_ids:
+        await conn.execute(
+            "INSERT INTO dishes (menu_id, name, image) VALUES ($1, 'dish', 'x.png'), ($1, 'dish', 'y.png')",
+            heading_id,
+        )
+    return heading_ids
+
+
+def _setup_rows(query: str):
+    async def setup(conn, n):
+        return await _insert_ids(conn, query, ((i,) for i in range(n)))
+    return setup
+
+
+_setup_events = _setup_rows(
+    "INSERT INTO events (pic_path, name, description, price) VALUES ('x.png', 'disposable ' || $1::int, 'd', 1) RETURNING id"
+)
+_setup_services = _setup_rows(
+    "INSERT INTO services (name, description, image_path) VALUES ('disposable ' || $1::int, 'd', 'x.png') RETURNING id"
+)
+_setup_team_members = _setup_rows(
+    "INSERT INTO team_members (name, designation, description, image_path) VALUES ('disposable ' || $1::int, 'chef', 'd', 'x.png') RETURNING id"
+)
+_setup_contacts = _setup_rows(
+    "INSERT INTO contact_us (name, email, subject, message) VALUES ('disposable ' || $1::int, 'a@example.com', 's', 'm') RETURNING id"
+)
+_setup_bookings = _setup_rows(
+    "INSERT INTO bookings (user_id, name, email, phone_no, datetime, no_of_people) "
+    "VALUES ('disposable', 'guest ' || $1::int, 'a@example.com', '1', now(), 2) RETURNING id"
+)
+
+# Rows deleted per request by the batch scenario.
+BATCH_SIZE = 1000
+
+
+async def _setup_booking_batches(conn, n):
+    ids = [row["id"] for row in await conn.fetch(
+        "INSERT INTO bookings (user_id, name, email, phone_no, datetime, no_of_people) "
+        "SELECT 'disposable', 'guest ' || i, 'a@example.com', '1', now(), 2 "
+        "FROM generate_series(1, $1) AS i RETURNING id",
+        n * BATCH_SIZE,
+    )]
+    return [ids[start:start + BATCH_SIZE] for start in range(0, len(ids), BATCH_SIZE)]
+
+
+def _booking_payload(ctx, i):
+    when = datetime(2030, 1, 1, 19, tzinfo=timezone.utc) + timedelta(minutes=30 * i)
+    return {
+        "user_id": _pick(ctx, "user_ids", i),
+        "name": "Bench Guest",
+        "email": "guest@example.com",
+        "phone_no": "+10000000000",
+        "datetime": when.isoformat(),
+        "no_of_people": 2 + i % 6,
+        "special_request": "window seat",
+    }
+
+
+SCENARIOS: List[Scenario] = [
+    # user
+    Scenario("signup", "user", "POST", "/users/signup/", lambda ctx, i: {
+        "json": {"email": f"new-{ctx['run_id']}-{i}@example.com", "username": "bench", "password": BENCH_PASSWORD},
+    }),
+    Scenario("login", "user", "POST", "/users/login/", lambda ctx, i: {
+        "json": {"email": f"{_pick(ctx, 'user_ids', i)}@example.com", "password": BENCH_PASSWORD},
+    }),
+    # booking
+    Scenario("book_table", "booking", "POST", "/bookings/book-table/", lambda ctx, i: {
+        "json": _booking_payload(ctx, i),
+    }),
+    Scenario("get_bookings", "booking", "GET", "/bookings/get-bookings/{user_id}", lambda ctx, i: {
+        "url": f"/bookings/get-bookings/{_pick(ctx, 'user_ids', i)}",
+    }),
+    Scenario("get_bookings_upcoming", "booking", "GET", "/bookings/get-bookings/{user_id}?upcoming=true", lambda ctx, i: {
+        "url": f"/bookings/get-bookings/{_pick(ctx, 'user_ids', i)}?upcoming=true",
+    }),
+    # contact_us
+    Scenario("contact_us", "contact_us", "POST", "/contact-us/", lambda ctx, i: {
+        "json": {"name": "Bench", "email": "guest@example.com", "subject": "Hello", "message": "Benchmark message"},
+    }),
+    # admin: catalog reads
+    Scenario("get_all_occasions", "admin", "GET", f"{ADMIN}/get-all-occasions/", lambda ctx, i: {}),
+    Scenario("get_occasion", "admin", "GET", f"{ADMIN}/get-occasion/{{id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/get-occasion/{_pick(ctx, 'occasion_ids', i)}/",
+    }),
+    Scenario("get_all_menu", "admin", "GET", f"{ADMIN}/get-all-menu/", lambda ctx, i: {}),
+    Scenario("get_menu_by_heading_id", "admin", "GET", f"{ADMIN}/get-menu-by-heading-id/{{heading_id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/get-menu-by-heading-id/{_pick(ctx, 'heading_ids', i)}/",
+    }),
+    Scenario("get_menu_display", "admin", "GET", f"{ADMIN}/get-menu-display/{{occasion_id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/get-menu-display/{_pick(ctx, 'occasion_ids', i)}/",
+    }),
+    Scenario("get_subpackages", "admin", "GET", f"{ADMIN}/get-subpackages/{{package_id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/get-subpackages/{_pick(ctx, 'package_ids', i)}/",
+    }),
+    Scenario("get_all_events", "admin", "GET", f"{ADMIN}/get-all-events/", lambda ctx, i: {}),
+    Scenario("get_all_bookings", "admin", "GET", f"{ADMIN}/get-all-bookings/", lambda ctx, i: {}),
+    # admin: projected list views, compared against the full listings above
+    Scenario("get_all_occasions_card", "admin", "GET", f"{ADMIN}/get-all-occasions/?view=card", lambda ctx, i: {},
+             baseline="get_all_occasions"),
+    Scenario("get_all_occasions_fields", "admin", "GET", f"{ADMIN}/get-all-occasions/?fields=name,heading,price",
+             lambda ctx, i: {}, baseline="get_all_occasions"),
+    Scenario("get_all_events_card", "admin", "GET", f"{ADMIN}/get-all-events/?view=card", lambda ctx, i: {},
+             baseline="get_all_events"),
+    Scenario("get_all_bookings_card", "admin", "GET", f"{ADMIN}/get-all-bookings/?view=card", lambda ctx, i: {},
+             baseline="get_all_bookings"),
+    Scenario("get_all_bookings_month", "admin", "GET", f"{ADMIN}/get-all-bookings/?start=2024-03-01&end=2024-03-31",
+             lambda ctx, i: {}, baseline="get_all_bookings"),
+    # admin: booking analytics, served from the rollup tables
+    Scenario("booking_analytics_day", "admin", "GET", f"{ADMIN}/booking-analytics/", lambda ctx, i: {
+        "params": {"granularity": "day", "start": "2024-01-01", "end": "2024-12-31"},
+    }),
+    Scenario("booking_analytics_week", "admin", "GET", f"{ADMIN}/booking-analytics/", lambda ctx, i: {
+        "params": {"granularity": "week"},
+    }),
+    Scenario("booking_analytics_day_local", "admin", "GET", f"{ADMIN}/booking-analytics/", lambda ctx, i: {
+        "params": {"granularity": "day", "tz": "Asia/Karachi", "start": "2024-03-01", "end": "2024-05-31"},
+    }),
+    Scenario("booking_analytics_hour", "admin", "GET", f"{ADMIN}/booking-analytics/", lambda ctx, i: {
+        "params": {"granularity": "hour", "start": "2024-03-01", "end": "2024-03-31"},
+    }),
+    Scenario("booking_analytics_hour_of_day", "admin", "GET", f"{ADMIN}/booking-analytics/", lambda ctx, i: {
+        "params": {"granularity": "hour_of_day", "start": "2024-01-01", "end": "2024-03-31"},
+    }),
+    # home: occasions, events and menus in one request
+    Scenario("home", "home", "GET", "/home/", lambda ctx, i: {}),
+    # search
+    Scenario("search", "search", "GET", "/search/", lambda ctx, i: {
+        "params": {"q": f"{WORDS[i % len(WORDS)]} {WORDS[(i * 7) % len(WORDS)]}"},
+    }),
+    Scenario("search_filtered", "search", "GET", "/search/", lambda ctx, i: {
+        "params": {"q": WORDS[i % len(WORDS)], "tags": [WORDS[(i * 3) % len(WORDS)]], "max_price": 2500},
+    }),
+    Scenario("search_past_end", "search", "GET", "/search/", lambda ctx, i: {
+        "params": {"min_price": 0, "offset": 1_000_000},
+    }, check=_check_past_end),
+    # admin: writes
+    Scenario("add_occasion", "admin", "POST", f"{ADMIN}/add-occasion/", lambda ctx, i: {
+        "params": {
+            "name": f"Bench occasion {i}", "heading": "Heading", "description": "Description",
+            "price": 100, "standard_price": 120, "outstandard_price": 150,
+        },
+        "data": {"tags": ["bench", "party"]},
+        "files": [("images", _png("bench_occasion.png")), ("images", _png("bench_occasion_2.png"))],
+    }),
+    Scenario("add_menu", "admin", "POST", f"{ADMIN}/add-menu/", lambda ctx, i: {
+        "data": {"heading": f"Bench menu {i}", "dish_names": ["Soup", "Salad"]},
+        "files": [
+            ("heading_image", _png("bench_heading.png")),
+            ("dish_images", _png("bench_dish_1.png")),
+            ("dish_images", _png("bench_dish_2.png")),
+        ],
+    }),
+    Scenario("add_menu_display", "admin", "POST", f"{ADMIN}/add-menu-display/", lambda ctx, i: {
+        "json": {
+            "occasion_id": _pick(ctx, "occasion_ids", i),
+            "packages": [{"name": "Bench", "price": 10, "subpackages": [{"name": "Sub", "price": 1}]}],
+        },
+    }),
+    Scenario("add_event", "admin", "POST", f"{ADMIN}/add-event/", lambda ctx, i: {
+        "params": {"name": f"Bench event {i}", "description": "Description", "price": 250},
+        "files": [("image", _png("bench_event.png"))],
+    }),
+    Scenario("update_event", "admin", "PUT", f"{ADMIN}/update-event/{{id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/update-event/{_pick(ctx, 'event_ids', i)}/",
+        "params": {"description": f"Updated {i}", "price": 300},
+    }),
+    Scenario("update_service", "admin", "PUT", f"{ADMIN}/update-service/{{id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/update-service/{_pick(ctx, 'service_ids', i)}/",
+        "params": {"description": f"Updated {i}"},
+    }),
+    Scenario("update_team_member", "admin", "PUT", f"{ADMIN}/update-team-member/{{id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/update-team-member/{_pick(ctx, 'team_member_ids', i)}/",
+        "params": {"designation": "Head chef", "description": f"Updated {i}"},
+    }),
+    # admin: deletes, each against rows inserted for it by setup()
+    Scenario("delete_occasion", "admin", "DELETE", f"{ADMIN}/delete-occasion/{{id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/delete-occasion/{ctx['delete_occasion'][i]}/",
+    }, _setup_occasions),
+    Scenario("delete_menu", "admin", "DELETE", f"{ADMIN}/delete-menu/{{heading_id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/delete-menu/{ctx['delete_menu'][i]}/",
+    }, _setup_menus),
+    Scenario("delete_menu_display", "admin", "DELETE", f"{ADMIN}/delete-menu-display/{{occasion_id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/delete-menu-display/{ctx['delete_menu_display'][i]}/",
+    }, _setup_menu_displays),
+    Scenario("delete_event", "admin", "DELETE", f"{ADMIN}/delete-event/{{id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/delete-event/{ctx['delete_event'][i]}/",
+    }, _setup_events),
+    Scenario("delete_service", "admin", "DELETE", f"{ADMIN}/delete-service/{{id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/delete-service/{ctx['delete_service'][i]}/",
+    }, _setup_services),
+    Scenario("delete_team_member", "admin", "DELETE", f"{ADMIN}/delete-team-member/{{id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/delete-team-member/{ctx['delete_team_member'][i]}/",
+    }, _setup_team_members),
+    Scenario("delete_contact", "admin", "DELETE", f"{ADMIN}/delete-contact/{{id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/delete-contact/{ctx['delete_contact'][i]}/",
+    }, _setup_contacts),
+    Scenario("delete_booking", "admin", "DELETE", f"{ADMIN}/delete-booking/{{id}}/", lambda ctx, i: {
+        "url": f"{ADMIN}/delete-booking/{ctx['delete_booking'][i]}/",
+    }, _setup_bookings),
+    Scenario("batch_delete_bookings", "admin", "POST", f"{ADMIN}/batch/", lambda ctx, i: {
+        "json": {"operations": [
+            {"op": "delete", "resource": "bookings", "id": id} for id in ctx["batch_delete_bookings"][i]
+        ]},
+    }, _setup_booking_batches),
+]
@@ -0,0 +1,92 @@
+-- Tables the routers expect to exist. The benchmark recreates them in the
+-- throwaway database given by BENCH_DB_CONNECTION_STRING before seeding.
+DROP TABLE IF EXISTS schema_migrations, jobs, bookings_archives, booking_rollups, booking_rollups_daily, subpackages, packages, dishes, menu_headings, occasions,
+    events, services, team_members, contact_us, bookings, users CASCADE;
+
+CREATE TABLE users (
+    user_id TEXT PRIMARY KEY,
+    email TEXT UNIQUE NOT NULL,
+    username TEXT NOT NULL,
+    password TEXT NOT NULL
+);
+
+CREATE TABLE bookings (
+    id SERIAL PRIMARY KEY,
+    user_id TEXT,
+    name TEXT,
+    email TEXT,
+    phone_no VARCHAR(20),
+    datetime TIMESTAMPTZ,
+    no_of_people INT,
+    special_request TEXT
+);
+
+CREATE TABLE contact_us (
+    id SERIAL PRIMARY KEY,
+    name TEXT,
+    email TEXT,
+    subject TEXT,
+    message TEXT
+);
+
+CREATE TABLE occasions (
+    id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL,
+    heading TEXT NOT NULL,
+    description TEXT NOT NULL,
+    price FLOAT NOT NULL,
+    standard_price FLOAT,
+    outstandard_price FLOAT,
+    tags JSONB NOT NULL,
+    images JSONB NOT NULL
+);
+
+CREATE TABLE menu_headings (
+    id SERIAL PRIMARY KEY,
+    heading TEXT,
+    heading_image TEXT
+);
+
+CREATE TABLE dishes (
+    id SERIAL PRIMARY KEY,
+    menu_id INT REFERENCES menu_headings (id),
+    name TEXT,
+    image TEXT
+);
+
+CREATE TABLE packages (
+    id SERIAL PRIMARY KEY,
+    occasion_id INT REFERENCES occasions (id),
+    name TEXT,
+    price FLOAT
+);
+
+CREATE TABLE subpackages (
+    id SERIAL PRIMARY KEY,
+    package_id INT REFERENCES packages (id),
+    name TEXT,
+    price FLOAT
+);
+
+CREATE TABLE events (
+    id SERIAL PRIMARY KEY,
+    pic_path TEXT,
+    name TEXT,
+    description TEXT,
+    price FLOAT
+);
+
+CREATE TABLE services (
+    id SERIAL PRIMARY KEY,
+    name TEXT,
+    description TEXT,
+    image_path TEXT
+);
+
+CREATE TABLE team_members (
+    id SERIAL PRIMARY KEY,
+    name TEXT,
+    designation TEXT,
+    description TEXT,
+    image_path TEXT
+);
@@ -0,0 +1,160 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from app.utils.password import hash_password
+
+SCHEMA_PATH = Path(__file__).with_name("schema.sql")
+
+# Dataset sizes the suite runs against. "large" is opt-in because seeding a
+# million bookings takes a while; "catalog" puts ~100k rows behind search.
+PROFILES = {
+    "small": {"bookings": 100, "menu_headings": 10},
+    "medium": {"bookings": 10_000, "menu_headings": 1_000},
+    "large": {"bookings": 1_000_000, "menu_headings": 1_000},
+    "catalog": {"bookings": 100, "menu_headings": 5_000, "occasions": 20_000, "events": 20_000},
+}
+
+# Catalog sizes used unless the profile overrides them.
+OCCASIONS = 50
+EVENTS = 40
+
+# Fixed-size parts of the data set, independent of the profile.
+PACKAGES_PER_OCCASION = 3
+SUBPACKAGES_PER_PACKAGE = 4
+DISHES_PER_HEADING = 6
+SERVICES = 12
+TEAM_MEMBERS = 12
+CONTACT_MESSAGES = 200
+USERS = 500
+
+BENCH_PASSWORD = "bench-password"
+COPY_BATCH = 50_000
+
+# Searchable theme words, sprinkled sparsely into otherwise random text so a
+# search matches a realistic fraction of the catalog rather than all of it.
+WORDS = (
+    "saffron charcoal harbour sunset brunch lantern coral velvet olive "
+    "mango jasmine ember tide marina citrus pepper basil cedar amber"
+).split()
+THEME_RATE = 0.01
+_SYLLABLES = "ka lo mi ra te su vo ne pi da ko ri ma lu se ta no vi".split()
+FILLER = [a + b + c for a in _SYLLABLES for b in _SYLLABLES for c in _SYLLABLES]
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(
+        rng.choice(WORDS) if rng.random() < THEME_RATE else rng.choice(FILLER)
+        for _ in range(words)
+    )
+
+
+def user_id(n: int) -> str:
+    return f"bench-user-{n:05d}"
+
+
+async def _copy(conn, table: str, columns, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= COPY_BATCH:
+            await conn.copy_records_to_table(table, records=batch, columns=columns)
+            batch = []
+    if batch:
+        await conn.copy_records_to_table(table, records=batch, columns=columns)
+
+
+async def seed(conn, bookings: int, menu_headings: int, occasions: int = OCCASIONS, events: int = EVENTS,
+               seed_value: int = 42) -> dict:
+    """Recreate the schema and fill it with deterministic data.
+
+    Returns the identifiers the scenarios need to build request paths.
+    """
+    rng = random.Random(seed_value)
+    await conn.execute(SCHEMA_PATH.read_text())
+
+    # bcrypt is slow on purpose; hash once and reuse it for every user.
+    password = hash_password(BENCH_PASSWORD)
+    await _copy(conn, "users", ("user_id", "email", "username", "password"), (
+        (user_id(n), f"{user_id(n)}@example.com", f"guest{n}", password)
+        for n in range(USERS)
+    ))
+
+    start = datetime(2023, 1, 1, 12, tzinfo=timezone.utc)
+    await _copy(conn, "bookings", ("user_id", "name", "email", "phone_no", "datetime", "no_of_people", "special_request"), (
+        (
+            user_id(rng.randrange(USERS)),
+            _text(rng, 2),
+            "guest@example.com",
+            "+10000000000",
+            start + timedelta(minutes=30 * rng.randrange(2 * 24 * 365 * 3)),
+            rng.randint(1, 12),
+            _text(rng, 6) if rng.random() < 0.3 else None,
+        )
+        for _ in range(bookings)
+    ))
+
+    await _copy(conn, "contact_us", ("name", "email", "subject", "message"), (
+        (_text(rng, 2), "guest@example.com", _text(rng, 4), _text(rng, 40))
+        for _ in range(CONTACT_MESSAGES)
+    ))
+
+    await _copy(conn, "occasions", ("name", "heading", "description", "price", "standard_price", "outstandard_price", "tags", "images"), (
+        (
+            _text(rng, 2),
+            _text(rng, 5),
+            _text(rng, 120),
+            float(rng.randint(100, 5000)),
+            float(rng.randint(100, 5000)),
+            float(rng.randint(100, 5000)),
+            json.dumps(rng.sample(WORDS, 4)),
+            json.dumps([f"uploaded_images/occasion_{n}_{i}.jpg" for i in range(5)]),
+        )
+        for n in range(occasions)
+    ))
+    occasion_ids = [r["id"] for r in await conn.fetch("SELECT id FROM occasions ORDER BY id LIMIT $1", OCCASIONS)]
+
+    await _copy(conn, "packages", ("occasion_id", "name", "price"), (
+        (occasion_id, _text(rng, 2), float(rng.randint(50, 900)))
+        for occasion_id in occasion_ids
+        for _ in range(PACKAGES_PER_OCCASION)
+    ))
+    package_ids = [r["id"] for r in await conn.fetch("SELECT id FROM packages ORDER BY id")]
+    await _copy(conn, "subpackages", ("package_id", "name", "price"), (
+        (package_id, _text(rng, 2), float(rng.randint(5, 90)))
+        for package_id in package_ids
+        for _ in range(SUBPACKAGES_PER_PACKAGE)
+    ))
+
+    await _copy(conn, "menu_headings", ("heading", "heading_image"), (
+        (_text(rng, 2), f"uploaded_images/heading_{n}.jpg") for n in range(menu_headings)
+    ))
+    heading_ids = [r["id"] for r in await conn.fetch("SELECT id FROM menu_headings ORDER BY id")]
+    await _copy(conn, "dishes", ("menu_id", "name", "image"), (
+        (heading_id, _text(rng, 3), f"uploaded_images/dish_{heading_id}_{i}.jpg")
+        for heading_id in heading_ids
+        for i in range(DISHES_PER_HEADING)
+    ))
+
+    await _copy(conn, "events", ("pic_path", "name", "description", "price"), (
+        (f"uploaded_images/event_{n}.jpg", _text(rng, 3), _text(rng, 60), float(rng.randint(100, 3000)))
+        for n in range(events)
+    ))
+    await _copy(conn, "services", ("name", "description", "image_path"), (
+        (_text(rng, 2), _text(rng, 30), f"uploaded_images/service_{n}.jpg") for n in range(SERVICES)
+    ))
+    await _copy(conn, "team_members", ("name", "designation", "description", "image_path"), (
+        (_text(rng, 2), _text(rng, 1), _text(rng, 30), f"uploaded_images/team_{n}.jpg") for n in range(TEAM_MEMBERS)
+    ))
+
+    await conn.execute("ANALYZE")
+    return {
+        "occasion_ids": occasion_ids,
+        "package_ids": package_ids,
+        "heading_ids": heading_ids,
+        "event_ids": [r["id"] for r in await conn.fetch("SELECT id FROM events ORDER BY id LIMIT $1", EVENTS)],
+        "service_ids": [r["id"] for r in await conn.fetch("SELECT id FROM services ORDER BY id")],
+        "team_member_ids": [r["id"] for r in await conn.fetch("SELECT id FROM team_members ORDER BY id")],
+        "user_ids": [user_id(n) for n in range(USERS)],
+    }
@@ -0,0 +1,255 @@
+"""Validation and serialization time of the booking and catalog responses.
+
+Fetches each endpoint's rows once from a freshly seeded throwaway database,
+then times, in-process and without I/O, only the work done after the query:
+
+- ``before``: the hand-built dicts the handlers used to return, encoded the
+  way FastAPI does without a response model (``jsonable_encoder``, then
+  ``JSONResponse``'s ``json.dumps``).
+- ``after``: the typed response model built from the records and rendered
+  by ``ModelResponse`` in pydantic-core.
+
+It also times validating a book-table request body with the old v1-style
+validator against the current ``BookingInput``. Both bodies of every case are
+checked to decode to the same JSON.
+
+    BENCH_DB_CONNECTION_STRING=postgresql://postgres@localhost/bench \\
+        uv run --group bench python -m benchmarks.serialization --profile medium
+
+The database is wiped and re-seeded with the chosen profile; never point it
+at a database you care about.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pydantic import BaseModel, EmailStr, validator
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+BOOKING_BODY = {
+    "user_id": "bench-user",
+    "name": "Bench Guest",
+    "email": "guest@example.com",
+    "phone_no": "+10000000000",
+    "datetime": "2031-02-03T19:30:00+02:00",
+    "no_of_people": 4,
+    "special_request": "Window seat",
+}
+
+
+# BookingInput as it was, with a v1 validator that re-parsed the datetime itself.
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+
+    class LegacyBookingInput(BaseModel):
+        user_id: str
+        name: str
+        email: EmailStr
+        phone_no: str
+        datetime: datetime
+        no_of_people: int
+        special_request: str = None
+
+        @validator("datetime", pre=True, always=True)
+        def ensure_timezone(cls, value):
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return value.astimezone(timezone.utc)
+
+
+async def fetch_rows(dsn, profile):
+    """Seed the database and read what each endpoint would serve."""
+    import asyncpg
+
+    from app.repositories import bookings as bookings_repo, events as events_repo, menus as menus_repo
+    from app.repositories import occasions as occasions_repo
+    from benchmarks.seed import PROFILES, seed
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        await seed(conn, **PROFILES[profile])
+        user_id = await conn.fetchval(
+            "SELECT user_id FROM bookings WHERE user_id IS NOT NULL GROUP BY 1 ORDER BY count(*) DESC LIMIT 1"
+        )
+        occasion_id = await conn.fetchval(
+            "SELECT occasion_id FROM packages GROUP BY 1 ORDER BY count(*) DESC LIMIT 1"
+        )
+        return {
+            "user_id": user_id,
+            "occasion_id": occasion_id,
+            "bookings": await bookings_repo.list_all(conn),
+            "user_bookings": await bookings_repo.list_for_user(conn, user_id),
+            "occasions": await occasions_repo.list_all(conn),
+            "occasion_cards": await occasions_repo.list_fields(conn, occasions_repo.VIEWS["card"]),
+            "events": await events_repo.list_all(conn),
+            "menus": await menus_repo.list_all(conn),
+            "packages": await occasions_repo.list_packages(conn, occasion_id),
+        }
+    finally:
+        await conn.close()
+
+
+def cases(data):
+    """``(name, before, after)`` per endpoint; each callable returns the response body."""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from app.models.admin import EventList, MenuDisplay, MenuList, OccasionList, PartialOccasionList
+    from app.models.booking import BookingInput, BookingList, UserBookings
+    from app.utils.responses import ModelResponse, menu_response, subpackage_response
+
+    def legacy(content):
+        return JSONResponse(jsonable_encoder(content)).body
+
+    bookings, user_bookings = data["bookings"], data["user_bookings"]
+    occasions, cards, events = data["occasions"], data["occasion_cards"], data["events"]
+    menus, packages = data["menus"], data["packages"]
+    user_id, occasion_id = data["user_id"], data["occasion_id"]
+    booking_fields = ("id", "name", "email", "phone_no", "datetime", "no_of_people", "special_request")
+    occasion_fields = (
+        "id", "name", "heading", "description", "price", "standard_price", "outstandard_price", "tags", "images"
+    )
+    event_fields = ("id", "name", "description", "price", "pic_path")
+
+    return [
+        (
+            "get_all_bookings",
+            lambda: legacy({"bookings": [dict(row) for row in bookings]}),
+            lambda: ModelResponse(BookingList(bookings=[dict(row) for row in bookings])).body,
+        ),
+        (
+            "get_bookings",
+            lambda: legacy({
+                "user_id": user_id,
+                "bookings": [{name: row[name] for name in booking_fields} for row in user_bookings],
+            }),
+            lambda: ModelResponse(UserBookings(user_id=user_id, bookings=[dict(row) for row in user_bookings])).body,
+        ),
+        (
+            "get_all_occasions",
+            lambda: legacy({"occasions": [{name: row[name] for name in occasion_fields} for row in occasions]}),
+            lambda: ModelResponse(OccasionList(occasions=[dict(row) for row in occasions])).body,
+        ),
+        (
+            "get_all_occasions_card",
+            lambda: legacy({"occasions": [dict(row) for row in cards]}),
+            lambda: ModelResponse(
+                PartialOccasionList(occasions=[dict(row) for row in cards]), exclude_unset=True
+            ).body,
+        ),
+        (
+            "get_all_events",
+            lambda: legacy({"events": [{name: row[name] for name in event_fields} for row in events]}),
+            lambda: ModelResponse(EventList(events=[dict(row) for row in events])).body,
+        ),
+        (
+            "get_all_menu",
+            lambda: legacy({"menus": [menu_response(heading, dishes) for heading, dishes in menus]}),
+            lambda: ModelResponse(MenuList(menus=[menu_response(heading, dishes) for heading, dishes in menus])).body,
+        ),
+        (
+            "get_menu_display",
+            lambda: legacy({"occasion_id": occasion_id, "menu_display": [
+                {
+                    "package_id": package["id"], "name": package["name"], "price": package["price"],
+                    "subpackages": [subpackage_response(subpackage) for subpackage in subpackages],
+                } for package, subpackages in packages
+            ]}),
+            lambda: ModelResponse(MenuDisplay(occasion_id=occasion_id, menu_display=[
+                {
+                    "package_id": package["id"], "name": package["name"], "price": package["price"],
+                    "subpackages": [subpackage_response(subpackage) for subpackage in subpackages],
+                } for package, subpackages in packages
+            ])).body,
+        ),
+        (
+            "book_table_input",
+            lambda: LegacyBookingInput(**BOOKING_BODY),
+            lambda: BookingInput(**BOOKING_BODY),
+        ),
+    ]
+
+
+def time_call(fn, repeat, min_seconds):
+    """Median microseconds per call over ``repeat`` runs of at least ``min_seconds`` each."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(number, int(number * min_seconds / 0.2))
+    return statistics.median(timer.repeat(repeat, number)) / number * 1e6
+
+
+def parse_args(argv=None):
+    from benchmarks.seed import PROFILES
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", default="medium", help=f"one of {', '.join(PROFILES)}")
+    parser.add_argument("--only", default="", help="comma-separated case names to run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-seconds", type=float, default=0.2, help="length of each timed run")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.profile not in PROFILES:
+        parser.error(f"unknown profile: {args.profile}")
+    args.only = {name for name in args.only.split(",") if name}
+    args.dsn = os.getenv("BENCH_DB_CONNECTION_STRING")
+    if not args.dsn:
+        parser.error("BENCH_DB_CONNECTION_STRING must point at a disposable database")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # The app reads its settings at import time.
+    os.environ["DB_CONNECTION_STRING"] = args.dsn
+    data = asyncio.run(fetch_rows(args.dsn, args.profile))
+
+    results = []
+    for name, before, after in cases(data):
+        if args.only and name not in args.only:
+            continue
+        before_body, after_body = before(), after()
+        if isinstance(before_body, bytes) and json.loads(before_body) != json.loads(after_body):
+            raise RuntimeError(f"{name}: the typed response differs from the hand-built one")
+        result = {
+            "name": name,
+            "before_us": round(time_call(before, args.repeat, args.min_seconds), 2),
+            "after_us": round(time_call(after, args.repeat, args.min_seconds), 2),
+        }
+        result["speedup"] = round(result["before_us"] / result["after_us"], 2)
+        if isinstance(after_body, bytes):
+            result["response_bytes"] = len(after_body)
+        results.append(result)
+        print(
+            f"{name}: before={result['before_us']}us after={result['after_us']}us speedup={result['speedup']}x",
+            file=sys.stderr,
+        )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "profile": args.profile,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(REPO_ROOT))
+    main()
@@ -0,0 +1,130 @@
+"""A minimal in-process SMTP server that keeps what it receives, standing in for MailHog.
+
+Speaks the commands ``SMTPMailer`` uses: EHLO, STARTTLS (when given an SSL
+context), AUTH PLAIN and LOGIN, MAIL, RCPT, DATA, RSET, NOOP and QUIT. Any
+credentials are accepted and recorded in ``logins``; accepted messages land
+in ``messages`` as ``email.message.EmailMessage`` objects.
+
+    sink = SMTPSink()
+    await sink.start()
+    mailer = SMTPMailer("127.0.0.1", sink.port, "bench@example.com", use_tls=False)
+"""
+import asyncio
+import base64
+import email
+import email.policy
+import ssl
+
+
+class SMTPSink:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, ssl_context: ssl.SSLContext = None):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.messages = []
+        self.logins = []
+        self._server = None
+        self._received = asyncio.Condition()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._session, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def wait_for(self, count: int, timeout: float):
+        """Wait until ``count`` messages have arrived; raises TimeoutError otherwise."""
+        async with self._received:
+            await asyncio.wait_for(self._received.wait_for(lambda: len(self.messages) >= count), timeout)
+
+    async def _session(self, reader, writer):
+        async def reply(line: str):
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        async def read_line() -> str:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionResetError
+            return line.decode(errors="replace").rstrip("\r\n")
+
+        envelope = None
+        try:
+            await reply("220 smtp-sink ready")
+            while True:
+                verb, _, argument = (await read_line()).partition(" ")
+                verb = verb.upper()
+                if verb in ("EHLO", "HELO"):
+                    envelope = None
+                    extensions = ["smtp-sink", "AUTH PLAIN LOGIN", "8BITMIME"]
+                    if self.ssl_context is not None and writer.get_extra_info("sslcontext") is None:
+                        extensions.append("STARTTLS")
+                    if verb == "HELO":
+                        extensions = extensions[:1]
+                    lines = [f"250-{item}" for item in extensions[:-1]] + [f"250 {extensions[-1]}"]
+                    await reply("\r\n".join(lines))
+                elif verb == "STARTTLS" and self.ssl_context is not None:
+                    await reply("220 go ahead")
+                    await writer.start_tls(self.ssl_context)
+                    envelope = None
+                elif verb == "AUTH":
+                    mechanism, _, initial = argument.partition(" ")
+                    mechanism = mechanism.upper()
+                    if mechanism == "PLAIN":
+                        if not initial:
+                            await reply("334 ")
+                            initial = await read_line()
+                        _, username, password = base64.b64decode(initial).decode().split("\0")
+                    elif mechanism == "LOGIN":
+                        if not initial:
+                            await reply("334 " + base64.b64encode(b"Username:").decode())
+                            initial = await read_line()
+                        await reply("334 " + base64.b64encode(b"Password:").decode())
+                        username = base64.b64decode(initial).decode()
+                        password = base64.b64decode(await read_line()).decode()
+                    else:
+                        await reply("504 unrecognized authentication type")
+                        continue
+                    self.logins.append((username, password))
+                    await reply("235 authentication succeeded")
+                elif verb == "MAIL":
+                    envelope = {"from": argument, "to": []}
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    if envelope is None:
+                        await reply("503 need MAIL first")
+                        continue
+                    envelope["to"].append(argument)
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    if not envelope or not envelope["to"]:
+                        await reply("503 need RCPT first")
+                        continue
+                    await reply("354 end data with <CR><LF>.<CR><LF>")
+                    lines = []
+                    while (line := await reader.readline()) not in (b".\r\n", b".\n", b""):
+                        # Undo dot-stuffing (RFC 5321 4.5.2).
+                        lines.append(line[1:] if line.startswith(b".") else line)
+                    message = email.message_from_bytes(b"".join(lines), policy=email.policy.default)
+                    async with self._received:
+                        self.messages.append(message)
+                        self._received.notify_all()
+                    envelope = None
+                    await reply("250 OK: queued")
+                elif verb == "RSET":
+                    envelope = None
+                    await reply("250 OK")
+                elif verb == "NOOP":
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 bye")
+                    break
+                else:
+                    await reply("502 command not implemented")
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()